@@ -0,0 +1,195 @@
+"""
+Benchmark for ``Address.objects.nearby`` on a large table.
+
+Loads ``--rows`` addresses with random coordinates over a continental-sized
+box through ``COPY``, then times radius queries against the geohash-pruned
+``nearby`` and against a latitude-band scan refined the same way, which is
+what a query without the geohash index has to do. The plan of the pruning
+query is printed so it can be checked that it stays on the geohash index.
+Everything runs in a transaction that is rolled back unless ``--keep`` is
+given, so it can be pointed at a development database.
+
+Usage (from the directory containing manage.py, against PostgreSQL):
+
+    python -m benchmarks.nearby --rows 1000000
+    python -m benchmarks.nearby --rows 10000000 --chunk 500000
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+
+import django
+import numpy as np
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "limbo.settings")
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+
+from limbo.apps.address import geo  # noqa: E402
+from limbo.apps.address.models import Address  # noqa: E402
+
+# Roughly the contiguous United States.
+BOX = (25.0, 49.0, -124.0, -67.0)
+COLUMNS = (
+    "title",
+    "first_name",
+    "last_name",
+    "line1",
+    "line2",
+    "country",
+    "postal_code",
+    "city",
+    "state",
+    "latitude",
+    "longitude",
+    "geohash",
+    "created_at",
+    "updated_at",
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+def load(rows, chunk, rng):
+    table = connection.ops.quote_name(Address._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(column) for column in COLUMNS)
+    copy_sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    min_lat, max_lat, min_lon, max_lon = BOX
+    with connection.cursor() as cursor:
+        # The full-text trigger is irrelevant here and dominates load time.
+        cursor.execute(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+        for start in range(0, rows, chunk):
+            size = min(chunk, rows - start)
+            latitudes = rng.uniform(min_lat, max_lat, size)
+            longitudes = rng.uniform(min_lon, max_lon, size)
+            hashes = geo.encode_many(latitudes, longitudes)
+            buffer = io.StringIO()
+            for index, (latitude, longitude, geohash) in enumerate(
+                zip(latitudes.tolist(), longitudes.tolist(), hashes.tolist()), start
+            ):
+                # Unquoted empty CSV fields load as NULL, so blanks are quoted.
+                buffer.write(
+                    f'"",Bench,Row,{index} Main St,"",US,"","","",'
+                    f"{latitude!r},{longitude!r},{geohash},now,now\n"
+                )
+            raw = cursor.cursor
+            buffer.seek(0)
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                raw.copy_expert(copy_sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+            print(f"  loaded {start + size:,} rows", flush=True)
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        cursor.execute(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+        cursor.execute(f"ANALYZE {table}")
+
+
+def band_scan(latitude, longitude, radius_km):
+    """``nearby`` without the geohash pruning, as the baseline."""
+    band = radius_km / geo.KM_PER_DEGREE
+    rows = list(
+        Address.objects.filter(
+            latitude__range=(latitude - band, latitude + band),
+            longitude__isnull=False,
+        ).values_list("pk", "latitude", "longitude")
+    )
+    if not rows:
+        return 0, 0
+    pks, latitudes, longitudes = zip(*rows)
+    distances = geo.haversine_km(latitude, longitude, latitudes, longitudes)
+    return len(rows), int((distances <= radius_km).sum())
+
+
+def timed(label, func, points):
+    latencies = []
+    for point in points:
+        started = time.perf_counter()
+        func(*point)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<28} p50 {statistics.median(latencies):9.2f} ms   "
+        f"p95 {p95:9.2f} ms"
+    )
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--radius", type=float, default=5.0, help="Kilometres.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--baseline-queries",
+        type=int,
+        default=10,
+        help="Queries for the (slow) latitude-band baseline; 0 to skip it.",
+    )
+    parser.add_argument("--keep", action="store_true", help="Commit the rows.")
+    args = parser.parse_args()
+
+    if connection.vendor != "postgresql":
+        parser.error("this benchmark needs PostgreSQL")
+
+    rng = np.random.default_rng(args.seed)
+    min_lat, max_lat, min_lon, max_lon = BOX
+    points = list(
+        zip(
+            rng.uniform(min_lat, max_lat, args.queries),
+            rng.uniform(min_lon, max_lon, args.queries),
+        )
+    )
+    radius = args.radius
+
+    try:
+        with transaction.atomic():
+            print(f"Loading {args.rows:,} addresses")
+            started = time.perf_counter()
+            load(args.rows, args.chunk, rng)
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+
+            latitude, longitude = points[0]
+            cells = geo.covering_cells(latitude, longitude, radius)
+            print(f"\nradius {radius} km -> {len(cells)} cells of {len(cells[0])} chars")
+            candidates = Address.objects.nearby_candidates(latitude, longitude, radius)
+            print(
+                f"first query: {candidates.count():,} candidates, "
+                f"{Address.objects.nearby(latitude, longitude, radius).count():,} "
+                "within radius"
+            )
+            print(candidates.values_list("pk", "latitude", "longitude").explain())
+
+            print()
+            nearby = timed(
+                "nearby (geohash + numpy)",
+                lambda lat, lon: list(
+                    Address.objects.nearby(lat, lon, radius).values_list(
+                        "pk", flat=True
+                    )
+                ),
+                points,
+            )
+            if args.baseline_queries:
+                baseline = timed(
+                    "latitude band + numpy",
+                    lambda lat, lon: band_scan(lat, lon, radius),
+                    points[: args.baseline_queries],
+                )
+                print(f"speedup: {baseline / nearby:.1f}x")
+            if not args.keep:
+                raise Rollback
+    except Rollback:
+        print("rolled back")
+
+
+if __name__ == "__main__":
+    main()
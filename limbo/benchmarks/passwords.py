@@ -0,0 +1,158 @@
+"""
+Benchmark for password validation.
+
+Compares the historical ``AUTH_PASSWORD_VALIDATORS`` chain (Django's
+minimum length, common password and numeric validators) with the current
+one, where ``BreachedPasswordValidator`` reads a Bloom filter built from
+the same common password list, and the regex ``PasswordStrongValidator``
+with the single-pass one. Reports the first-use cost of each chain, the
+Python heap it holds afterwards and the per-password throughput on a mix
+of strong, weak and common passwords.
+
+Usage (from the directory containing manage.py):
+
+    python -m benchmarks.passwords --rows 200000
+"""
+import argparse
+import os
+import random
+import re
+import string
+import tempfile
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "limbo.settings")
+django.setup()
+
+from django.contrib.auth.password_validation import (  # noqa: E402
+    CommonPasswordValidator,
+    MinimumLengthValidator,
+    NumericPasswordValidator,
+)
+from django.core.exceptions import ValidationError  # noqa: E402
+
+from limbo.apps.users.bloom import (  # noqa: E402
+    DEFAULT_PASSWORD_LIST,
+    BloomFilter,
+    read_password_list,
+)
+from limbo.apps.users.validators import (  # noqa: E402
+    BreachedPasswordValidator,
+    PasswordStrongValidator,
+)
+
+
+class LegacyPasswordStrongValidator:
+    """The pre-engine implementation, kept here as the baseline."""
+
+    def validate(self, password, user=None):
+        requirements = [
+            (r"[A-Z]", "Password must contain at least one uppercase letter (A-Z)."),
+            (r"[a-z]", "Password must contain at least one lowercase letter (a-z)."),
+            (r"\d", "Password must contain at least one digit (0-9)."),
+            (r'[!@#$%^&*(),.?":{}|<>]', "Password must contain a special character."),
+        ]
+        if len(password) < 8:
+            raise ValidationError("Password must be at least 8 characters long.")
+        for pattern, error_message in requirements:
+            if not re.search(pattern, password):
+                raise ValidationError(error_message)
+
+
+def make_passwords(count, seed, common):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "!@#$%&*"
+    passwords = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.2:
+            passwords.append(rng.choice(common))
+        elif kind < 0.3:
+            passwords.append("".join(rng.choices(string.digits, k=10)))
+        else:
+            length = rng.randint(8, 24)
+            passwords.append("Aa1!" + "".join(rng.choices(alphabet, k=length)))
+    return passwords
+
+
+def run_chain(validators, passwords):
+    # Like validate_password(), every validator runs on every password.
+    errors = 0
+    for password in passwords:
+        for validator in validators:
+            try:
+                validator.validate(password)
+            except ValidationError:
+                errors += 1
+    return errors
+
+
+def first_use(label, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    validators = build()
+    run_chain(validators, ["warm-up"])
+    elapsed = time.perf_counter() - started
+    heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(
+        f"{label:<12} first use {elapsed * 1000:8.1f}ms, "
+        f"heap {heap / 2**20:6.1f} MiB"
+    )
+    return validators
+
+
+def timed(label, validators, passwords):
+    started = time.perf_counter()
+    errors = run_chain(validators, passwords)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<12} {elapsed:8.3f}s {len(passwords) / elapsed:12,.0f} passwords/s "
+        f"({errors:,} errors)"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    common = list(read_password_list(str(DEFAULT_PASSWORD_LIST)))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "common.bloom")
+        BloomFilter.build(path, common, len(common))
+
+        legacy = first_use(
+            "legacy",
+            lambda: [
+                MinimumLengthValidator(),
+                CommonPasswordValidator(),
+                NumericPasswordValidator(),
+            ],
+        )
+        engine = first_use(
+            "engine",
+            lambda: [
+                MinimumLengthValidator(),
+                BreachedPasswordValidator(path),
+                NumericPasswordValidator(),
+            ],
+        )
+
+        passwords = make_passwords(args.rows, args.seed, common)
+        print(f"{args.rows:,} passwords, {len(common):,} in the common list")
+        baseline = timed("legacy", legacy, passwords)
+        elapsed = timed("engine", engine, passwords)
+        print(f"speedup: {baseline / elapsed:.2f}x")
+        baseline = timed("strong/regex", [LegacyPasswordStrongValidator()], passwords)
+        elapsed = timed("strong/sets", [PasswordStrongValidator()], passwords)
+        print(f"speedup: {baseline / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Micro-benchmark for postal code validation.
+
+Compares the historical per-row ``re.match(POSTCODES_REGEX[...])`` path with
+the precompiled ``PostalCodeRegistry`` (single and batch entry points) on a
+mixed-country workload.
+
+Usage (from the directory containing manage.py):
+
+    python -m benchmarks.postal_codes --rows 1000000
+"""
+import argparse
+import random
+import re
+import time
+
+from django.core.exceptions import ValidationError
+
+from limbo.apps.address.validators import POSTCODES_REGEX, PostalCodeRegistry
+
+SAMPLES = {
+    "US": ["12345", "12345-6789", "1234"],
+    "GB": ["SW1A1AA", "12345"],
+    "CA": ["K1A0B1", "12345"],
+    "DE": ["10115", "1011"],
+    "JP": ["100-0001", "1000001"],
+    "NL": ["1234AB", "1234"],
+    "BR": ["01000-000", "0100"],
+    "TH": ["10110", "1011A"],
+    "PL": ["00-950", "00950"],
+    "XX": ["", "12345"],
+}
+
+
+def legacy_validate(postal_code, country_code):
+    """The pre-registry implementation, kept here as the baseline."""
+    if not country_code:
+        raise ValidationError("Country must be specified to validate postal code.")
+    regex = POSTCODES_REGEX.get(country_code.upper())
+    if not regex:
+        if postal_code:
+            raise ValidationError("This country does not use postal codes.")
+        return
+    if not postal_code:
+        raise ValidationError("Postal code is required for the selected country.")
+    if not re.match(regex, postal_code):
+        raise ValidationError("Invalid postal code format.")
+
+
+CANDIDATES = ["12345", "1234", "123456", "123", "1234567", "12345678"]
+
+
+def samples_for(country):
+    if country in SAMPLES:
+        return SAMPLES[country]
+    regex = re.compile(POSTCODES_REGEX[country])
+    valid = [code for code in CANDIDATES if regex.match(code)]
+    # Roughly nine valid rows for every invalid one.
+    return valid[:1] * 9 + ["!!"] if valid else ["!!"]
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    countries = list(POSTCODES_REGEX) + ["XX"]
+    pools = {country: samples_for(country) for country in countries}
+    rows = []
+    for _ in range(count):
+        country = rng.choice(countries)
+        rows.append((rng.choice(pools[country]), country))
+    return rows
+
+
+def run_legacy(rows, purge_every):
+    errors = 0
+    for index, (postal_code, country) in enumerate(rows):
+        if purge_every and index % purge_every == 0:
+            # Simulates the rest of the process competing for the re cache.
+            re.purge()
+        try:
+            legacy_validate(postal_code, country)
+        except ValidationError:
+            errors += 1
+    return errors
+
+
+def run_registry_single(registry, rows):
+    errors = 0
+    for postal_code, country in rows:
+        if registry.check(postal_code, country) is not None:
+            errors += 1
+    return errors
+
+
+def run_registry_batch(registry, rows):
+    return sum(1 for result in registry.validate_many(rows) if result is not None)
+
+
+def timed(label, func, rows):
+    started = time.perf_counter()
+    errors = func()
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<32} {elapsed:8.3f}s {len(rows) / elapsed:14,.0f} rows/s "
+        f"({errors:,} invalid)"
+    )
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--purge-every",
+        type=int,
+        default=1000,
+        help="Purge the re cache every N rows in the cache-pressure baseline.",
+    )
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.seed)
+    registry = PostalCodeRegistry(POSTCODES_REGEX)
+    registry.compiled  # compile outside of the timed section
+
+    print(f"{args.rows:,} mixed-country postal codes, {len(POSTCODES_REGEX)} patterns")
+    baseline = timed("legacy re.match (warm cache)", lambda: run_legacy(rows, 0), rows)
+    timed(
+        "legacy re.match (cache pressure)",
+        lambda: run_legacy(rows, args.purge_every),
+        rows,
+    )
+    single = timed(
+        "registry.check", lambda: run_registry_single(registry, rows), rows
+    )
+    batch = timed(
+        "registry.validate_many", lambda: run_registry_batch(registry, rows), rows
+    )
+    print(f"speedup single: {baseline / single:.2f}x, batch: {baseline / batch:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
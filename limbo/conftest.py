@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _unhashed_static_files(settings):
+    """
+    The manifest storage only resolves names after collectstatic has run,
+    which the test suite doesn't do.
+    """
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def _audit_buffer():
+    """
+    Audit log entries still buffered when a test ends refer to rows its
+    rollback removed; drop them rather than write them in the next test.
+    """
+    from limbo.apps.audit import recorder
+
+    yield
+    recorder._take_pending()
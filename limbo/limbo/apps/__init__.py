@@ -5,11 +5,13 @@ BASE_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 MY_APPS = [
     "limbo.apps.users",
     "limbo.apps.address",
+    "limbo.apps.audit",
 ]
 
 INSTALLED_APPS = BASE_APPS + MY_APPS
@@ -17,4 +19,5 @@ INSTALLED_APPS = BASE_APPS + MY_APPS
 THIRD_PARTY = [
     "django_countries",
     "django_harlequin",
+    "rest_framework",
 ]
@@ -1,16 +1,69 @@
 from django.contrib import admin
-from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
+from django_countries import countries
 from djangoql.admin import DjangoQLSearchMixin
 
+from limbo.core.admin import EstimatedCountAdminMixin, SearchVectorAdminMixin
 
+from .flags import FLAG_SPRITE_CSS, flag_html
 from .forms import AddressAdminForm
-from .models import Address
+from .models import Address, AddressFacet
 
 
-class AddressAdmin(DjangoQLSearchMixin, admin.ModelAdmin):
+class FacetListFilter(admin.SimpleListFilter):
+    """
+    Filter on the ``parameter_name`` field, listing the values counted in
+    ``AddressFacet``. The parameter applies even when the facets are empty
+    or don't list it, for instance before ``rebuild_address_facets`` ran.
+    """
+
+    def has_output(self):
+        return self.value() is not None or super().has_output()
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+
+class CountryFacetFilter(FacetListFilter):
+    """Countries with their number of addresses, read from ``AddressFacet``."""
+
+    title = _("country")
+    parameter_name = "country"
+
+    def lookups(self, request, model_admin):
+        return [
+            (code, f"{countries.name(code) or code} ({total})")
+            for code, total in AddressFacet.objects.countries()
+        ]
+
+
+class StateFacetFilter(FacetListFilter):
+    """
+    The most frequent states, of the selected country if any, read from
+    ``AddressFacet``. There are far too many to list them all.
+    """
+
+    title = _("state")
+    parameter_name = "state"
+    limit = 100
+
+    def lookups(self, request, model_admin):
+        states = AddressFacet.objects.states(request.GET.get("country"), self.limit)
+        return [(state, f"{state} ({total})") for state, total in states]
+
+
+class AddressAdmin(
+    EstimatedCountAdminMixin,
+    DjangoQLSearchMixin,
+    SearchVectorAdminMixin,
+    admin.ModelAdmin,
+):
     form = AddressAdminForm
     list_per_page = 10
+    # Read by country_flag.
+    list_only_fields = ("country",)
     list_display = (
         "line1",
         "city",
@@ -19,20 +72,14 @@ class AddressAdmin(DjangoQLSearchMixin, admin.ModelAdmin):
         "postal_code",
         "created_at",
     )
-    search_fields = ("street_address", "city", "state", "postal_code")
-    list_filter = ("country", "state")
+    search_fields = ("line1", "line2", "city", "state", "postal_code")
+    list_filter = (CountryFacetFilter, StateFacetFilter)
+
+    class Media:
+        css = {"all": (FLAG_SPRITE_CSS,)}
 
     def country_flag(self, obj):
-        if obj.country:
-            return format_html(
-                """<img class="country-select-flag"
-                src="{}"
-                alt="{} Flag"
-                style="margin: auto" />""",
-                obj.country.flag,
-                obj.country.name,
-            )
-        return ""
+        return flag_html(obj.country.code if obj.country else "")
 
     country_flag.short_description = _("Flag")
 
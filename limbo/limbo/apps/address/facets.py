@@ -0,0 +1,98 @@
+"""
+Address counts per (country, state), kept in ``AddressFacet``.
+
+Grouping the address table on every admin page load is a full scan; the
+facet table holds the result instead, a few rows per country. Statement
+level triggers on the address table keep it up to date: each INSERT,
+UPDATE or DELETE statement adds the per-facet difference between its old
+and new rows, whatever wrote them (ORM, bulk paths, upserts, COPY or
+cascades). ``rebuild_facets()`` recomputes it from scratch, for instance
+after a TRUNCATE or a load with the triggers disabled.
+
+Facet rows are never deleted incrementally; readers skip zero counts.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections, migrations, transaction
+
+TABLE = "address_address"
+FACET_TABLE = "address_addressfacet"
+FUNCTION = "address_facet_update"
+
+# Rows are upserted in (country, state) order so concurrent statements lock
+# the facet rows they share in the same order and can't deadlock.
+_UPSERT = f"""
+    INSERT INTO {FACET_TABLE} (country, state, count)
+    SELECT country, state, sum(delta) FROM ({{changes}}) AS changes
+    GROUP BY country, state
+    HAVING sum(delta) <> 0
+    ORDER BY country, state
+    ON CONFLICT (country, state)
+    DO UPDATE SET count = {FACET_TABLE}.count + EXCLUDED.count;
+"""
+_INSERTED = "SELECT country, state, 1 AS delta FROM new_rows"
+_DELETED = "SELECT country, state, -1 AS delta FROM old_rows"
+
+CREATE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {FUNCTION}() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {_UPSERT.format(changes=_INSERTED)}
+    ELSIF TG_OP = 'DELETE' THEN
+        {_UPSERT.format(changes=_DELETED)}
+    ELSE
+        {_UPSERT.format(changes=f"{_INSERTED} UNION ALL {_DELETED}")}
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = {
+    "address_facet_on_insert": ("INSERT", "NEW TABLE AS new_rows"),
+    "address_facet_on_update": (
+        "UPDATE",
+        "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    ),
+    "address_facet_on_delete": ("DELETE", "OLD TABLE AS old_rows"),
+}
+
+
+def rebuild_facets(using=DEFAULT_DB_ALIAS):
+    """
+    Recompute every facet from the address table. Writes to the addresses
+    wait until it is done. Returns the number of facets.
+    """
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {TABLE} IN SHARE MODE")
+        cursor.execute(f"DELETE FROM {FACET_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FACET_TABLE} (country, state, count) "
+            f"SELECT country, state, count(*) FROM {TABLE} "
+            f"GROUP BY country, state"
+        )
+        return cursor.rowcount
+
+
+def facet_triggers():
+    """Migration operation installing the triggers and filling the table."""
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        schema_editor.execute(CREATE_FUNCTION)
+        for name, (event, transition) in TRIGGERS.items():
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name} ON {TABLE}")
+            schema_editor.execute(
+                f"CREATE TRIGGER {name} AFTER {event} ON {TABLE} "
+                f"REFERENCING {transition} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {FUNCTION}()"
+            )
+        rebuild_facets(schema_editor.connection.alias)
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for name in TRIGGERS:
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {name} ON {TABLE}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {FUNCTION}()")
+
+    return migrations.RunPython(forwards, backwards)
@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+from django.utils.html import format_html
+from django.utils.translation import get_language
+from django_countries.fields import Country
+
+# Sprite sheet and stylesheet shipped with django-countries and served from
+# our own static files, so flags cost one cached request per page.
+FLAG_SPRITE_CSS = "flags/sprite.css"
+
+
+def flag_html(code):
+    """
+    The ``<i>`` element rendering ``code``'s flag from the sprite sheet.
+    Memoized per country code and active language (for the label).
+    """
+    if not code:
+        return ""
+    return _flag_html(str(code).upper(), get_language())
+
+
+@lru_cache(maxsize=None)
+def _flag_html(code, language):
+    country = Country(code)
+    return format_html(
+        '<i class="{}" title="{}" aria-label="{}"></i>',
+        country.flag_css,
+        country.name,
+        code,
+    )
@@ -1,10 +1,8 @@
 from django import forms
-from django_countries.widgets import CountrySelectWidget
 from phonenumber_field.formfields import SplitPhoneNumberField
 
 from .models import Address
-
-# You can use a service like FlagsAPI to dynamically display country flags
+from .widgets import CountrySpriteSelectWidget
 
 
 class AddressAdminForm(forms.ModelForm):
@@ -15,11 +13,4 @@ class AddressAdminForm(forms.ModelForm):
     class Meta:
         model = Address
         fields = "__all__"
-        widgets = {
-            "country": CountrySelectWidget(
-                layout="""{widget}
-                <img class="country-select-flag"
-                id="{flag_id}" style="margin: auto"
-                src="{country.flag}">"""
-            )
-        }
+        widgets = {"country": CountrySpriteSelectWidget()}
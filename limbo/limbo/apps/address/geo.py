@@ -0,0 +1,147 @@
+"""
+Geohash encoding and great-circle distances for proximity search.
+
+A geohash interleaves the bits of the quantized longitude and latitude and
+spells them in base 32, so every prefix names a rectangular cell and points
+sharing a prefix are close to each other. That lets a plain B-tree index on
+the hash answer "which rows lie in these cells" with a handful of prefix
+range scans, after which ``haversine_km`` keeps the rows actually within the
+radius.
+"""
+import math
+
+import numpy as np
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+_BASE32_CODES = np.frombuffer(BASE32.encode(), dtype=np.uint8)
+
+
+def _bits(precision):
+    """Number of longitude and latitude bits in a hash of ``precision``."""
+    total = 5 * precision
+    return (total + 1) // 2, total // 2
+
+
+def _quantize(value, low, span, bits):
+    return min(int((value - low) / span * (1 << bits)), (1 << bits) - 1)
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash of the point, ``precision`` characters long."""
+    lon_bits, lat_bits = _bits(precision)
+    x = _quantize(longitude, -180.0, 360.0, lon_bits)
+    y = _quantize(latitude, -90.0, 180.0, lat_bits)
+    code = 0
+    # Bits alternate starting with longitude, most significant first.
+    for index in range(5 * precision):
+        if index % 2 == 0:
+            lon_bits -= 1
+            code = (code << 1) | ((x >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            code = (code << 1) | ((y >> lat_bits) & 1)
+    return "".join(
+        BASE32[(code >> shift) & 31] for shift in range(5 * (precision - 1), -1, -5)
+    )
+
+
+def encode_many(latitudes, longitudes, precision=GEOHASH_PRECISION):
+    """Vectorized ``encode``, returning a NumPy array of strings."""
+    lon_bits, lat_bits = _bits(precision)
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    x = np.minimum(
+        ((longitudes + 180.0) / 360.0 * (1 << lon_bits)).astype(np.uint64),
+        np.uint64((1 << lon_bits) - 1),
+    )
+    y = np.minimum(
+        ((latitudes + 90.0) / 180.0 * (1 << lat_bits)).astype(np.uint64),
+        np.uint64((1 << lat_bits) - 1),
+    )
+    code = np.zeros(x.shape, dtype=np.uint64)
+    one = np.uint64(1)
+    for index in range(5 * precision):
+        if index % 2 == 0:
+            lon_bits -= 1
+            code = (code << one) | ((x >> np.uint64(lon_bits)) & one)
+        else:
+            lat_bits -= 1
+            code = (code << one) | ((y >> np.uint64(lat_bits)) & one)
+    chars = np.empty(x.shape + (precision,), dtype=np.uint8)
+    for index in range(precision):
+        shift = np.uint64(5 * (precision - 1 - index))
+        chars[..., index] = _BASE32_CODES[(code >> shift) & np.uint64(31)]
+    return chars.view(f"S{precision}")[..., 0].astype(str)
+
+
+def decode(geohash):
+    """Centre of the cell named by ``geohash``, with its height and width in degrees."""
+    lon_bits, lat_bits = _bits(len(geohash))
+    code = 0
+    for char in geohash:
+        code = (code << 5) | BASE32.index(char)
+    x = y = 0
+    total = 5 * len(geohash)
+    for index in range(total):
+        bit = (code >> (total - 1 - index)) & 1
+        if index % 2 == 0:
+            x = (x << 1) | bit
+        else:
+            y = (y << 1) | bit
+    height = 180.0 / (1 << lat_bits)
+    width = 360.0 / (1 << lon_bits)
+    return -90.0 + (y + 0.5) * height, -180.0 + (x + 0.5) * width, height, width
+
+
+def cell_size_km(precision, latitude=0.0):
+    """Height and width in kilometres of a cell of ``precision`` at ``latitude``."""
+    lon_bits, lat_bits = _bits(precision)
+    height = 180.0 / (1 << lat_bits) * KM_PER_DEGREE
+    width = 360.0 / (1 << lon_bits) * KM_PER_DEGREE * math.cos(math.radians(latitude))
+    return height, width
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose cells together contain every point within
+    ``radius_km`` of the given point: the cell holding the point and its
+    eight neighbours, at the finest precision whose cells are at least
+    ``radius_km`` across. Returns None when no precision qualifies, that is
+    for radii of thousands of kilometres or circles reaching a pole.
+    """
+    # Cells are narrowest at the latitude furthest from the equator.
+    extreme = abs(latitude) + radius_km / KM_PER_DEGREE
+    if extreme >= 90:
+        return None
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        if min(cell_size_km(candidate, extreme)) < radius_km:
+            break
+        precision = candidate
+    if not precision:
+        return None
+
+    center_lat, center_lon, height, width = decode(encode(latitude, longitude, precision))
+    cells = set()
+    for dy in (-1, 0, 1):
+        lat = center_lat + dy * height
+        if not -90 < lat < 90:
+            continue
+        for dx in (-1, 0, 1):
+            lon = (center_lon + dx * width + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distance in kilometres from one point to many, vectorized."""
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64) - longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
@@ -0,0 +1,298 @@
+"""
+Turning addresses into coordinates.
+
+Lookups go through three tiers, cheapest first:
+
+    in-process LRU -> GeocodeCache table -> geocoding provider
+
+keyed by the normalized address text, so the many identical addresses in
+our data cost one provider call between them. Providers implement
+``BaseGeocoder`` and are selected with the ``GEOCODER`` setting.
+"""
+import csv
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.module_loading import import_string
+
+from limbo.core.cache import LRUCache
+
+from .models import Address, GeocodeCache
+from .normalizers import canonicalize_text, normalize_postal_code
+
+
+class GeocoderError(Exception):
+    """A provider failed to answer; the lookup is not cached and can be retried."""
+
+
+@dataclass(frozen=True)
+class Location:
+    latitude: float
+    longitude: float
+
+
+def geocode_query(line1, line2, city, state, postal_code, country):
+    """Normalized text of an address, the key of every geocoding cache tier."""
+    parts = (
+        canonicalize_text(line1),
+        canonicalize_text(line2),
+        canonicalize_text(city),
+        canonicalize_text(state),
+        normalize_postal_code(postal_code),
+        str(country or "").upper(),
+    )
+    return ", ".join(part for part in parts if part)
+
+
+def address_query(address):
+    return geocode_query(
+        address.line1,
+        address.line2,
+        address.city,
+        address.state,
+        address.postal_code,
+        address.country,
+    )
+
+
+class BaseGeocoder(ABC):
+    """
+    Interface of a geocoding provider. ``geocode`` receives the normalized
+    query text and returns a ``Location``, or None when the address is
+    unknown; transient failures raise ``GeocoderError``.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def geocode(self, query):
+        pass
+
+
+class FileGeocoder(BaseGeocoder):
+    """
+    Stand-in provider answering from a local CSV file with ``address``,
+    ``latitude`` and ``longitude`` columns. Addresses are normalized on load
+    the same way queries are. ``delay`` simulates the latency of a remote
+    provider, in seconds per lookup.
+    """
+
+    name = "file"
+
+    def __init__(self, path=None, delay=0):
+        self.path = path
+        self.delay = delay
+        self._locations = None
+        self._lock = threading.Lock()
+
+    @property
+    def locations(self):
+        with self._lock:
+            if self._locations is None:
+                self._locations = self.load()
+        return self._locations
+
+    def load(self):
+        if not self.path:
+            return {}
+        locations = {}
+        with open(self.path, newline="", encoding="utf-8-sig") as stream:
+            for row in csv.DictReader(stream):
+                locations[self.normalize(row["address"])] = Location(
+                    float(row["latitude"]), float(row["longitude"])
+                )
+        return locations
+
+    def normalize(self, text):
+        parts = (canonicalize_text(part) for part in text.split(","))
+        return ", ".join(part for part in parts if part)
+
+    def geocode(self, query):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.locations.get(self.normalize(query))
+
+
+def get_geocoder():
+    config = getattr(settings, "GEOCODER", {})
+    backend = import_string(
+        config.get("BACKEND", "limbo.apps.address.geocoding.FileGeocoder")
+    )
+    return backend(**config.get("OPTIONS", {}))
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing ``rate`` calls per second on average
+    and bursts of ``burst`` calls. A falsy ``rate`` means no limit.
+    """
+
+    def __init__(self, rate=None, burst=1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_MISSING = object()
+
+
+@dataclass
+class GeocodeStats:
+    memory_hits: int = 0
+    database_hits: int = 0
+    provider_calls: int = 0
+    failures: int = 0
+
+    @property
+    def lookups(self):
+        return self.memory_hits + self.database_hits + self.provider_calls
+
+    @property
+    def hit_rate(self):
+        """Share of lookups answered without calling the provider."""
+        if not self.lookups:
+            return 0.0
+        return (self.memory_hits + self.database_hits) / self.lookups
+
+
+class CachedGeocoder:
+    """
+    Resolves queries through the in-process LRU, then the ``GeocodeCache``
+    table, then ``geocoder``. Provider answers, including "not found", are
+    written back to both caches; ``GeocoderError`` failures are not.
+    """
+
+    def __init__(
+        self,
+        geocoder=None,
+        maxsize=10_000,
+        workers=4,
+        rate=None,
+        using=DEFAULT_DB_ALIAS,
+    ):
+        self.geocoder = geocoder if geocoder is not None else get_geocoder()
+        self.memory = LRUCache(maxsize)
+        self.workers = workers
+        self.limiter = RateLimiter(rate, burst=workers)
+        self.using = using
+        self.stats = GeocodeStats()
+
+    def geocode(self, query):
+        return self.geocode_many([query]).get(query)
+
+    def geocode_many(self, queries):
+        """
+        Map each of ``queries`` to a ``Location`` or None. Each distinct query
+        costs at most one lookup per tier; the provider is called for the
+        remaining ones concurrently, within the rate limit. Queries whose
+        provider call failed are left out of the result.
+        """
+        results = {}
+        pending = {}
+        for query in queries:
+            if query in results or query in pending:
+                # Repeats within the batch are answered like memory hits.
+                self.stats.memory_hits += 1
+                continue
+            location = self.memory.get(query, _MISSING)
+            if location is _MISSING:
+                pending[query] = None
+            else:
+                results[query] = location
+                self.stats.memory_hits += 1
+        if pending:
+            stored = self.fetch(list(pending))
+            self.stats.database_hits += len(stored)
+            fetched = self.call_provider([q for q in pending if q not in stored])
+            self.store(fetched)
+            for query, location in {**stored, **fetched}.items():
+                self.memory.set(query, location)
+                results[query] = location
+        return results
+
+    def fetch(self, queries):
+        entries = GeocodeCache.objects.using(self.using).filter(query__in=queries)
+        return {
+            query: None if latitude is None else Location(latitude, longitude)
+            for query, latitude, longitude in entries.values_list(
+                "query", "latitude", "longitude"
+            )
+        }
+
+    def call_provider(self, queries):
+        if not queries:
+            return {}
+
+        def lookup(query):
+            self.limiter.acquire()
+            try:
+                return query, self.geocoder.geocode(query)
+            except GeocoderError:
+                return query, _MISSING
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            answers = list(executor.map(lookup, queries))
+        self.stats.provider_calls += len(answers)
+        fetched = {}
+        for query, location in answers:
+            if location is _MISSING:
+                self.stats.failures += 1
+            else:
+                fetched[query] = location
+        return fetched
+
+    def store(self, fetched):
+        GeocodeCache.objects.using(self.using).bulk_create(
+            [
+                GeocodeCache(
+                    query=query,
+                    provider=self.geocoder.name,
+                    latitude=location.latitude if location else None,
+                    longitude=location.longitude if location else None,
+                )
+                for query, location in fetched.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+    def geocode_addresses(self, addresses):
+        """
+        Set the coordinates of ``addresses`` in place and save them with one
+        ``bulk_update``. Returns the addresses that got coordinates.
+        """
+        queries = [address_query(address) for address in addresses]
+        locations = self.geocode_many(queries)
+        located = []
+        for address, query in zip(addresses, queries):
+            location = locations.get(query)
+            if location is not None:
+                address.latitude = location.latitude
+                address.longitude = location.longitude
+                located.append(address)
+        Address.objects.using(self.using).bulk_update(
+            located, ["latitude", "longitude"]
+        )
+        return located
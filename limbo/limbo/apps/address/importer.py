@@ -0,0 +1,302 @@
+"""
+Streaming bulk import of addresses.
+
+Rows flow through a chain of generators so only one batch is held in memory
+at a time, whatever the size of the input:
+
+    read (CSV / NDJSON) -> normalize -> validate -> upsert / COPY
+
+Rows that fail any stage are written to a reject file together with the
+reason instead of aborting the import. Inserts are upserts keyed on the
+address fingerprint, so importing the same file twice does not create
+duplicates.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django_countries import countries
+
+from .constants import TITLE_CHOICES
+from .manager import UPSERT_UPDATE_FIELDS, dedupe_by_fingerprint
+from .models import Address
+from .normalizers import normalize_phone_number, normalize_postal_code
+from .validators import validate_postal_codes
+
+FORMATS = ("csv", "ndjson")
+
+IMPORT_FIELDS = (
+    "title",
+    "first_name",
+    "last_name",
+    "line1",
+    "line2",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+    "phone_number",
+)
+REQUIRED_FIELDS = ("first_name", "last_name", "line1", "country")
+TITLES = {value for value, _ in TITLE_CHOICES}
+
+
+@dataclass
+class ImportRow:
+    line: int
+    data: dict
+    cleaned: dict = field(default_factory=dict)
+    error: str = ""
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_csv(stream):
+    for line, data in enumerate(csv.DictReader(stream), start=2):
+        yield ImportRow(line=line, data=data)
+
+
+def read_ndjson(stream):
+    for line, raw in enumerate(stream, start=1):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError as exc:
+            yield ImportRow(line=line, data={"raw": raw}, error=f"Invalid JSON: {exc}")
+            continue
+        if not isinstance(data, dict):
+            yield ImportRow(line=line, data={"raw": raw}, error="Expected an object.")
+            continue
+        yield ImportRow(line=line, data=data)
+
+
+READERS = {"csv": read_csv, "ndjson": read_ndjson}
+
+
+def normalize(rows, default_region=None):
+    """Trim every field and canonicalize the postal code and phone number."""
+    for row in rows:
+        if not row.error:
+            cleaned = {
+                name: str(row.data.get(name) or "").strip() for name in IMPORT_FIELDS
+            }
+            cleaned["country"] = cleaned["country"].upper()
+            cleaned["postal_code"] = normalize_postal_code(cleaned["postal_code"])
+            try:
+                cleaned["phone_number"] = normalize_phone_number(
+                    cleaned["phone_number"],
+                    region=cleaned["country"] or default_region,
+                )
+            except ValidationError as exc:
+                row.error = _format_error("phone_number", exc)
+            row.cleaned = cleaned
+        yield row
+
+
+def check_fields(cleaned):
+    """Cheap per-field checks standing in for a full_clean() per row."""
+    for name in REQUIRED_FIELDS:
+        if not cleaned[name]:
+            return f"{name}: This field is required."
+    for name in IMPORT_FIELDS:
+        max_length = Address._meta.get_field(name).max_length
+        if cleaned[name] and len(cleaned[name]) > max_length:
+            return f"{name}: Ensure this value has at most {max_length} characters."
+    if cleaned["country"] not in countries:
+        return f"country: {cleaned['country']!r} is not a valid country code."
+    if cleaned["title"] and cleaned["title"] not in TITLES:
+        return f"title: {cleaned['title']!r} is not a valid choice."
+    return ""
+
+
+def validate(rows, batch_size):
+    """
+    Run field checks per row and postal code validation once per batch through
+    the validators module, which groups the batch by country.
+    """
+    for batch in batched(rows, batch_size):
+        pending = []
+        for row in batch:
+            if not row.error:
+                row.error = check_fields(row.cleaned)
+            if not row.error:
+                pending.append(row)
+
+        results = validate_postal_codes(
+            (row.cleaned["postal_code"], row.cleaned["country"]) for row in pending
+        )
+        for row, error in zip(pending, results):
+            if error is not None:
+                row.error = _format_error("postal_code", error)
+
+        yield from batch
+
+
+def _format_error(name, exc):
+    return f"{name}: {'; '.join(exc.messages)}"
+
+
+class RejectWriter:
+    """
+    Writes rejected rows, with their line number and error, to ``path``.
+    The file is only created once the first row is rejected.
+    """
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._stream = None
+        self._writer = None
+
+    def write(self, row):
+        if self.path is None:
+            return
+        if self._stream is None:
+            self._stream = open(self.path, "w", newline="", encoding="utf-8")
+        record = {"line": row.line, "error": row.error, **row.data}
+        if self.fmt == "ndjson":
+            self._stream.write(json.dumps(record, default=str) + "\n")
+            return
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._stream, fieldnames=list(record), extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerow(record)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.close()
+
+
+class AddressImporter:
+    """
+    Imports addresses from a text stream.
+
+    ``use_copy`` switches the insert stage to PostgreSQL ``COPY FROM STDIN``;
+    it is ignored on other backends, which always use ``upsert_many``.
+    """
+
+    def __init__(
+        self,
+        batch_size=1000,
+        use_copy=False,
+        reject_path=None,
+        default_region=None,
+        using=DEFAULT_DB_ALIAS,
+        progress=None,
+    ):
+        self.batch_size = batch_size
+        self.using = using
+        self.use_copy = use_copy and connections[using].vendor == "postgresql"
+        self.reject_path = reject_path
+        self.default_region = default_region
+        self.progress = progress
+
+    def rows(self, stream, fmt):
+        rows = READERS[fmt](stream)
+        rows = normalize(rows, self.default_region)
+        return validate(rows, self.batch_size)
+
+    def run(self, stream, fmt="csv"):
+        result = ImportResult()
+        rejects = RejectWriter(self.reject_path, fmt)
+        try:
+            for batch in batched(self.rows(stream, fmt), self.batch_size):
+                addresses = []
+                for row in batch:
+                    if row.error:
+                        rejects.write(row)
+                        result.rejected += 1
+                    else:
+                        addresses.append(Address(**row.cleaned))
+                if addresses:
+                    self.insert(addresses)
+                    result.imported += len(addresses)
+                result.batches += 1
+                if self.progress is not None:
+                    self.progress(result)
+        finally:
+            rejects.close()
+        return result
+
+    def insert(self, addresses):
+        with transaction.atomic(using=self.using):
+            if self.use_copy:
+                copy_addresses(addresses, using=self.using)
+            else:
+                Address.objects.using(self.using).upsert_many(addresses)
+
+
+COPY_NULL = r"\N"
+COPY_STAGING_TABLE = "address_import_staging"
+
+
+def copy_addresses(addresses, using=DEFAULT_DB_ALIAS):
+    """
+    Upsert ``addresses`` through PostgreSQL ``COPY``: rows are copied into a
+    temporary staging table, then moved with one
+    ``INSERT ... SELECT ... ON CONFLICT (fingerprint) DO UPDATE``.
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    fields = [f for f in Address._meta.concrete_fields if not f.primary_key]
+    addresses = dedupe_by_fingerprint(addresses)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for address in addresses:
+        address.refresh_derived_fields()
+        values = []
+        for f in fields:
+            value = f.get_db_prep_save(f.pre_save(address, True), connection)
+            values.append(COPY_NULL if value is None else value)
+        writer.writerow(values)
+    buffer.seek(0)
+
+    table = quote_name(Address._meta.db_table)
+    staging = quote_name(COPY_STAGING_TABLE)
+    columns = ", ".join(quote_name(f.column) for f in fields)
+    updates = ", ".join(
+        "%s = EXCLUDED.%s" % (quote_name(column), quote_name(column))
+        for column in (Address._meta.get_field(name).column for name in UPSERT_UPDATE_FIELDS)
+    )
+    copy_sql = "COPY %s (%s) FROM STDIN WITH (FORMAT csv, NULL '%s')" % (
+        staging,
+        columns,
+        COPY_NULL,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMPORARY TABLE IF NOT EXISTS %s ON COMMIT DELETE ROWS "
+            "AS SELECT %s FROM %s WITH NO DATA" % (staging, columns, table)
+        )
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(copy_sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+        cursor.execute(
+            "INSERT INTO %s (%s) SELECT %s FROM %s "
+            "ON CONFLICT (%s) DO UPDATE SET %s"
+            % (table, columns, columns, staging, quote_name("fingerprint"), updates)
+        )
+        cursor.execute("TRUNCATE %s" % staging)
@@ -0,0 +1,93 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from limbo.apps.address.geocoding import CachedGeocoder
+from limbo.apps.address.models import Address
+
+
+class Command(BaseCommand):
+    help = (
+        "Geocode addresses without coordinates in batches, through the in-process "
+        "and database caches, calling the provider with bounded concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Concurrent provider calls.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Maximum provider calls per second. Unlimited when omitted.",
+        )
+        parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=10_000,
+            help="Entries kept in the in-process LRU.",
+        )
+        parser.add_argument("--limit", type=int, help="Stop after this many addresses.")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also re-geocode addresses that already have coordinates.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        for name in ("batch_size", "workers", "cache_size"):
+            if options[name] < 1:
+                option = name.replace("_", "-")
+                raise CommandError(f"--{option} must be a positive integer.")
+
+        using = options["database"]
+        geocoder = CachedGeocoder(
+            maxsize=options["cache_size"],
+            workers=options["workers"],
+            rate=options["rate"],
+            using=using,
+        )
+        addresses = Address.objects.using(using).order_by("pk")
+        if not options["all"]:
+            addresses = addresses.filter(latitude__isnull=True)
+
+        started = time.perf_counter()
+        processed = located = 0
+        last_pk = 0
+        limit = options["limit"]
+        while limit is None or processed < limit:
+            size = options["batch_size"]
+            if limit is not None:
+                size = min(size, limit - processed)
+            # Keyset pagination: rows left ungeocoded stay behind last_pk.
+            batch = list(addresses.filter(pk__gt=last_pk)[:size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            located += len(geocoder.geocode_addresses(batch))
+            processed += len(batch)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{processed} addresses, {located} geocoded")
+                self.report(geocoder.stats)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Geocoded {located} of {processed} addresses in {elapsed:.1f}s "
+                f"({processed / elapsed if elapsed else 0:.0f} addresses/s)."
+            )
+        )
+        self.report(geocoder.stats)
+
+    def report(self, stats):
+        self.stdout.write(
+            f"cache hit rate {stats.hit_rate:.1%}: {stats.memory_hits} memory, "
+            f"{stats.database_hits} database, {stats.provider_calls} provider calls "
+            f"({stats.failures} failed)"
+        )
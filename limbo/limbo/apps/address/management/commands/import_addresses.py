@@ -0,0 +1,88 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from limbo.apps.address.importer import FORMATS, AddressImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream addresses from a CSV or NDJSON file into the database in batches. "
+        "Invalid rows are written to a reject file instead of aborting the import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or '-' to read from stdin.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Input format. Guessed from the file extension when omitted.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--reject-file",
+            help="Where rejected rows go. Defaults to <path>.rejects.<format>.",
+        )
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Insert with COPY FROM STDIN when running on PostgreSQL.",
+        )
+        parser.add_argument(
+            "--region",
+            help="Default region used to parse phone numbers of rows without a country.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or self.guess_format(path)
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        reject_path = options["reject_file"]
+        if reject_path is None and path != "-":
+            reject_path = f"{path}.rejects.{fmt}"
+
+        importer = AddressImporter(
+            batch_size=options["batch_size"],
+            use_copy=options["copy"],
+            reject_path=reject_path,
+            default_region=options["region"],
+            using=options["database"],
+            progress=self.report_progress if options["verbosity"] > 1 else None,
+        )
+
+        if path == "-":
+            result = importer.run(sys.stdin, fmt)
+        else:
+            try:
+                stream = open(path, newline="", encoding="utf-8-sig")
+            except OSError as exc:
+                raise CommandError(f"Cannot open {path}: {exc}")
+            with stream:
+                result = importer.run(stream, fmt)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} addresses, rejected {result.rejected}."
+            )
+        )
+        if result.rejected and reject_path:
+            self.stdout.write(f"Rejected rows written to {reject_path}")
+
+    def guess_format(self, path):
+        extension = os.path.splitext(path)[1].lstrip(".").lower()
+        if extension in ("json", "jsonl"):
+            extension = "ndjson"
+        if extension not in FORMATS:
+            raise CommandError("Cannot guess the input format, pass --format.")
+        return extension
+
+    def report_progress(self, result):
+        self.stdout.write(
+            f"batch {result.batches}: {result.imported} imported, "
+            f"{result.rejected} rejected"
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from limbo.apps.address.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the address counts per country and state from the address "
+        "table. The triggers keep them current; run this after bulk loads with "
+        "triggers disabled or a TRUNCATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        facets = rebuild_facets(options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {facets} address facets."))
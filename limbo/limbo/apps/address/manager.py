@@ -0,0 +1,261 @@
+from django.db import models, transaction
+from django.db.models import Q, Sum
+
+from limbo.core.managers import BaseQuerySet
+
+from . import geo
+from .normalizers import ADDRESS_NORMALIZERS, FINGERPRINT_FIELDS, phone_number_e164
+
+COORDINATE_FIELDS = ("latitude", "longitude")
+PHONE_FIELDS = ("phone_number", "country")
+
+# Columns computed from other fields, mapped to the fields they depend on.
+# Address.refresh_<column>() recomputes each of them; every write path keeps
+# them in sync when one of their source fields is written.
+DERIVED_FIELDS = {
+    "fingerprint": FINGERPRINT_FIELDS,
+    "geohash": COORDINATE_FIELDS,
+    "phone_e164": PHONE_FIELDS,
+}
+
+
+def derived_fields_for(fields):
+    """Derived columns depending on any of ``fields``."""
+    fields = set(fields)
+    return [
+        name
+        for name, sources in DERIVED_FIELDS.items()
+        if not fields.isdisjoint(sources)
+    ]
+
+
+# Fields refreshed when an upsert hits an existing fingerprint. The person
+# and address fields themselves are left alone: they already canonicalize to
+# the same value.
+UPSERT_UPDATE_FIELDS = (
+    "title",
+    "phone_number",
+    "phone_e164",
+    "updated_by",
+    "updated_at",
+)
+
+
+def dedupe_by_fingerprint(objs):
+    """Keep the last object for each fingerprint, in first-seen order."""
+    unique = {}
+    for obj in objs:
+        obj.refresh_fingerprint()
+        unique.pop(obj.fingerprint, None)
+        unique[obj.fingerprint] = obj
+    return list(unique.values())
+
+
+def normalize_update_value(name, value):
+    """
+    Canonicalize a value passed to ``QuerySet.update()``: plain strings in
+    Python, expressions by wrapping them in the matching database function.
+    """
+    normalize, database_function = ADDRESS_NORMALIZERS[name]
+    if isinstance(value, str):
+        return normalize(value)
+    if hasattr(value, "resolve_expression"):
+        return database_function(value)
+    return value
+
+
+class AddressQuerySet(BaseQuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalize()
+            obj.refresh_derived_fields()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        normalize = not ADDRESS_NORMALIZERS.keys().isdisjoint(fields)
+        derived = derived_fields_for(fields)
+        for obj in objs:
+            if normalize:
+                obj.normalize()
+            obj.refresh_derived_fields(derived)
+        return super().bulk_update(objs, [*fields, *derived], *args, **kwargs)
+
+    def update(self, **kwargs):
+        for name in ADDRESS_NORMALIZERS.keys() & kwargs.keys():
+            kwargs[name] = normalize_update_value(name, kwargs[name])
+        derived = derived_fields_for(kwargs)
+        if not derived:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            updated = self.model._default_manager.using(self.db).filter(pk__in=pks)
+            for field in derived:
+                updated._refresh(field)
+        return rows
+
+    update.alters_data = True
+
+    def _refresh(self, field, batch_size=1000):
+        addresses = self.only("pk", *DERIVED_FIELDS[field]).iterator(
+            chunk_size=batch_size
+        )
+        refresh = f"refresh_{field}"
+        batch = []
+        updated = 0
+        for address in addresses:
+            getattr(address, refresh)()
+            batch.append(address)
+            if len(batch) >= batch_size:
+                updated += super().bulk_update(batch, [field])
+                batch = []
+        if batch:
+            updated += super().bulk_update(batch, [field])
+        return updated
+
+    def refresh_fingerprints(self, batch_size=1000):
+        """Recompute and store the fingerprint of every row in the queryset."""
+        return self._refresh("fingerprint", batch_size)
+
+    refresh_fingerprints.alters_data = True
+
+    def refresh_geohashes(self, batch_size=1000):
+        """Recompute and store the geohash of every row in the queryset."""
+        return self._refresh("geohash", batch_size)
+
+    refresh_geohashes.alters_data = True
+
+    def refresh_phone_numbers(self, batch_size=1000):
+        """Recompute and store the E.164 phone number of every row in the queryset."""
+        return self._refresh("phone_e164", batch_size)
+
+    refresh_phone_numbers.alters_data = True
+
+    def normalize(self):
+        """
+        Canonicalize rows written before normalization was enforced, or by
+        raw SQL, with one set-based UPDATE per normalized field.
+        """
+        updated = 0
+        for name, (_, database_function) in ADDRESS_NORMALIZERS.items():
+            stale = self.exclude(**{name: database_function(name)})
+            # Derived columns are computed from the canonical form already,
+            # so the plain UPDATE is enough.
+            updated += super(AddressQuerySet, stale).update(
+                **{name: database_function(name)}
+            )
+        return updated
+
+    normalize.alters_data = True
+
+    def by_phone(self, value, region=None):
+        """
+        Addresses using the phone number ``value``, whatever its formatting:
+        an index probe on the canonical E.164 column.
+        """
+        number = phone_number_e164(value, region)
+        if not number:
+            return self.none()
+        return self.filter(phone_e164=number)
+
+    def by_fingerprint(self, fingerprint):
+        return self.filter(fingerprint=fingerprint)
+
+    def duplicates_of(self, address):
+        """Other rows sharing ``address``'s fingerprint (an index probe)."""
+        address.refresh_fingerprint()
+        return self.filter(fingerprint=address.fingerprint).exclude(pk=address.pk)
+
+    def upsert_many(self, objs, update_fields=UPSERT_UPDATE_FIELDS, batch_size=None):
+        """
+        Insert ``objs``, or update the existing row with the same fingerprint,
+        using a single ``INSERT ... ON CONFLICT (fingerprint) DO UPDATE`` per
+        batch. Duplicates within ``objs`` are collapsed, the last one winning.
+        """
+        objs = dedupe_by_fingerprint(objs)
+        return self.bulk_create(
+            objs,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["fingerprint"],
+            update_fields=list(update_fields),
+        )
+
+    upsert_many.alters_data = True
+
+    def nearby_candidates(self, latitude, longitude, radius_km):
+        """
+        Superset of ``nearby`` computed in the database alone: rows in the
+        geohash cells covering the circle (a few prefix scans of the
+        ``geohash`` index) and within its latitude band.
+        """
+        band = radius_km / geo.KM_PER_DEGREE
+        candidates = self.filter(
+            latitude__range=(latitude - band, latitude + band),
+            longitude__isnull=False,
+        )
+        cells = geo.covering_cells(latitude, longitude, radius_km)
+        if cells is None:
+            return candidates
+        prefixes = Q()
+        for cell in cells:
+            prefixes |= Q(geohash__startswith=cell)
+        return candidates.filter(prefixes)
+
+    def nearby(self, latitude, longitude, radius_km):
+        """
+        Addresses within ``radius_km`` kilometres of the given point.
+
+        Only the coordinates of ``nearby_candidates`` are fetched, and a
+        vectorized haversine pass keeps those actually within the radius.
+        The result is a queryset of the matching rows and can be chained.
+        """
+        rows = list(
+            self.nearby_candidates(latitude, longitude, radius_km).values_list(
+                "pk", "latitude", "longitude"
+            )
+        )
+        if not rows:
+            return self.none()
+        pks, latitudes, longitudes = zip(*rows)
+        distances = geo.haversine_km(latitude, longitude, latitudes, longitudes)
+        return self.filter(
+            pk__in=[pk for pk, distance in zip(pks, distances) if distance <= radius_km]
+        )
+
+
+AddressManager = models.Manager.from_queryset(AddressQuerySet)
+
+
+class AddressFacetQuerySet(models.QuerySet):
+    def nonzero(self):
+        return self.filter(count__gt=0)
+
+    def countries(self):
+        """``(country, count)`` pairs, by country code."""
+        return (
+            self.nonzero()
+            .values_list("country")
+            .annotate(total=Sum("count"))
+            .order_by("country")
+        )
+
+    def states(self, country=None, limit=None):
+        """
+        ``(state, count)`` pairs, of ``country`` or of every country, most
+        frequent first.
+        """
+        facets = self.nonzero().exclude(state="")
+        if country:
+            facets = facets.filter(country=country)
+        states = (
+            facets.values_list("state")
+            .annotate(total=Sum("count"))
+            .order_by("-total", "state")
+        )
+        return states[:limit] if limit else states
+
+
+AddressFacetManager = models.Manager.from_queryset(AddressFacetQuerySet)
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:51
+
+from django.db import migrations, models
+from django.db.models import Min
+
+from limbo.apps.address.normalizers import FINGERPRINT_FIELDS, address_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """
+    Fingerprint existing rows, then clear the fingerprint of every duplicate
+    but the oldest so the unique constraint can be added. The duplicates stay
+    in the table untouched otherwise.
+    """
+    Address = apps.get_model("address", "Address")
+    db_alias = schema_editor.connection.alias
+    batch = []
+    for address in (
+        Address.objects.using(db_alias)
+        .only("pk", *FINGERPRINT_FIELDS)
+        .iterator(chunk_size=2000)
+    ):
+        address.fingerprint = address_fingerprint(
+            *(getattr(address, name) for name in FINGERPRINT_FIELDS)
+        )
+        batch.append(address)
+        if len(batch) >= 2000:
+            Address.objects.using(db_alias).bulk_update(batch, ["fingerprint"])
+            batch = []
+    if batch:
+        Address.objects.using(db_alias).bulk_update(batch, ["fingerprint"])
+
+    keep = (
+        Address.objects.using(db_alias)
+        .values("fingerprint")
+        .annotate(first=Min("pk"))
+        .values("first")
+    )
+    Address.objects.using(db_alias).exclude(pk__in=keep).update(fingerprint=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0003_address_phone_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='fingerprint',
+            field=models.CharField(editable=False, help_text='Hash of the canonicalized name and address fields.', max_length=64, null=True, verbose_name='Fingerprint'),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='address',
+            name='fingerprint',
+            field=models.CharField(editable=False, help_text='Hash of the canonicalized name and address fields.', max_length=64, null=True, unique=True, verbose_name='Fingerprint'),
+        ),
+    ]
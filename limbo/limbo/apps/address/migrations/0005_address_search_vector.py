@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:57
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from limbo.core.search import search_vector_trigger
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0004_address_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        search_vector_trigger(
+            "address_address", ["line1", "line2", "city", "state", "postal_code"]
+        ),
+    ]
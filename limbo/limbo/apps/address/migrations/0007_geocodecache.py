@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0006_address_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.TextField(unique=True, verbose_name='Query')),
+                ('provider', models.CharField(max_length=64, verbose_name='Provider')),
+                ('latitude', models.FloatField(null=True, verbose_name='Latitude')),
+                ('longitude', models.FloatField(null=True, verbose_name='Longitude')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'verbose_name': 'Geocode cache entry',
+                'verbose_name_plural': 'Geocode cache',
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:30
+
+from django.db import migrations, models
+
+from limbo.apps.address.normalizers import phone_number_e164
+
+
+def backfill_phone_e164(apps, schema_editor):
+    Address = apps.get_model("address", "Address")
+    addresses = Address.objects.using(schema_editor.connection.alias)
+    batch = []
+    for address in (
+        addresses.filter(phone_number__isnull=False)
+        .only("pk", "phone_number", "country")
+        .iterator(chunk_size=2000)
+    ):
+        region = address.country.code if address.country else None
+        address.phone_e164 = phone_number_e164(address.phone_number, region)
+        batch.append(address)
+        if len(batch) >= 2000:
+            addresses.bulk_update(batch, ["phone_e164"])
+            batch = []
+    if batch:
+        addresses.bulk_update(batch, ["phone_e164"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0007_geocodecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='phone_e164',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Canonical form of the phone number, used for reverse lookups.', max_length=16, verbose_name='Phone number (E.164)'),
+        ),
+        migrations.RunPython(backfill_phone_e164, migrations.RunPython.noop),
+    ]
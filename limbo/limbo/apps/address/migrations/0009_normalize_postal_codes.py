@@ -0,0 +1,24 @@
+from django.db import migrations
+from django.db.models.functions import Upper
+
+
+def uppercase_postal_codes(apps, schema_editor):
+    """
+    Rows written through bulk_create or QuerySet.update() skipped the old
+    pre_save signal; bring them to the canonical form in one statement.
+    """
+    Address = apps.get_model("address", "Address")
+    Address.objects.using(schema_editor.connection.alias).exclude(
+        postal_code=Upper("postal_code")
+    ).update(postal_code=Upper("postal_code"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0008_address_phone_e164'),
+    ]
+
+    operations = [
+        migrations.RunPython(uppercase_postal_codes, migrations.RunPython.noop),
+    ]
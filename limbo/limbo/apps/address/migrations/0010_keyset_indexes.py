@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0009_normalize_postal_codes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['created_at', 'id'], name='address_address_created_seek'),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['created_by', 'id'], name='address_address_cby_seek'),
+        ),
+    ]
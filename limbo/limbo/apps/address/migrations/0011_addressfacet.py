@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:13
+
+from django.db import migrations, models
+
+from limbo.apps.address.facets import facet_triggers
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AddressFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('country', models.CharField(max_length=2, verbose_name='Country')),
+                ('state', models.CharField(blank=True, max_length=255, verbose_name='State/Province')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Count')),
+            ],
+            options={
+                'verbose_name': 'Address facet',
+                'verbose_name_plural': 'Address facets',
+                'constraints': [models.UniqueConstraint(fields=('country', 'state'), name='address_facet_country_state')],
+            },
+        ),
+        facet_triggers(),
+    ]
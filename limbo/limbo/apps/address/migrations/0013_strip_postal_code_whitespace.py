@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from limbo.apps.address.normalizers import canonical_postal_code
+
+
+def canonicalize_postal_codes(apps, schema_editor):
+    """
+    Saves and updates only uppercased postal codes while the importer also
+    removed their whitespace; bring every row to the importer's form. The
+    fingerprints already ignored whitespace and stay valid.
+    """
+    Address = apps.get_model("address", "Address")
+    Address.objects.using(schema_editor.connection.alias).exclude(
+        postal_code=canonical_postal_code("postal_code")
+    ).update(postal_code=canonical_postal_code("postal_code"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0011_addressfacet'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_postal_codes, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,6 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import pgettext_lazy
@@ -6,7 +9,20 @@ from phonenumber_field.modelfields import PhoneNumberField
 
 from limbo.core.base_model import BaseModel
 
+from . import geo
 from .constants import TITLE_CHOICES
+from .manager import (
+    DERIVED_FIELDS,
+    AddressFacetManager,
+    AddressManager,
+    derived_fields_for,
+)
+from .normalizers import (
+    ADDRESS_NORMALIZERS,
+    FINGERPRINT_FIELDS,
+    address_fingerprint,
+    phone_number_e164,
+)
 
 
 class Address(BaseModel):
@@ -31,8 +47,48 @@ class Address(BaseModel):
     )
 
     phone_number = PhoneNumberField(_("Phone Number"), null=True, blank=True)
+    phone_e164 = models.CharField(
+        _("Phone number (E.164)"),
+        max_length=16,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text=_("Canonical form of the phone number, used for reverse lookups."),
+    )
     city = models.CharField(_("City"), max_length=255, blank=True)
     state = models.CharField(_("State/Province"), max_length=255, blank=True)
+    fingerprint = models.CharField(
+        _("Fingerprint"),
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+        help_text=_("Hash of the canonicalized name and address fields."),
+    )
+    latitude = models.FloatField(
+        _("Latitude"),
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        _("Longitude"),
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    geohash = models.CharField(
+        _("Geohash"),
+        max_length=geo.GEOHASH_PRECISION,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text=_("Geohash of the coordinates, used to prune proximity searches."),
+    )
+    # Maintained by a database trigger on PostgreSQL, see migration 0005.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = AddressManager()
 
     def __str__(self):
         return f"{self.line1}, {self.city}, {self.state}, {self.country}"
@@ -51,6 +107,124 @@ class Address(BaseModel):
             return ""
         return f"https://flagsapi.com/{self.country.code.upper()}/flat/{size}.png"
 
-    class Meta:
+    def normalize(self):
+        """Canonicalize the fields listed in ``ADDRESS_NORMALIZERS`` in place."""
+        for name, (normalize, _expression) in ADDRESS_NORMALIZERS.items():
+            value = getattr(self, name)
+            if value:
+                setattr(self, name, normalize(value))
+
+    def compute_fingerprint(self):
+        return address_fingerprint(
+            *(getattr(self, name) for name in FINGERPRINT_FIELDS)
+        )
+
+    def refresh_fingerprint(self):
+        self.fingerprint = self.compute_fingerprint()
+        return self.fingerprint
+
+    def validate_fingerprint(self, using=None):
+        """
+        Raise ``ValidationError`` if another row has the same person at the
+        same address. The unique ``fingerprint`` isn't editable, so
+        ``validate_unique()`` would skip it otherwise.
+        """
+        duplicates = type(self)._default_manager.db_manager(using or self._state.db)
+        if duplicates.duplicates_of(self).exists():
+            raise ValidationError(
+                {
+                    NON_FIELD_ERRORS: ValidationError(
+                        _("An address for this person already exists."),
+                        code="unique",
+                    )
+                }
+            )
+
+    def validate_unique(self, exclude=None):
+        errors = {}
+        try:
+            super().validate_unique(exclude)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        try:
+            self.validate_fingerprint()
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        if errors:
+            raise ValidationError(errors)
+
+    def refresh_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+        return self.geohash
+
+    def refresh_phone_e164(self):
+        region = self.country.code if self.country else None
+        self.phone_e164 = phone_number_e164(self.phone_number, region)
+        return self.phone_e164
+
+    def refresh_derived_fields(self, fields=DERIVED_FIELDS):
+        for name in fields:
+            getattr(self, f"refresh_{name}")()
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        self.refresh_derived_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                *derived_fields_for(update_fields),
+            }
+        super().save(*args, **kwargs)
+
+    class Meta(BaseModel.Meta):
         verbose_name = "Address"
         verbose_name_plural = "Addresses"
+
+
+class GeocodeCache(models.Model):
+    """
+    Provider answers keyed by normalized address text, see ``geocoding``.
+    Null coordinates record that the provider does not know the address.
+    """
+
+    query = models.TextField(_("Query"), unique=True)
+    provider = models.CharField(_("Provider"), max_length=64)
+    latitude = models.FloatField(_("Latitude"), null=True)
+    longitude = models.FloatField(_("Longitude"), null=True)
+    created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
+
+    def __str__(self):
+        return self.query
+
+    class Meta:
+        verbose_name = "Geocode cache entry"
+        verbose_name_plural = "Geocode cache"
+
+
+class AddressFacet(models.Model):
+    """
+    Number of addresses per country and state, maintained by triggers on
+    the address table, see ``facets``.
+    """
+
+    country = models.CharField(_("Country"), max_length=2)
+    state = models.CharField(_("State/Province"), max_length=255, blank=True)
+    count = models.BigIntegerField(_("Count"), default=0)
+
+    objects = AddressFacetManager()
+
+    def __str__(self):
+        return f"{self.country} {self.state}: {self.count}"
+
+    class Meta:
+        verbose_name = "Address facet"
+        verbose_name_plural = "Address facets"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["country", "state"], name="address_facet_country_state"
+            ),
+        ]
@@ -0,0 +1,159 @@
+import hashlib
+import re
+import unicodedata
+from functools import lru_cache
+
+import phonenumbers
+from django.core.exceptions import ValidationError
+from django.db.models import Func, Value
+from django.db.models.functions import Upper
+from django.utils.translation import gettext_lazy as _
+from phonenumber_field.phonenumber import PhoneNumber
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+# Fields that identify an address record, the person and where they live,
+# in fingerprint order.
+FINGERPRINT_FIELDS = (
+    "first_name",
+    "last_name",
+    "line1",
+    "line2",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+)
+
+
+def normalize_postal_code(value):
+    """
+    Canonical form of a postal code: surrounding and inner whitespace removed
+    and letters uppercased, which is what POSTCODES_REGEX expects.
+    """
+    if not value:
+        return ""
+    return _WHITESPACE.sub("", value).upper()
+
+
+class StripWhitespace(Func):
+    """
+    ``expression`` without its whitespace. SQLite has no REGEXP_REPLACE and
+    only strips ASCII whitespace.
+    """
+
+    function = "REGEXP_REPLACE"
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, Value(r"\s+"), Value(""), Value("g"), **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        expression = self.source_expressions[0]
+        for char in " \t\n\r\f\v":
+            expression = Func(expression, Value(char), Value(""), function="REPLACE")
+        return compiler.compile(expression)
+
+
+def canonical_postal_code(expression):
+    """``normalize_postal_code`` as a database expression."""
+    return Upper(StripWhitespace(expression))
+
+
+# Address fields canonicalized on every write path, mapped to the Python
+# function used for instances and the database function wrapping
+# expressions passed to QuerySet.update(). Both must agree; the importer
+# uses the same Python functions.
+ADDRESS_NORMALIZERS = {
+    "postal_code": (normalize_postal_code, canonical_postal_code),
+}
+
+
+@lru_cache(maxsize=65536)
+def _phone_e164(value, region):
+    """E.164 form of ``value`` parsed in ``region``, None when invalid."""
+    try:
+        number = PhoneNumber.from_string(value, region=region)
+    except phonenumbers.NumberParseException:
+        return None
+    return number.as_e164 if number.is_valid() else None
+
+
+def normalize_phone_number(value, region=None):
+    """
+    Parse ``value`` and return its E.164 representation.
+
+    Returns None for empty input and raises ValidationError when the value
+    cannot be parsed into a valid number. Parse results are memoized, so
+    numbers repeated across an import are only parsed once.
+    """
+    if not value:
+        return None
+    number = _phone_e164(str(value), region)
+    if number is None:
+        raise ValidationError(_("Enter a valid phone number."))
+    return number
+
+
+def normalize_phone_numbers(values, region=None):
+    """
+    Batch version of ``normalize_phone_number``. Returns a list with, for each
+    value, its E.164 string, None when empty, or the ValidationError it would
+    raise; one error instance is shared by all invalid values.
+    """
+    error = None
+    results = []
+    for value in values:
+        if not value:
+            results.append(None)
+            continue
+        number = _phone_e164(str(value), region)
+        if number is None:
+            error = error or ValidationError(_("Enter a valid phone number."))
+            results.append(error)
+        else:
+            results.append(number)
+    return results
+
+
+def phone_number_e164(value, region=None):
+    """
+    Canonical E.164 string of a ``PhoneNumberField`` value, or "" when it is
+    empty or not a valid number.
+    """
+    if not value:
+        return ""
+    if isinstance(value, PhoneNumber):
+        # Already parsed: only its validity is left to check, memoized on
+        # the E.164 text. Unparseable input only has its raw text.
+        value = value.as_e164 if value.national_number else value.raw_input
+    return _phone_e164(str(value), region) or ""
+
+
+def canonicalize_text(value):
+    """
+    Canonical form of a free-text address component: Unicode-normalized,
+    case-folded, punctuation replaced by spaces and whitespace collapsed, so
+    "10, Main St." and "10 main st" compare equal.
+    """
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKC", str(value)).casefold()
+    return " ".join(_PUNCTUATION.sub(" ", value).split())
+
+
+def address_fingerprint(
+    first_name, last_name, line1, line2, city, state, postal_code, country
+):
+    """SHA-256 hex digest of the canonicalized person and address fields."""
+    parts = (
+        canonicalize_text(first_name),
+        canonicalize_text(last_name),
+        canonicalize_text(line1),
+        canonicalize_text(line2),
+        canonicalize_text(city),
+        canonicalize_text(state),
+        normalize_postal_code(postal_code),
+        str(country or "").upper(),
+    )
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
@@ -0,0 +1,12 @@
+from rest_framework.permissions import BasePermission
+
+
+class CanViewAddresses(BasePermission):
+    """
+    Requires the ``address.view_address`` model permission, for endpoints
+    reading address data without a queryset ``DjangoModelPermissions`` could
+    check against.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.has_perm("address.view_address")
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from limbo.apps.address.admin import AddressAdmin
+from limbo.apps.address.models import Address
+from limbo.core.admin import EstimatedCountPaginator, estimate_count
+from limbo.factory.address import SpringfieldAddressFactory
+from limbo.factory.user import UserFactory
+
+
+class TestAddressAdminSearch(TestCase):
+    def setUp(self):
+        self.model_admin = AddressAdmin(Address, admin.site)
+        self.request = RequestFactory().get("/")
+        self.springfield = SpringfieldAddressFactory()
+        self.shelbyville = SpringfieldAddressFactory(
+            line1="742 Evergreen Terrace", city="Shelbyville", postal_code="62565"
+        )
+
+    def search(self, term):
+        queryset, may_have_duplicates = self.model_admin.get_search_results(
+            self.request, Address.objects.all(), term
+        )
+        self.assertFalse(may_have_duplicates)
+        return set(queryset)
+
+    def test_search_vector_maintained_by_trigger(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("search_vector is only maintained on PostgreSQL")
+        self.springfield.refresh_from_db()
+        self.assertIn("springfield", self.springfield.search_vector)
+
+        Address.objects.filter(pk=self.springfield.pk).update(city="Capital City")
+        self.springfield.refresh_from_db()
+        self.assertIn("capital", self.springfield.search_vector)
+        self.assertNotIn("springfield", self.springfield.search_vector)
+
+    def test_search_matches_prefixes_of_every_term(self):
+        self.assertEqual(self.search("spring"), {self.springfield})
+        self.assertEqual(self.search("evergreen shelby"), {self.shelbyville})
+        self.assertEqual(self.search("6256"), {self.shelbyville})
+        self.assertEqual(self.search("evergreen springfield"), set())
+
+    def test_search_input_is_not_parsed_as_tsquery(self):
+        self.assertEqual(self.search("main | x"), set())
+        self.assertEqual(self.search("o'brien"), set())
+        self.assertEqual(self.search("!&:*"), set())
+
+    def test_empty_search_returns_everything(self):
+        self.assertEqual(self.search(""), {self.springfield, self.shelbyville})
+
+    def test_changelist_search_is_ranked(self):
+        user = UserFactory(is_staff=True, is_superuser=True)
+        self.client.force_login(user)
+        SpringfieldAddressFactory(line1="1 Springfield Road", city="Springfield")
+        response = self.client.get(
+            reverse("admin:address_address_changelist"),
+            {"q": "springfield"},
+        )
+        self.assertEqual(response.status_code, 200)
+        results = list(response.context["cl"].result_list)
+        self.assertEqual(len(results), 2)
+        if connection.vendor == "postgresql":
+            self.assertEqual(results[0].line1, "1 Springfield Road")
+
+
+class TestAddressAdminChangelist(TestCase):
+    def setUp(self):
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        for n in range(15):
+            SpringfieldAddressFactory(line2=f"Apt {n}")
+
+    def changelist(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("admin:address_address_changelist"), params
+            )
+        self.assertEqual(response.status_code, 200)
+        sql = [query["sql"] for query in queries if "address_address" in query["sql"]]
+        return response.context["cl"], sql
+
+    def test_small_tables_are_counted_exactly(self):
+        cl, sql = self.changelist()
+        self.assertEqual(cl.result_count, 15)
+        self.assertIsNone(cl.full_result_count)
+        self.assertEqual(len([q for q in sql if "COUNT(" in q]), 1)
+
+    def test_large_tables_use_the_estimate(self):
+        with mock.patch("limbo.core.admin.estimate_count", return_value=20_000_000):
+            cl, sql = self.changelist()
+        self.assertTrue(cl.paginator.estimated)
+        self.assertEqual(cl.result_count, 20_000_000)
+        self.assertFalse([q for q in sql if "COUNT(" in q])
+        self.assertEqual(len(cl.result_list), 10)
+
+    def test_rows_fetch_only_displayed_columns(self):
+        cl, sql = self.changelist()
+        (select,) = [q for q in sql if q.endswith("LIMIT 10")]
+        self.assertIn('"address_address"."country"', select)
+        self.assertIn('"address_address"."created_at"', select)
+        self.assertNotIn("search_vector", select)
+        self.assertNotIn("phone_number", select)
+
+
+class TestEstimatedCountPaginator(TestCase):
+    def setUp(self):
+        Address.objects.bulk_create(
+            Address(line1=f"{n} Main St", city="Springfield", country="US")
+            for n in range(3)
+        )
+
+    def test_estimate_count_explains(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsInstance(estimate_count(Address.objects.all()), int)
+        self.assertTrue(queries[0]["sql"].startswith("EXPLAIN"))
+
+    def test_exact_count_below_threshold(self):
+        addresses = Address.objects.order_by("pk")
+        paginator = EstimatedCountPaginator(addresses, 10, threshold=0)
+        with mock.patch("limbo.core.admin.estimate_count", return_value=5):
+            self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.estimated)
+
+        paginator = EstimatedCountPaginator(addresses, 10, threshold=50)
+        with mock.patch("limbo.core.admin.estimate_count", return_value=60):
+            self.assertEqual(paginator.count, 60)
+        self.assertTrue(paginator.estimated)
@@ -0,0 +1,66 @@
+from django.test import TestCase
+
+from limbo.apps.address.models import Address
+from limbo.apps.users.models import User
+from limbo.core.managers import UserSummary, user_summaries
+
+
+class TestAuditUsers(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            User(username=f"user{n}", first_name="Jane", last_name=f"Doe{n}")
+            for n in range(10)
+        )
+        Address.objects.bulk_create(
+            Address(
+                first_name="Jane",
+                last_name="Doe",
+                line1=f"{n} Main St",
+                city="Springfield",
+                postal_code="62701",
+                country="US",
+                created_by=users[n % 10],
+                updated_by=users[(n + 1) % 10],
+            )
+            for n in range(100)
+        )
+
+    def setUp(self):
+        user_summaries.clear()
+        self.addCleanup(user_summaries.clear)
+
+    def test_with_audit_users_is_one_query(self):
+        with self.assertNumQueries(1):
+            names = [
+                (address.created_by.username, address.updated_by.get_full_name())
+                for address in Address.objects.with_audit_users()
+            ]
+        self.assertEqual(len(names), 100)
+        self.assertIn(("user0", "Jane Doe1"), names)
+
+        address = Address.objects.with_audit_users().first()
+        self.assertIn("password", address.created_by.get_deferred_fields())
+        self.assertNotIn("line1", address.get_deferred_fields())
+
+    def test_with_audit_summaries_uses_the_shared_cache(self):
+        with self.assertNumQueries(2):
+            addresses = list(Address.objects.with_audit_summaries())
+        self.assertEqual(len(addresses), 100)
+        user = User.objects.get(username="user0")
+        address = next(a for a in addresses if a.created_by_id == user.pk)
+        self.assertEqual(
+            address.created_by_summary, UserSummary(user.pk, "user0", "Jane Doe0")
+        )
+
+        # Every user is cached now: later listings cost the row query only.
+        with self.assertNumQueries(1):
+            addresses = list(
+                Address.objects.with_audit_summaries().filter(city="Springfield")
+            )
+        self.assertTrue(all(a.updated_by_summary for a in addresses))
+
+    def test_summaries_skip_values_querysets(self):
+        with self.assertNumQueries(1):
+            rows = list(Address.objects.with_audit_summaries().values("pk"))
+        self.assertEqual(len(rows), 100)
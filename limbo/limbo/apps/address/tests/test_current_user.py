@@ -0,0 +1,143 @@
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory, TestCase, override_settings
+
+from limbo.apps.address.models import Address
+from limbo.apps.audit import recorder
+from limbo.apps.audit.models import AuditLog
+from limbo.apps.users.models import User
+from limbo.core.context import CurrentUserMiddleware, acting_as, get_current_user_id
+from limbo.factory.address import SpringfieldAddressFactory
+
+
+class TestStamping(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.jane = User.objects.create(username="jane")
+        cls.john = User.objects.create(username="john")
+
+    def test_save_stamps_creator_and_updater(self):
+        address = SpringfieldAddressFactory.build()
+        with acting_as(self.jane):
+            address.save()
+        self.assertEqual(address.created_by_id, self.jane.pk)
+        self.assertEqual(address.updated_by_id, self.jane.pk)
+
+        address = Address.objects.get()
+        address.city = "Chicago"
+        with acting_as(self.john.pk):
+            address.save(update_fields=["city"])
+        address = Address.objects.get()
+        self.assertEqual(address.created_by_id, self.jane.pk)
+        self.assertEqual(address.updated_by_id, self.john.pk)
+
+        # Without an acting user the columns are left alone.
+        address.save()
+        self.assertEqual(Address.objects.get().updated_by_id, self.john.pk)
+
+    def test_bulk_writes_stamp_without_loading_users(self):
+        with acting_as(self.jane.pk):
+            with self.assertNumQueries(1):
+                addresses = Address.objects.bulk_create(
+                    [
+                        SpringfieldAddressFactory.build(line2=f"Apt {n}")
+                        for n in range(3)
+                    ]
+                )
+        stamped = Address.objects.filter(created_by=self.jane, updated_by=self.jane)
+        self.assertEqual(stamped.count(), 3)
+
+        with acting_as(self.john.pk):
+            Address.objects.bulk_update(addresses[:1], ["city"])
+            with self.assertNumQueries(1):
+                Address.objects.filter(line2="Apt 1").update(title="Dr")
+        self.assertEqual(
+            set(
+                Address.objects.filter(updated_by=self.john).values_list(
+                    "line2", flat=True
+                )
+            ),
+            {"Apt 0", "Apt 1"},
+        )
+        self.assertFalse(Address.objects.exclude(created_by=self.jane).exists())
+
+    def test_explicit_updater_wins_in_update(self):
+        Address.objects.bulk_create([SpringfieldAddressFactory.build()])
+        with acting_as(self.jane.pk):
+            Address.objects.update(updated_by=self.john)
+        self.assertEqual(Address.objects.get().updated_by_id, self.john.pk)
+
+    def test_explicit_updater_wins_in_save(self):
+        address = SpringfieldAddressFactory.build(updated_by=self.john)
+        with acting_as(self.jane.pk):
+            address.save()
+            self.assertEqual(address.created_by_id, self.jane.pk)
+            self.assertEqual(address.updated_by_id, self.john.pk)
+
+            address = Address.objects.get()
+            address.city = "Chicago"
+            address.save()
+            self.assertEqual(address.updated_by_id, self.jane.pk)
+
+            address.updated_by = self.john
+            address.save(update_fields=["city", "updated_by"])
+        self.assertEqual(Address.objects.get().updated_by_id, self.john.pk)
+
+    def test_audit_actor_is_the_acting_user(self):
+        address = SpringfieldAddressFactory.build()
+        address.save()
+        with acting_as(self.john.pk), self.captureOnCommitCallbacks(execute=True):
+            address.delete()
+        recorder.flush_pending()
+        self.assertEqual(AuditLog.objects.get(action=AuditLog.DELETE).actor, self.john)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class TestCurrentUserMiddleware(TestCase):
+    def request(self, user=None, session_hash=None):
+        request = RequestFactory().get("/")
+        request.session = SessionStore()
+        if user is not None:
+            request.session[SESSION_KEY] = str(user.pk)
+            request.session[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+            request.session[HASH_SESSION_KEY] = (
+                session_hash or user.get_session_auth_hash()
+            )
+        return request
+
+    def middleware(self, view):
+        return AuthenticationMiddleware(CurrentUserMiddleware(view))
+
+    def test_sets_the_user_id_from_the_authenticated_user(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+        middleware = self.middleware(lambda request: get_current_user_id())
+        self.assertEqual(middleware(self.request(user)), user.pk)
+        self.assertIsNone(middleware(self.request()))
+        self.assertIsNone(get_current_user_id())
+
+    def test_user_is_loaded_on_first_read_only(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+        middleware = self.middleware(lambda request: "response")
+        with self.assertNumQueries(0):
+            self.assertEqual(middleware(self.request(user)), "response")
+
+    def test_unverified_sessions_have_no_user(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+        middleware = self.middleware(lambda request: get_current_user_id())
+        self.assertIsNone(middleware(self.request(user, session_hash="forged")))
+        request = self.request(user)
+        user.delete()
+        self.assertIsNone(middleware(request))
+
+    def test_async(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+
+        async def view(request):
+            return await sync_to_async(get_current_user_id)()
+
+        middleware = self.middleware(view)
+        request = self.request(user)
+        self.assertEqual(async_to_sync(middleware)(request), user.pk)
@@ -0,0 +1,145 @@
+import io
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from limbo.apps.address.importer import copy_addresses
+from limbo.apps.address.models import Address, AddressFacet
+from limbo.factory.address import SpringfieldAddressFactory
+from limbo.factory.user import UserFactory
+
+
+def facets():
+    return {
+        (facet.country, facet.state): facet.count
+        for facet in AddressFacet.objects.nonzero()
+    }
+
+
+class TestFacetTriggers(TestCase):
+    def test_every_write_path_updates_the_counts(self):
+        SpringfieldAddressFactory()
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(line2="Apt 1"),
+                SpringfieldAddressFactory.build(line2="Apt 2", state="CA"),
+                SpringfieldAddressFactory.build(
+                    line1="1 Rue de Rivoli", country="FR", state=""
+                ),
+            ]
+        )
+        self.assertEqual(facets(), {("US", "IL"): 2, ("US", "CA"): 1, ("FR", ""): 1})
+
+        address = Address.objects.get(line2="Apt 1")
+        address.state = "CA"
+        address.save()
+        Address.objects.filter(country="FR").update(state="Paris")
+        self.assertEqual(
+            facets(), {("US", "IL"): 1, ("US", "CA"): 2, ("FR", "Paris"): 1}
+        )
+
+        Address.objects.filter(state="CA").delete()
+        Address.objects.get(country="FR").delete()
+        copy_addresses(
+            [SpringfieldAddressFactory.build(line1="2 Main St", state="NY")]
+        )
+        self.assertEqual(facets(), {("US", "IL"): 1, ("US", "NY"): 1})
+
+    def test_upserts_count_inserted_rows_only(self):
+        Address.objects.upsert_many([SpringfieldAddressFactory.build()])
+        Address.objects.upsert_many(
+            [
+                SpringfieldAddressFactory.build(),
+                SpringfieldAddressFactory.build(line2="Apt 1"),
+            ]
+        )
+        self.assertEqual(facets(), {("US", "IL"): 2})
+
+    def test_unrelated_updates_leave_facets_alone(self):
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(),
+                SpringfieldAddressFactory.build(line2="Apt 1"),
+            ]
+        )
+        Address.objects.update(city="Chicago")
+        self.assertEqual(facets(), {("US", "IL"): 2})
+
+    def test_rebuild_command(self):
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(),
+                SpringfieldAddressFactory.build(line2="Apt 1"),
+            ]
+        )
+        AddressFacet.objects.update(count=42)
+        AddressFacet.objects.create(country="DE", state="Berlin", count=3)
+        out = io.StringIO()
+        call_command("rebuild_address_facets", stdout=out)
+        self.assertIn("Rebuilt 1 address facets.", out.getvalue())
+        self.assertEqual(facets(), {("US", "IL"): 2})
+
+
+class TestFacetReaders(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Address.objects.bulk_create(
+            [SpringfieldAddressFactory.build(line2=f"Apt {n}") for n in range(3)]
+            + [SpringfieldAddressFactory.build(line2="Apt 9", state="CA")]
+            + [
+                SpringfieldAddressFactory.build(
+                    line1="1 Rue de Rivoli", country="FR", state="Paris"
+                )
+            ]
+        )
+
+    def test_admin_filters_read_the_facets(self):
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse("admin:address_address_changelist"), {"country": "US"}
+            )
+        self.assertContains(response, "United States of America (4)")
+        self.assertContains(response, "IL (3)")
+        self.assertNotContains(response, "Paris (1)")
+        self.assertFalse(
+            [q for q in queries if 'DISTINCT "address_address"' in q["sql"]]
+        )
+        self.assertEqual(len(response.context["cl"].result_list), 4)
+
+    def test_admin_filters_apply_without_facets(self):
+        AddressFacet.objects.all().delete()
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        response = self.client.get(
+            reverse("admin:address_address_changelist"), {"country": "FR"}
+        )
+        self.assertEqual(len(response.context["cl"].result_list), 1)
+        response = self.client.get(
+            reverse("admin:address_address_changelist"), {"state": "CA"}
+        )
+        self.assertEqual(len(response.context["cl"].result_list), 1)
+
+    def test_facet_endpoint(self):
+        url = reverse("address:facets")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(UserFactory())
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(UserFactory(is_superuser=True))
+        response = self.client.get(url, {"country": "us"})
+        self.assertEqual(
+            response.json(),
+            {
+                "countries": [
+                    {"country": "FR", "count": 1},
+                    {"country": "US", "count": 4},
+                ],
+                "states": [{"state": "IL", "count": 3}, {"state": "CA", "count": 1}],
+            },
+        )
+        self.assertEqual(
+            self.client.get(url).json()["states"][0], {"state": "IL", "count": 3}
+        )
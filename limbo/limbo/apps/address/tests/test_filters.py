@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from limbo.apps import utils
+from limbo.apps.address.models import Address
+from limbo.apps.users.models import User
+from limbo.apps.utils import BaseFilter
+
+
+class AddressFilter(BaseFilter):
+    class Meta:
+        model = Address
+        fields = ["city"]
+
+
+class TestFilterBy(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.jane = User.objects.create(username="Jane")
+        cls.janet = User.objects.create(username="janet")
+        cls.john = User.objects.create(username="john")
+        cls.by_jane, cls.by_janet, cls.by_john = Address.objects.bulk_create(
+            Address(
+                first_name="Jane",
+                last_name="Doe",
+                line1=f"{n} Main St",
+                city="Springfield",
+                postal_code="62701",
+                country="US",
+                created_by=creator,
+                updated_by=cls.john,
+            )
+            for n, creator in enumerate([cls.jane, cls.janet, cls.john])
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def filtered(self, **data):
+        return set(AddressFilter(data, queryset=Address.objects.all()).qs)
+
+    def test_username_prefix_on_the_named_column(self):
+        self.assertEqual(
+            self.filtered(created_by="JAN"), {self.by_jane, self.by_janet}
+        )
+        self.assertEqual(self.filtered(created_by="john"), {self.by_john})
+        self.assertEqual(len(self.filtered(updated_by="john")), 3)
+        self.assertEqual(self.filtered(updated_by="jan"), set())
+        self.assertEqual(self.filtered(created_by="ane"), set())
+
+    def test_numeric_value_matches_the_id(self):
+        self.assertEqual(self.filtered(created_by=str(self.janet.pk)), {self.by_janet})
+
+    def test_filters_the_foreign_key_column_without_a_join(self):
+        queryset = AddressFilter(
+            {"created_by": "jan"}, queryset=Address.objects.all()
+        ).qs
+        sql = str(queryset.query)
+        self.assertIn('"address_address"."created_by_id" IN (', sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_resolved_ids_are_cached(self):
+        self.filtered(created_by="jan")
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                self.filtered(created_by="Jan "), {self.by_jane, self.by_janet}
+            )
+
+    def test_many_matches_use_a_subquery(self):
+        with mock.patch.object(utils, "USER_LOOKUP_LIMIT", 1):
+            with self.assertNumQueries(2):
+                result = self.filtered(created_by="j")
+        self.assertEqual(result, {self.by_jane, self.by_janet, self.by_john})
@@ -0,0 +1,185 @@
+import importlib
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.forms import modelform_factory
+from django.test import TestCase
+
+from limbo.apps.address.forms import AddressAdminForm
+from limbo.apps.address.models import Address
+from limbo.apps.address.normalizers import address_fingerprint, canonicalize_text
+from limbo.factory.address import AddressFactory, SpringfieldAddressFactory
+
+AddressForm = modelform_factory(
+    Address, form=AddressAdminForm, exclude=["created_by", "updated_by"]
+)
+ADDRESS = ("10 Main St.", "", "Springfield", "IL", "62701", "US")
+
+
+class TestAddressFingerprint(TestCase):
+    def test_canonicalize_text(self):
+        self.assertEqual(canonicalize_text("  10, Main   St. "), "10 main st")
+        self.assertEqual(canonicalize_text("ＭＡＩＮ"), "main")
+        self.assertEqual(canonicalize_text(None), "")
+
+    def test_fingerprint_ignores_formatting(self):
+        self.assertEqual(
+            address_fingerprint("Jane", "Doe", *ADDRESS),
+            address_fingerprint(
+                "JANE", "doe", "10 main st", "", "SPRINGFIELD", "il", " 62701", "us"
+            ),
+        )
+        self.assertNotEqual(
+            address_fingerprint("Jane", "Doe", *ADDRESS),
+            address_fingerprint("Jane", "Doe", "11 Main St", *ADDRESS[1:]),
+        )
+
+    def test_fingerprint_includes_the_person(self):
+        self.assertNotEqual(
+            address_fingerprint("Jane", "Doe", *ADDRESS),
+            address_fingerprint("John", "Doe", *ADDRESS),
+        )
+
+    def test_fingerprint_set_on_save(self):
+        address = AddressFactory()
+        self.assertEqual(len(address.fingerprint), 64)
+        self.assertEqual(address.fingerprint, address.compute_fingerprint())
+
+    def test_fingerprint_follows_update_fields(self):
+        address = AddressFactory()
+        address.line1 = "1 Other Road"
+        address.save(update_fields=["line1"])
+        address.refresh_from_db()
+        self.assertEqual(address.fingerprint, address.compute_fingerprint())
+
+    def test_fingerprint_is_unique(self):
+        SpringfieldAddressFactory()
+        duplicate = SpringfieldAddressFactory.build(
+            line1="10 MAIN ST", first_name="jane"
+        )
+        with self.assertRaises(ValidationError) as raised:
+            duplicate.full_clean()
+        self.assertEqual(raised.exception.error_dict["__all__"][0].code, "unique")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            duplicate.save()
+        # Someone else at the same address.
+        SpringfieldAddressFactory(first_name="John")
+
+    def test_edits_are_checked_against_duplicates(self):
+        SpringfieldAddressFactory()
+        john = SpringfieldAddressFactory(first_name="John")
+        john.phone_number = "+12025550143"
+        john.save()
+        john.first_name = "Jane"
+        with self.assertRaises(ValidationError):
+            john.full_clean()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            john.save()
+
+    def test_form_reports_duplicates(self):
+        SpringfieldAddressFactory()
+        data = {
+            "first_name": "Jane",
+            "last_name": "Doe",
+            "line1": "10 main st",
+            "city": "Springfield",
+            "state": "IL",
+            "postal_code": "62701",
+            "country": "US",
+        }
+        form = AddressForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.non_field_errors(), ["An address for this person already exists."]
+        )
+        form = AddressForm({**data, "first_name": "John"})
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_bulk_create_sets_fingerprint(self):
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(),
+                SpringfieldAddressFactory.build(line1="11 Main St"),
+            ]
+        )
+        self.assertFalse(Address.objects.filter(fingerprint__isnull=True).exists())
+
+    def test_bulk_update_refreshes_fingerprint(self):
+        address = SpringfieldAddressFactory.build()
+        address.save()
+        address.city = "Shelbyville"
+        Address.objects.bulk_update([address], ["city"])
+        address.refresh_from_db()
+        self.assertEqual(address.fingerprint, address.compute_fingerprint())
+
+    def test_queryset_update_refreshes_fingerprint(self):
+        address = SpringfieldAddressFactory.build()
+        address.save()
+        Address.objects.filter(pk=address.pk).update(city="Shelbyville")
+        address.refresh_from_db()
+        self.assertEqual(address.city, "Shelbyville")
+        self.assertEqual(address.fingerprint, address.compute_fingerprint())
+
+    def test_duplicates_of(self):
+        address = SpringfieldAddressFactory.build()
+        address.save()
+        self.assertFalse(Address.objects.duplicates_of(address).exists())
+        duplicate = SpringfieldAddressFactory.build(line1="10 main st")
+        self.assertEqual(list(Address.objects.duplicates_of(duplicate)), [address])
+
+    def test_backfill_keeps_duplicate_rows(self):
+        migration = importlib.import_module(
+            "limbo.apps.address.migrations.0004_address_fingerprint"
+        )
+        # The backfill runs before the fingerprint is made unique.
+        field = Address._meta.get_field("fingerprint")
+        loose = field.clone()
+        loose.set_attributes_from_name(field.name)
+        loose._unique = False
+        with connection.schema_editor() as editor:
+            editor.alter_field(Address, field, loose)
+        kept = SpringfieldAddressFactory()
+        duplicate = SpringfieldAddressFactory(line1="10 MAIN ST")
+        other = SpringfieldAddressFactory(first_name="John")
+        Address.objects.update(fingerprint=None)
+        migration.backfill_fingerprints(apps, SimpleNamespace(connection=connection))
+        self.assertEqual(Address.objects.count(), 3)
+        for address in (kept, duplicate, other):
+            address.refresh_from_db()
+        self.assertEqual(kept.fingerprint, kept.compute_fingerprint())
+        self.assertEqual(other.fingerprint, other.compute_fingerprint())
+        self.assertIsNone(duplicate.fingerprint)
+
+
+class TestUpsertMany(TestCase):
+    def test_upsert_inserts_then_updates(self):
+        Address.objects.upsert_many([SpringfieldAddressFactory.build()])
+        Address.objects.upsert_many(
+            [
+                SpringfieldAddressFactory.build(
+                    line1="10 MAIN ST", phone_number="+12025550143"
+                ),
+                SpringfieldAddressFactory.build(first_name="John"),
+            ]
+        )
+        self.assertEqual(Address.objects.count(), 2)
+        address = Address.objects.get(first_name="Jane")
+        self.assertEqual(address.line1, "10 Main St.")
+        self.assertEqual(address.phone_e164, "+12025550143")
+
+    def test_upsert_collapses_duplicates_in_batch(self):
+        Address.objects.upsert_many(
+            [
+                SpringfieldAddressFactory.build(title="Ms"),
+                SpringfieldAddressFactory.build(title="Dr"),
+            ]
+        )
+        self.assertEqual(Address.objects.get().title, "Dr")
+
+    def test_upsert_keeps_created_at(self):
+        Address.objects.upsert_many([SpringfieldAddressFactory.build()])
+        created_at = Address.objects.get().created_at
+        Address.objects.upsert_many([SpringfieldAddressFactory.build(title="Dr")])
+        self.assertEqual(Address.objects.get().created_at, created_at)
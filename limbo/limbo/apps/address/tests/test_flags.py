@@ -0,0 +1,58 @@
+from django.contrib import admin
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from limbo.apps.address.admin import AddressAdmin
+from limbo.apps.address.flags import FLAG_SPRITE_CSS, _flag_html, flag_html
+from limbo.apps.address.forms import AddressAdminForm
+from limbo.apps.address.models import Address
+from limbo.factory.address import AddressFactory
+from limbo.factory.user import UserFactory
+
+
+class TestFlagHtml(SimpleTestCase):
+    def test_renders_sprite_classes(self):
+        self.assertEqual(
+            flag_html("th"),
+            '<i class="flag-sprite flag-t flag-_h" title="Thailand" aria-label="TH"></i>',
+        )
+
+    def test_empty_code(self):
+        self.assertEqual(flag_html(""), "")
+        self.assertEqual(flag_html(None), "")
+
+    def test_memoized_per_code(self):
+        _flag_html.cache_clear()
+        flag_html("US")
+        flag_html("us")
+        flag_html("US")
+        info = _flag_html.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 1))
+
+
+class TestAddressAdminFlags(TestCase):
+    def test_country_flag_column(self):
+        model_admin = AddressAdmin(Address, admin.site)
+        address = AddressFactory.build(country="NZ")
+        self.assertIn("flag-n flag-_z", model_admin.country_flag(address))
+        address.country = ""
+        self.assertEqual(model_admin.country_flag(address), "")
+
+    def test_changelist_uses_local_sprite(self):
+        AddressFactory.create_batch(3)
+        self.client.force_login(UserFactory(is_staff=True, is_superuser=True))
+        response = self.client.get(reverse("admin:address_address_changelist"))
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn(FLAG_SPRITE_CSS, html)
+        self.assertNotRegex(html, r"<img[^>]*flag")
+        self.assertEqual(html.count('class="flag-sprite'), 3)
+
+    def test_form_widget_uses_sprite(self):
+        form = AddressAdminForm(initial={"country": "FR"})
+        html = str(form["country"])
+        self.assertIn('class="flag-sprite flag-f flag-_r"', html)
+        self.assertIn('id="flag_id_country"', html)
+        self.assertIn("e.className", html)
+        self.assertNotIn("<img", html)
+        self.assertIn(FLAG_SPRITE_CSS, str(form.media))
@@ -0,0 +1,143 @@
+import math
+import random
+from unittest import TestCase as SimpleTestCase
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from limbo.apps.address import geo
+from limbo.apps.address.models import Address
+from limbo.factory.address import SpringfieldAddressFactory
+
+
+class TestGeohash(SimpleTestCase):
+    def test_encode_known_value(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(len(geo.encode(0, 0)), geo.GEOHASH_PRECISION)
+
+    def test_encode_many_matches_encode(self):
+        rng = random.Random(1)
+        points = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(500)]
+        latitudes, longitudes = zip(*points)
+        self.assertEqual(
+            list(geo.encode_many(latitudes, longitudes, 9)),
+            [geo.encode(lat, lon, 9) for lat, lon in points],
+        )
+
+    def test_decode_returns_cell_centre(self):
+        latitude, longitude, height, width = geo.decode("u4pruydqqvj")
+        self.assertAlmostEqual(latitude, 57.64911, places=4)
+        self.assertAlmostEqual(longitude, 10.40744, places=4)
+        self.assertLess(height, 1e-5)
+        self.assertLess(width, 1e-5)
+
+    def test_covering_cells_contain_the_circle(self):
+        rng = random.Random(2)
+        for _ in range(50):
+            latitude, longitude = rng.uniform(-60, 60), rng.uniform(-180, 180)
+            radius = rng.choice([0.5, 5, 50])
+            cells = geo.covering_cells(latitude, longitude, radius)
+            self.assertEqual(len(cells), 9)
+            # Points on the circle, in every direction, fall in a covering cell.
+            for bearing in range(0, 360, 15):
+                dlat = radius / geo.KM_PER_DEGREE * 0.999
+                point_lat = latitude + dlat * math.cos(math.radians(bearing))
+                point_lon = longitude + dlat * math.sin(
+                    math.radians(bearing)
+                ) / math.cos(math.radians(point_lat))
+                point_lon = (point_lon + 180) % 360 - 180
+                self.assertIn(geo.encode(point_lat, point_lon)[: len(cells[0])], cells)
+
+    def test_covering_cells_gives_up_near_poles_and_for_huge_radii(self):
+        self.assertIsNone(geo.covering_cells(89.9, 0, 50))
+        self.assertIsNone(geo.covering_cells(0, 0, 10000))
+
+    def test_haversine(self):
+        # Big Ben to the Statue of Liberty.
+        distance = geo.haversine_km(51.5007, -0.1246, [40.6892], [-74.0445])[0]
+        self.assertAlmostEqual(distance, 5575, delta=5)
+        self.assertEqual(geo.haversine_km(10, 10, [10], [10])[0], 0)
+
+
+class TestAddressNearby(TestCase):
+    def test_geohash_follows_coordinates(self):
+        address = SpringfieldAddressFactory.build(latitude=52.52, longitude=13.405)
+        address.save()
+        self.assertEqual(address.geohash, geo.encode(52.52, 13.405))
+
+        address.latitude = address.longitude = None
+        address.save(update_fields=["latitude", "longitude"])
+        address.refresh_from_db()
+        self.assertEqual(address.geohash, "")
+
+    def test_bulk_paths_refresh_geohash(self):
+        address, = Address.objects.bulk_create(
+            [SpringfieldAddressFactory.build(latitude=1.0, longitude=2.0)]
+        )
+        self.assertEqual(
+            Address.objects.get(pk=address.pk).geohash, geo.encode(1.0, 2.0)
+        )
+
+        address.latitude = 3.0
+        Address.objects.bulk_update([address], ["latitude"])
+        self.assertEqual(
+            Address.objects.get(pk=address.pk).geohash, geo.encode(3.0, 2.0)
+        )
+
+        Address.objects.filter(pk=address.pk).update(longitude=4.0)
+        self.assertEqual(
+            Address.objects.get(pk=address.pk).geohash, geo.encode(3.0, 4.0)
+        )
+
+    def test_nearby_matches_brute_force(self):
+        rng = random.Random(3)
+        center = (48.8566, 2.3522)
+        addresses = [
+            SpringfieldAddressFactory.build(
+                line1=f"{n} Elm St",
+                latitude=center[0] + rng.uniform(-0.3, 0.3),
+                longitude=center[1] + rng.uniform(-0.3, 0.3),
+            )
+            for n in range(300)
+        ]
+        addresses.append(SpringfieldAddressFactory.build())
+        Address.objects.bulk_create(addresses)
+
+        for radius in (1, 5, 20):
+            expected = {
+                address.pk
+                for address in addresses
+                if address.latitude is not None
+                and geo.haversine_km(*center, [address.latitude], [address.longitude])[0]
+                <= radius
+            }
+            found = set(
+                Address.objects.nearby(*center, radius).values_list("pk", flat=True)
+            )
+            self.assertEqual(found, expected)
+        self.assertTrue(expected)
+
+    def test_nearby_across_the_antimeridian(self):
+        east = SpringfieldAddressFactory.build(
+            first_name="East", latitude=0, longitude=179.99
+        )
+        west = SpringfieldAddressFactory.build(
+            first_name="West", latitude=0, longitude=-179.99
+        )
+        far = SpringfieldAddressFactory.build(
+            first_name="Far", latitude=0, longitude=170
+        )
+        Address.objects.bulk_create([east, west, far])
+        self.assertEqual(set(Address.objects.nearby(0, 180, 5)), {east, west})
+
+    def test_nearby_prunes_with_geohash_prefixes(self):
+        SpringfieldAddressFactory(latitude=48.85, longitude=2.35)
+        with CaptureQueriesContext(connection) as queries:
+            result = list(Address.objects.nearby(48.85, 2.35, 1))
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(queries), 2)
+        self.assertIn('"geohash"::text LIKE', queries[0]["sql"])
+
+    def test_nearby_without_matches(self):
+        self.assertEqual(list(Address.objects.nearby(0, 0, 10)), [])
@@ -0,0 +1,194 @@
+import io
+import os
+import tempfile
+import threading
+import time
+from unittest import TestCase as SimpleTestCase
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from limbo.apps.address.geocoding import (
+    BaseGeocoder,
+    CachedGeocoder,
+    FileGeocoder,
+    GeocoderError,
+    Location,
+    LRUCache,
+    RateLimiter,
+    address_query,
+    geocode_query,
+    get_geocoder,
+)
+from limbo.apps.address.models import Address, GeocodeCache
+from limbo.factory.address import SpringfieldAddressFactory
+
+LOCATIONS = """address,latitude,longitude
+"10 Main St, Springfield, IL, 62701, US",39.8,-89.6
+"1 Rue de Rivoli, Paris, 75001, FR",48.86,2.34
+"""
+
+
+class CountingGeocoder(BaseGeocoder):
+    name = "counting"
+
+    def __init__(self, locations=None, fail=()):
+        self.locations = locations or {}
+        self.fail = set(fail)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def geocode(self, query):
+        with self._lock:
+            self.calls.append(query)
+        if query in self.fail:
+            raise GeocoderError(query)
+        return self.locations.get(query)
+
+
+class TestGeocodeHelpers(SimpleTestCase):
+    def test_geocode_query_is_normalized(self):
+        self.assertEqual(
+            geocode_query("10 Main St.", "", " SPRINGFIELD", "IL", "627 01", "us"),
+            "10 main st, springfield, il, 62701, US",
+        )
+        self.assertEqual(
+            address_query(SpringfieldAddressFactory.build()),
+            geocode_query("10 main st", "", "springfield", "il", "62701", "US"),
+        )
+
+    def test_providers_must_implement_geocode(self):
+        with self.assertRaises(TypeError):
+            BaseGeocoder()
+
+    def test_file_geocoder(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as stream:
+            stream.write(LOCATIONS)
+        self.addCleanup(os.unlink, stream.name)
+        geocoder = FileGeocoder(stream.name)
+        query = address_query(SpringfieldAddressFactory.build())
+        self.assertEqual(geocoder.geocode(query), Location(39.8, -89.6))
+        self.assertIsNone(geocoder.geocode("nowhere"))
+        self.assertIsNone(FileGeocoder().geocode("anything"))
+
+    @override_settings(
+        GEOCODER={
+            "BACKEND": "limbo.apps.address.geocoding.FileGeocoder",
+            "OPTIONS": {"delay": 0.5},
+        }
+    )
+    def test_get_geocoder_uses_setting(self):
+        geocoder = get_geocoder()
+        self.assertIsInstance(geocoder, FileGeocoder)
+        self.assertEqual(geocoder.delay, 0.5)
+
+    def test_lru_cache_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        started = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        # The first call uses the initial token, the next five wait 20ms each.
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+
+class TestCachedGeocoder(TestCase):
+    def setUp(self):
+        self.provider = CountingGeocoder(
+            {"a": Location(1.0, 2.0), "b": Location(3.0, 4.0)}, fail={"flaky"}
+        )
+        self.geocoder = CachedGeocoder(self.provider, workers=3)
+
+    def test_tiers_and_stats(self):
+        results = self.geocoder.geocode_many(["a", "b", "a", "unknown", "a"])
+        self.assertEqual(
+            results,
+            {"a": Location(1.0, 2.0), "b": Location(3.0, 4.0), "unknown": None},
+        )
+        self.assertEqual(sorted(self.provider.calls), ["a", "b", "unknown"])
+        self.assertEqual(GeocodeCache.objects.count(), 3)
+        self.assertIsNone(GeocodeCache.objects.get(query="unknown").latitude)
+
+        # Answered from memory.
+        self.geocoder.geocode_many(["a", "unknown"])
+        # A fresh process only has the database.
+        fresh = CachedGeocoder(self.provider)
+        self.assertEqual(fresh.geocode("b"), Location(3.0, 4.0))
+        self.assertEqual(len(self.provider.calls), 3)
+
+        stats = self.geocoder.stats
+        self.assertEqual(
+            (stats.memory_hits, stats.database_hits, stats.provider_calls), (4, 0, 3)
+        )
+        self.assertAlmostEqual(stats.hit_rate, 4 / 7)
+        self.assertEqual(fresh.stats.database_hits, 1)
+
+    def test_failures_are_not_cached(self):
+        self.assertEqual(self.geocoder.geocode_many(["flaky"]), {})
+        self.assertEqual(self.geocoder.stats.failures, 1)
+        self.assertFalse(GeocodeCache.objects.exists())
+        self.geocoder.geocode("flaky")
+        self.assertEqual(self.provider.calls, ["flaky", "flaky"])
+
+    def test_geocode_addresses_saves_coordinates(self):
+        query = address_query(SpringfieldAddressFactory.build())
+        self.provider.locations[query] = Location(39.8, -89.6)
+        known = SpringfieldAddressFactory.build()
+        unknown = SpringfieldAddressFactory.build(line1="99 Nowhere Rd")
+        Address.objects.bulk_create([known, unknown])
+
+        located = self.geocoder.geocode_addresses([known, unknown])
+
+        self.assertEqual(located, [known])
+        known.refresh_from_db()
+        self.assertEqual((known.latitude, known.longitude), (39.8, -89.6))
+        self.assertTrue(known.geohash)
+        unknown.refresh_from_db()
+        self.assertIsNone(unknown.latitude)
+
+
+class TestGeocodeAddressesCommand(TestCase):
+    def test_command_geocodes_and_reports(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as stream:
+            stream.write(LOCATIONS)
+        self.addCleanup(os.unlink, stream.name)
+        Address.objects.bulk_create(
+            [SpringfieldAddressFactory.build(line2=f"Apt {n}") for n in range(3)]
+            + [
+                SpringfieldAddressFactory.build(),
+                SpringfieldAddressFactory.build(line1="99 Nowhere Rd"),
+            ]
+        )
+        GeocodeCache.objects.create(
+            query=geocode_query("10 Main St", "Apt 0", "Springfield", "IL", "62701", "US"),
+            provider="file",
+            latitude=1.0,
+            longitude=1.0,
+        )
+
+        out = io.StringIO()
+        with override_settings(
+            GEOCODER={
+                "BACKEND": "limbo.apps.address.geocoding.FileGeocoder",
+                "OPTIONS": {"path": stream.name},
+            }
+        ):
+            call_command("geocode_addresses", "--batch-size", "2", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("Geocoded 2 of 5 addresses", output)
+        self.assertIn("1 database, 4 provider calls", output)
+        self.assertEqual(Address.objects.filter(latitude__isnull=False).count(), 2)
+
+    def test_rejects_bad_options(self):
+        with self.assertRaises(CommandError):
+            call_command("geocode_addresses", "--workers", "0")
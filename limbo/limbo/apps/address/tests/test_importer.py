@@ -0,0 +1,178 @@
+import csv
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from limbo.apps.address.importer import AddressImporter, copy_addresses
+from limbo.apps.address.models import Address
+
+HEADER = "first_name,last_name,line1,city,state,postal_code,country,phone_number\n"
+
+
+class TestAddressImporter(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.reject_path = os.path.join(self.tmpdir.name, "rejects.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_import(self, text, fmt="csv", **kwargs):
+        importer = AddressImporter(reject_path=self.reject_path, **kwargs)
+        return importer.run(io.StringIO(text), fmt)
+
+    def read_rejects(self):
+        with open(self.reject_path, newline="") as stream:
+            return list(csv.DictReader(stream))
+
+    def test_csv_rows_are_normalized_and_inserted(self):
+        result = self.run_import(
+            HEADER
+            + "Jane,Doe,1 Main St,Springfield,IL, 62701 ,us,(202) 555-0143\n"
+            + "John,Smith,10 Downing St,London,,sw1a 2aa,GB,\n"
+        )
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.rejected, 0)
+        self.assertFalse(os.path.exists(self.reject_path))
+
+        jane = Address.objects.get(first_name="Jane")
+        self.assertEqual(jane.postal_code, "62701")
+        self.assertEqual(jane.country.code, "US")
+        self.assertEqual(str(jane.phone_number), "+12025550143")
+        john = Address.objects.get(first_name="John")
+        self.assertEqual(john.postal_code, "SW1A2AA")
+        self.assertIsNone(john.phone_number)
+
+    def test_bad_rows_go_to_reject_file(self):
+        result = self.run_import(
+            HEADER
+            + "Jane,Doe,1 Main St,Springfield,IL,62701,US,\n"
+            + "Bad,Postcode,1 Main St,Springfield,IL,1234,US,\n"
+            + ",Missing,1 Main St,Springfield,IL,62701,US,\n"
+            + "Bad,Country,1 Main St,Nowhere,,62701,ZZ,\n"
+            + "Bad,Phone,1 Main St,Springfield,IL,62701,US,notaphone\n"
+        )
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.rejected, 4)
+        self.assertEqual(Address.objects.count(), 1)
+
+        rejects = self.read_rejects()
+        self.assertEqual([row["line"] for row in rejects], ["3", "4", "5", "6"])
+        self.assertEqual(
+            rejects[0]["error"], "postal_code: Invalid postal code format for country US."
+        )
+        self.assertEqual(rejects[1]["error"], "first_name: This field is required.")
+        self.assertTrue(rejects[2]["error"].startswith("country:"))
+        self.assertTrue(rejects[3]["error"].startswith("phone_number:"))
+        self.assertEqual(rejects[3]["phone_number"], "notaphone")
+
+    def test_ndjson_input(self):
+        lines = [
+            json.dumps(
+                {
+                    "first_name": "Jane",
+                    "last_name": "Doe",
+                    "line1": "1 Main St",
+                    "postal_code": "10115",
+                    "country": "DE",
+                }
+            ),
+            "",
+            "{not json",
+            json.dumps(["not", "an", "object"]),
+        ]
+        self.reject_path = os.path.join(self.tmpdir.name, "rejects.ndjson")
+        result = self.run_import("\n".join(lines), fmt="ndjson")
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.rejected, 2)
+        with open(self.reject_path) as stream:
+            rejects = [json.loads(line) for line in stream]
+        self.assertEqual([row["line"] for row in rejects], [3, 4])
+
+    def test_rows_are_inserted_in_batches(self):
+        rows = "".join(
+            f"First{n},Last{n},{n} Main St,Springfield,IL,62701,US,\n" for n in range(7)
+        )
+        result = self.run_import(HEADER + rows, batch_size=3)
+        self.assertEqual(result.imported, 7)
+        self.assertEqual(result.batches, 3)
+        self.assertEqual(Address.objects.count(), 7)
+
+    def test_copy_path(self):
+        result = self.run_import(
+            HEADER + "Jane,Doe,1 Main St,,,62701,US,+12025550143\n", use_copy=True
+        )
+        self.assertEqual(result.imported, 1)
+        address = Address.objects.get()
+        self.assertEqual(address.line2, "")
+        self.assertEqual(str(address.phone_number), "+12025550143")
+        self.assertIsNone(address.created_by_id)
+        self.assertIsNotNone(address.created_at)
+
+    def test_reimport_is_idempotent(self):
+        text = HEADER + "Jane,Doe,1 Main St,Springfield,IL,62701,US,\n"
+        self.run_import(text)
+        self.run_import(text)
+        self.run_import(text.replace(",\n", ",(202) 555-0143\n"), use_copy=True)
+        self.assertEqual(Address.objects.count(), 1)
+        self.assertEqual(str(Address.objects.get().phone_number), "+12025550143")
+
+    def test_people_sharing_an_address_are_kept_apart(self):
+        self.run_import(
+            HEADER
+            + "Jane,Doe,1 Main St,Springfield,IL,62701,US,\n"
+            + "John,Doe,1 Main St,Springfield,IL,62701,US,\n",
+            use_copy=True,
+        )
+        self.run_import(HEADER + "John,Doe,1 Main St,Springfield,IL,62701,US,\n")
+        self.assertEqual(
+            sorted(Address.objects.values_list("first_name", flat=True)),
+            ["Jane", "John"],
+        )
+
+    def test_duplicate_rows_in_batch_are_merged(self):
+        result = self.run_import(
+            HEADER
+            + "Jane,Doe,1 Main St,Springfield,IL,62701,US,\n"
+            + "jane,DOE,1 main st.,Springfield,IL,62701,US,(202) 555-0143\n",
+            use_copy=True,
+        )
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(str(Address.objects.get().phone_number), "+12025550143")
+
+    def test_copy_addresses_handles_null_and_blank(self):
+        copy_addresses(
+            [
+                Address(
+                    first_name="A",
+                    last_name="B",
+                    line1="1 Main St",
+                    country="US",
+                    phone_number=None,
+                )
+            ]
+        )
+        address = Address.objects.get()
+        self.assertEqual(address.city, "")
+        self.assertIsNone(address.phone_number)
+
+
+class TestImportAddressesCommand(TestCase):
+    def test_command_imports_file_and_reports(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "addresses.csv")
+            with open(path, "w") as stream:
+                stream.write(HEADER)
+                stream.write("Jane,Doe,1 Main St,Springfield,IL,62701,US,\n")
+                stream.write("Bad,Row,1 Main St,Springfield,IL,1,US,\n")
+
+            out = io.StringIO()
+            call_command("import_addresses", path, "--batch-size", "1", stdout=out)
+
+            self.assertIn("Imported 1 addresses, rejected 1.", out.getvalue())
+            self.assertTrue(os.path.exists(f"{path}.rejects.csv"))
+            self.assertEqual(Address.objects.count(), 1)
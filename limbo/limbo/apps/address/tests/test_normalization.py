@@ -0,0 +1,88 @@
+from django.db import connection, models
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import pre_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from limbo.apps.address.models import Address
+from limbo.apps.address.normalizers import normalize_postal_code
+from limbo.factory.address import AddressFactory, SpringfieldAddressFactory
+
+LONDON = {
+    "line1": "10 Downing St",
+    "city": "London",
+    "state": "",
+    "postal_code": "sw1a 2aa",
+    "country": "GB",
+}
+
+
+class TestAddressNormalization(TestCase):
+    def test_no_pre_save_receiver(self):
+        self.assertFalse(pre_save.has_listeners(Address))
+
+    def test_save_canonicalizes_postal_code(self):
+        address = SpringfieldAddressFactory.build(**LONDON)
+        address.save()
+        address.refresh_from_db()
+        self.assertEqual(address.postal_code, "SW1A2AA")
+
+    def test_factory_addresses_are_normalized(self):
+        address = AddressFactory(postal_code="ab1 2cd")
+        self.assertEqual(address.postal_code, "AB12CD")
+
+    def test_save_and_import_agree(self):
+        address = SpringfieldAddressFactory(**LONDON)
+        self.assertEqual(address.postal_code, normalize_postal_code(" sw1a 2aa "))
+
+    def test_bulk_create(self):
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(**LONDON),
+                SpringfieldAddressFactory.build(
+                    **{**LONDON, "line1": "11 Downing St", "postal_code": ""}
+                ),
+            ]
+        )
+        self.assertEqual(
+            sorted(Address.objects.values_list("postal_code", flat=True)),
+            ["", "SW1A2AA"],
+        )
+
+    def test_bulk_update(self):
+        address = SpringfieldAddressFactory.build(**LONDON)
+        address.save()
+        address.postal_code = "ec1a 1bb"
+        Address.objects.bulk_update([address], ["postal_code"])
+        self.assertEqual(Address.objects.get().postal_code, "EC1A1BB")
+
+    def test_update_with_value(self):
+        SpringfieldAddressFactory(**LONDON)
+        Address.objects.update(postal_code="w1a 0ax")
+        self.assertEqual(Address.objects.get().postal_code, "W1A0AX")
+
+    def test_update_with_expression_uses_sql_upper(self):
+        SpringfieldAddressFactory(**LONDON)
+        with CaptureQueriesContext(connection) as queries:
+            Address.objects.update(postal_code=Concat(F("city"), Value("-1")))
+        self.assertIn(
+            'SET "postal_code" = UPPER(',
+            next(q["sql"] for q in queries if q["sql"].startswith("UPDATE")),
+        )
+        address = Address.objects.get()
+        self.assertEqual(address.postal_code, "LONDON-1")
+        self.assertEqual(address.fingerprint, address.compute_fingerprint())
+
+    def test_queryset_normalize_repairs_rows(self):
+        SpringfieldAddressFactory(**LONDON)
+        SpringfieldAddressFactory(
+            **{**LONDON, "line1": "11 Downing St", "postal_code": "ok"}
+        )
+        # Bypass the normalizing queryset, as raw SQL would.
+        models.QuerySet.update(Address.objects.all(), postal_code=" sw1a 2aa")
+        self.assertEqual(Address.objects.normalize(), 2)
+        self.assertEqual(Address.objects.normalize(), 0)
+        self.assertEqual(
+            set(Address.objects.values_list("postal_code", flat=True)), {"SW1A2AA"}
+        )
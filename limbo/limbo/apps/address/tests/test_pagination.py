@@ -0,0 +1,117 @@
+import datetime
+
+from django.core import signing
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from limbo.apps.address.models import Address
+from limbo.apps.users.models import User
+from limbo.apps.utils import BaseFilter
+from limbo.core.pagination import CursorPaginator, InvalidCursor
+
+
+class AddressFilter(BaseFilter):
+    class Meta:
+        model = Address
+        fields = ["city"]
+
+
+def pages(paginator):
+    page = paginator.page()
+    yield page
+    while page.has_next:
+        page = paginator.page(page.next_cursor)
+        yield page
+
+
+class TestCursorPaginator(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(User(username=f"user{n}") for n in range(3))
+        start = timezone.now()
+        Address.objects.bulk_create(
+            Address(
+                first_name="Jane",
+                last_name="Doe",
+                line1=f"{n} Main St",
+                city="Springfield" if n % 2 else "Chicago",
+                postal_code="62701",
+                country="US",
+                created_by=users[n % 4] if n % 4 < 3 else None,
+            )
+            for n in range(23)
+        )
+        # Ties on created_at are broken by id.
+        for n, address in enumerate(Address.objects.order_by("pk")):
+            Address.objects.filter(pk=address.pk).update(
+                created_at=start + datetime.timedelta(minutes=n // 3)
+            )
+
+    def assertPagesCover(self, paginator, expected):
+        seen = [[a.pk for a in page] for page in pages(paginator)]
+        self.assertTrue(all(len(page) <= paginator.page_size for page in seen))
+        self.assertEqual([pk for page in seen for pk in page], expected)
+
+    def test_orderings(self):
+        addresses = Address.objects.all()
+        for ordering in ("created_at", "-created_at", "created_by", "-created_by"):
+            with self.subTest(ordering=ordering):
+                paginator = CursorPaginator(addresses, ordering, page_size=5)
+                expected = list(
+                    addresses.order_by(
+                        *paginator.order_by(ordering.startswith("-"))
+                    ).values_list("pk", flat=True)
+                )
+                self.assertPagesCover(paginator, expected)
+
+    def test_seeks_instead_of_offset(self):
+        paginator = CursorPaginator(Address.objects.all(), page_size=5)
+        page = paginator.page(paginator.page().next_cursor)
+        with CaptureQueriesContext(connection) as queries:
+            paginator.page(page.next_cursor)
+        (query,) = queries
+        self.assertIn(
+            'ROW("address_address"."created_at", "address_address"."id") <',
+            query["sql"],
+        )
+        self.assertNotIn("OFFSET", query["sql"])
+
+    def test_previous_pages(self):
+        paginator = CursorPaginator(Address.objects.all(), "created_by", page_size=5)
+        forward = list(pages(paginator))
+        self.assertFalse(forward[0].has_previous)
+        page = forward[-1]
+        backward = [page]
+        while page.has_previous:
+            page = paginator.page(page.previous_cursor)
+            backward.append(page)
+        self.assertEqual(
+            [[a.pk for a in p] for p in reversed(backward)],
+            [[a.pk for a in p] for p in forward],
+        )
+
+    def test_cursors_are_signed(self):
+        paginator = CursorPaginator(Address.objects.all(), page_size=5)
+        cursor = paginator.page().next_cursor
+        with self.assertRaises(InvalidCursor):
+            paginator.page(cursor[:-2] + "xx")
+        with self.assertRaises(InvalidCursor):
+            CursorPaginator(Address.objects.all(), "created_at").page(cursor)
+        forged = signing.dumps(["-created_at", None, 1, False], salt="other")
+        with self.assertRaises(InvalidCursor):
+            paginator.page(forged)
+
+    def test_base_filter_cursor_page(self):
+        filterset = AddressFilter(
+            {"city": "Chicago", "order_by": "created_by"},
+            queryset=Address.objects.all(),
+        )
+        page = filterset.cursor_page(page_size=4)
+        self.assertEqual(len(page), 4)
+        self.assertTrue(all(address.city == "Chicago" for address in page))
+        rest = filterset.cursor_page(page.next_cursor, page_size=100)
+        self.assertEqual(
+            len(page) + len(rest), Address.objects.filter(city="Chicago").count()
+        )
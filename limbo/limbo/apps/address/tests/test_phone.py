@@ -0,0 +1,115 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from phonenumber_field.phonenumber import PhoneNumber
+
+from limbo.apps.address import normalizers
+from limbo.apps.address.importer import copy_addresses
+from limbo.apps.address.models import Address
+from limbo.apps.address.normalizers import (
+    normalize_phone_number,
+    normalize_phone_numbers,
+    phone_number_e164,
+)
+from limbo.factory.address import AddressFactory, SpringfieldAddressFactory
+
+
+class TestPhoneNormalizers(SimpleTestCase):
+    def test_normalize_phone_numbers(self):
+        results = normalize_phone_numbers(
+            ["(202) 555-0143", "", "nope", "+1 202 555 0143", "12"], region="US"
+        )
+        self.assertEqual(results[0], "+12025550143")
+        self.assertIsNone(results[1])
+        self.assertIsInstance(results[2], ValidationError)
+        self.assertEqual(results[3], "+12025550143")
+        self.assertIs(results[4], results[2])
+
+    def test_parse_results_are_memoized(self):
+        normalizers._phone_e164.cache_clear()
+        for _ in range(3):
+            normalize_phone_numbers(["(202) 555-0143"] * 10, region="US")
+            normalize_phone_number("(202) 555-0143", region="US")
+        info = normalizers._phone_e164.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 32)
+
+    def test_phone_number_e164(self):
+        self.assertEqual(
+            phone_number_e164(PhoneNumber.from_string("(202) 555-0143", "US")),
+            "+12025550143",
+        )
+        self.assertEqual(phone_number_e164("020 7946 0018", "GB"), "+442079460018")
+        self.assertEqual(phone_number_e164(None), "")
+        self.assertEqual(phone_number_e164("not a number"), "")
+
+
+class TestPhoneE164Column(TestCase):
+    def test_set_on_save_and_update_fields(self):
+        address = SpringfieldAddressFactory.build(phone_number="(202) 555-0143")
+        address.save()
+        self.assertEqual(address.phone_e164, "+12025550143")
+
+        address.phone_number = None
+        address.save(update_fields=["phone_number"])
+        address.refresh_from_db()
+        self.assertEqual(address.phone_e164, "")
+
+    def test_bulk_paths(self):
+        address, = Address.objects.bulk_create(
+            [SpringfieldAddressFactory.build(phone_number="+12025550143")]
+        )
+        self.assertEqual(Address.objects.get().phone_e164, "+12025550143")
+
+        address.phone_number = "+12025550199"
+        Address.objects.bulk_update([address], ["phone_number"])
+        self.assertEqual(Address.objects.get().phone_e164, "+12025550199")
+
+        Address.objects.update(phone_number="+442079460018")
+        self.assertEqual(Address.objects.get().phone_e164, "+442079460018")
+
+    def test_upsert_and_copy_refresh_phone(self):
+        Address.objects.upsert_many(
+            [SpringfieldAddressFactory.build(phone_number="+12025550143")]
+        )
+        Address.objects.upsert_many(
+            [SpringfieldAddressFactory.build(phone_number="+12025550199")]
+        )
+        self.assertEqual(Address.objects.get().phone_e164, "+12025550199")
+
+        copy_addresses(
+            [
+                SpringfieldAddressFactory.build(
+                    line1="1 Other St", phone_number="+12025550111"
+                )
+            ]
+        )
+        self.assertEqual(
+            Address.objects.get(line1="1 Other St").phone_e164, "+12025550111"
+        )
+
+    def test_by_phone(self):
+        jane = SpringfieldAddressFactory.build(phone_number="+12025550143")
+        john = SpringfieldAddressFactory.build(
+            line1="11 Main St", phone_number="(202) 555-0143"
+        )
+        other = SpringfieldAddressFactory.build(
+            line1="12 Main St", phone_number="+12025550199"
+        )
+        Address.objects.bulk_create([jane, john, other])
+
+        for query in ("202-555-0143", "+1 (202) 555 0143", "+12025550143"):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    set(Address.objects.by_phone(query, region="US")), {jane, john}
+                )
+        self.assertFalse(Address.objects.by_phone("garbage").exists())
+        self.assertIn(
+            '"phone_e164" =', str(Address.objects.by_phone("+12025550143").query)
+        )
+
+    def test_factory_addresses_get_canonical_number(self):
+        address = AddressFactory()
+        self.assertEqual(
+            address.phone_e164,
+            phone_number_e164(address.phone_number, address.country.code),
+        )
@@ -2,7 +2,13 @@ from unittest import TestCase
 
 from django.core.exceptions import ValidationError
 
-from limbo.apps.address.validators import validate_postal_code
+from limbo.apps.address.validators import (
+    POSTCODES_REGEX,
+    PostalCodeRegistry,
+    postal_code_registry,
+    validate_postal_code,
+    validate_postal_codes,
+)
 
 
 class TestValidatePostalCode(TestCase):
@@ -67,3 +73,66 @@ class TestValidatePostalCode(TestCase):
             str(cm.exception),
             str(["Postal code is required for the selected country."]),
         )
+
+
+class TestPostalCodeRegistry(TestCase):
+    def test_patterns_compiled_once(self):
+        registry = PostalCodeRegistry(POSTCODES_REGEX)
+        compiled = registry.compiled
+        self.assertEqual(len(compiled), len(POSTCODES_REGEX))
+        self.assertIs(registry.compiled, compiled)
+
+    def test_lookup_is_case_insensitive(self):
+        self.assertIs(postal_code_registry.get("us"), postal_code_registry.get("US"))
+
+    def test_check_returns_error_instead_of_raising(self):
+        self.assertIsNone(postal_code_registry.check("12345", "US"))
+        error = postal_code_registry.check("1234", "US")
+        self.assertIsInstance(error, ValidationError)
+        self.assertEqual(
+            str(error), str(["Invalid postal code format for country US."])
+        )
+
+    def test_validate_many_mixed_countries(self):
+        rows = [
+            ("12345", "US"),
+            ("K1A0B1", "CA"),
+            ("1234", "US"),
+            ("", "US"),
+            ("12345", "XX"),
+            ("", "XX"),
+            ("12345", ""),
+            ("12345", "CA"),
+        ]
+        results = validate_postal_codes(rows)
+        self.assertEqual(len(results), len(rows))
+        self.assertEqual(
+            [None if result is None else str(result) for result in results],
+            [
+                None,
+                None,
+                str(["Invalid postal code format for country US."]),
+                str(["Postal code is required for the selected country."]),
+                str(
+                    ["This country does not use postal codes. Please leave it blank."]
+                ),
+                None,
+                str(["Country must be specified to validate postal code."]),
+                str(["Invalid postal code format for country CA."]),
+            ],
+        )
+
+    def test_validate_many_matches_single_validation(self):
+        rows = [("12345", "US"), ("SW1A1AA", "GB"), ("12345", "GB"), ("", "DE")]
+        for (postal_code, country), result in zip(rows, validate_postal_codes(rows)):
+            with self.subTest(postal_code=postal_code, country=country):
+                if result is None:
+                    validate_postal_code(postal_code, country)
+                else:
+                    with self.assertRaises(ValidationError):
+                        validate_postal_code(postal_code, country)
+
+    def test_validate_many_accepts_generators(self):
+        results = validate_postal_codes((code, "US") for code in ("12345", "1"))
+        self.assertIsNone(results[0])
+        self.assertIsNotNone(results[1])
@@ -186,29 +186,117 @@ POSTCODES_REGEX = {
 }
 
 
-def validate_postal_code(postal_code, country_code):
+class PostalCodeRegistry:
     """
-    Validates the postal_code based on the country_code using the POSTCODES_REGEX.
-    If the country is not listed, the postal_code is considered optional.
+    Holds the POSTCODES_REGEX patterns compiled once, keyed by country code.
+
+    Patterns are compiled lazily on first use so importing the module stays
+    cheap, and are never evicted the way entries in the ``re`` module cache are.
     """
-    if not country_code:
-        raise ValidationError(_("Country must be specified to validate postal code."))
 
-    regex = POSTCODES_REGEX.get(country_code.upper())
+    def __init__(self, patterns):
+        self._patterns = patterns
+        self._compiled = None
 
-    if not regex:
-        # If the country does not use postal codes, allow it to be blank
-        if postal_code:
-            raise ValidationError(
-                _("This country does not use postal codes. Please leave it blank.")
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = {
+                country: re.compile(regex) for country, regex in self._patterns.items()
+            }
+        return self._compiled
+
+    def get(self, country_code):
+        """Return the compiled pattern for ``country_code`` or None."""
+        return self.compiled.get(country_code.upper())
+
+    def check(self, postal_code, country_code):
+        """
+        Return a ValidationError describing why ``postal_code`` is invalid for
+        ``country_code``, or None when it is valid.
+        """
+        if not country_code:
+            return ValidationError(
+                _("Country must be specified to validate postal code.")
             )
-        return
 
-    if not postal_code:
-        raise ValidationError(_("Postal code is required for the selected country."))
+        pattern = self.get(country_code)
+
+        if pattern is None:
+            # If the country does not use postal codes, allow it to be blank
+            if postal_code:
+                return ValidationError(
+                    _("This country does not use postal codes. Please leave it blank.")
+                )
+            return None
+
+        if not postal_code:
+            return ValidationError(
+                _("Postal code is required for the selected country.")
+            )
+
+        if not pattern.match(postal_code):
+            return ValidationError(
+                _("Invalid postal code format for country %(country)s."),
+                params={"country": country_code},
+            )
+        return None
+
+    def validate(self, postal_code, country_code):
+        error = self.check(postal_code, country_code)
+        if error is not None:
+            raise error
+
+    def validate_many(self, rows):
+        """
+        Validate an iterable of ``(postal_code, country_code)`` pairs.
+
+        Rows are grouped by country so each pattern is looked up once per
+        country instead of once per row. Nothing is raised; the result is a
+        list aligned with ``rows`` holding None for valid rows and the
+        ValidationError for invalid ones.
+        """
+        rows = list(rows)
+        results = [None] * len(rows)
+
+        by_country = {}
+        for index, (postal_code, country_code) in enumerate(rows):
+            by_country.setdefault(country_code, []).append((index, postal_code))
 
-    if not re.match(regex, postal_code):
-        raise ValidationError(
-            _("Invalid postal code format for country %(country)s."),
-            params={"country": country_code},
-        )
+        for country_code, items in by_country.items():
+            pattern = self.get(country_code) if country_code else None
+            if not country_code or pattern is None:
+                for index, postal_code in items:
+                    results[index] = self.check(postal_code, country_code)
+                continue
+
+            # Errors for a given country are identical, so invalid rows share
+            # one instance rather than building a ValidationError per row.
+            match = pattern.match
+            errors = {}
+            for index, postal_code in items:
+                if not postal_code or not match(postal_code):
+                    key = bool(postal_code)
+                    if key not in errors:
+                        errors[key] = self.check(postal_code, country_code)
+                    results[index] = errors[key]
+
+        return results
+
+
+postal_code_registry = PostalCodeRegistry(POSTCODES_REGEX)
+
+
+def validate_postal_code(postal_code, country_code):
+    """
+    Validates the postal_code based on the country_code using the POSTCODES_REGEX.
+    If the country is not listed, the postal_code is considered optional.
+    """
+    postal_code_registry.validate(postal_code, country_code)
+
+
+def validate_postal_codes(rows):
+    """
+    Batch variant of validate_postal_code. See PostalCodeRegistry.validate_many.
+    """
+    return postal_code_registry.validate_many(rows)
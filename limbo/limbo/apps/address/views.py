@@ -0,0 +1,27 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .models import AddressFacet
+from .permissions import CanViewAddresses
+
+STATE_FACET_LIMIT = 100
+
+
+@api_view(["GET"])
+@permission_classes([CanViewAddresses])
+def address_facets(request):
+    """
+    Address counts per country, and for the most frequent states, of the
+    ``country`` parameter if given, from the precomputed ``AddressFacet``.
+    """
+    country = request.GET.get("country", "").upper()
+    states = AddressFacet.objects.states(country, STATE_FACET_LIMIT)
+    return Response(
+        {
+            "countries": [
+                {"country": code, "count": total}
+                for code, total in AddressFacet.objects.countries()
+            ],
+            "states": [{"state": state, "count": total} for state, total in states],
+        }
+    )
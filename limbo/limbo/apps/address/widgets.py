@@ -0,0 +1,50 @@
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django_countries.fields import Country
+from django_countries.widgets import CountrySelectWidget
+
+from .flags import FLAG_SPRITE_CSS
+
+# Keeps the flag next to the select in sync by swapping the sprite classes,
+# mirroring Country.flag_css.
+SPRITE_CHANGE_HANDLER = (
+    "var e=document.getElementById('flag_' + this.id); "
+    "if (e) {var c=this.value.toLowerCase(); "
+    "e.className=c ? 'flag-sprite flag-' + c[0] + ' flag-_' + c[1] : '';}"
+)
+
+
+class CountrySpriteSelectWidget(CountrySelectWidget):
+    """
+    CountrySelectWidget rendering the flag from the local sprite sheet with
+    CSS classes instead of one ``<img>`` per flag.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault(
+            "layout",
+            '{widget}<i class="{flag_css}" id="{flag_id}" style="margin: auto 4px"></i>',
+        )
+        super().__init__(*args, **kwargs)
+
+    class Media:
+        css = {"all": (FLAG_SPRITE_CSS,)}
+
+    def render(self, name, value, attrs=None, renderer=None):
+        attrs = attrs or {}
+        flag_id = ""
+        if attrs.get("id"):
+            flag_id = f"flag_{attrs['id']}"
+            attrs["onchange"] = SPRITE_CHANGE_HANDLER
+        # Skip CountrySelectWidget.render, which wires the handler to image URLs.
+        widget_render = super(CountrySelectWidget, self).render(
+            name, value, attrs, renderer=renderer
+        )
+        country = value if isinstance(value, Country) else Country(value or "")
+        return mark_safe(  # nosec
+            self.layout.format(
+                widget=widget_render,
+                flag_css=escape(country.flag_css),
+                flag_id=escape(flag_id),
+            )
+        )
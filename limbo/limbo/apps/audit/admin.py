@@ -0,0 +1,31 @@
+from django.contrib import admin
+
+from .models import AuditLog
+
+
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ("created_at", "action", "model", "object_id", "actor")
+    list_filter = ("action", "model")
+    search_fields = ("object_id",)
+    list_select_related = ("actor",)
+    date_hierarchy = "created_at"
+    readonly_fields = (
+        "model",
+        "object_id",
+        "action",
+        "changes",
+        "actor",
+        "created_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(AuditLog, AuditLogAdmin)
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class AuditConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "limbo.apps.audit"
+    verbose_name = "Audit"
+
+    def ready(self):
+        from limbo.core.signals import model_deleted, model_saved
+
+        from . import recorder
+
+        model_saved.connect(recorder.saved_receiver)
+        model_deleted.connect(recorder.deleted_receiver)
@@ -0,0 +1,28 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .recorder import batch
+
+
+class AuditMiddleware:
+    """
+    Write the audit log entries of a request with one bulk insert when the
+    response is ready, instead of one INSERT per saved object.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with batch():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with batch():
+            return await self.get_response(request)
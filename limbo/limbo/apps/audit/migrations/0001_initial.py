@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:42
+
+import django.db.models.deletion
+import django.utils.timezone
+import limbo.apps.audit.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Model')),
+                ('object_id', models.CharField(max_length=64, verbose_name='Object ID')),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=10, verbose_name='Action')),
+                ('changes', models.JSONField(default=dict, encoder=limbo.apps.audit.models.AuditJSONEncoder, verbose_name='Changes')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created at')),
+                ('actor', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Audit log entry',
+                'verbose_name_plural': 'Audit log',
+                'ordering': ('-created_at', '-id'),
+                'indexes': [models.Index(fields=['model', 'object_id', '-created_at'], name='audit_audit_model_254b0f_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class AuditJSONEncoder(DjangoJSONEncoder):
+    """Falls back to ``str()`` for values such as countries and phone numbers."""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+class AuditLog(models.Model):
+    """
+    Append-only record of a change to a ``BaseModel`` instance. ``changes``
+    maps each changed field to its ``[old, new]`` values.
+    """
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    ACTION_CHOICES = (
+        (CREATE, _("Create")),
+        (UPDATE, _("Update")),
+        (DELETE, _("Delete")),
+    )
+
+    model = models.CharField(_("Model"), max_length=100)
+    object_id = models.CharField(_("Object ID"), max_length=64)
+    action = models.CharField(_("Action"), max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField(_("Changes"), default=dict, encoder=AuditJSONEncoder)
+    # No constraint and no cascade: history outlives the users it mentions.
+    actor = models.ForeignKey(
+        "users.User",
+        on_delete=models.DO_NOTHING,
+        null=True,
+        db_constraint=False,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(_("Created at"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Audit log entry")
+        verbose_name_plural = _("Audit log")
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=["model", "object_id", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.action} {self.model} {self.object_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Audit log entries cannot be modified.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Audit log entries cannot be deleted.")
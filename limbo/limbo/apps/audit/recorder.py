@@ -0,0 +1,287 @@
+"""
+Collects audit log entries for ``BaseModel`` changes and writes them in
+batches instead of one INSERT per save.
+
+``BaseModel.save()`` and ``delete()`` send the ``limbo.core.signals``
+that ``AuditConfig.ready()`` connects to ``record_save`` and
+``record_delete``, which compute the field diff and hand the entry over
+with ``transaction.on_commit``: changes that are rolled back, including
+those in a rolled back savepoint, never reach the log. On commit an entry
+goes to the first available sink:
+
+- the batch opened by ``AuditMiddleware`` or ``batch()``, written with one
+  bulk insert when it closes, that is once per request;
+- the background writer thread, when ``AUDIT_LOG["WRITER"]`` is
+  ``"background"``;
+- otherwise, in management commands, the shell or Celery tasks, a buffer
+  of the process written with one bulk insert once ``BATCH_SIZE`` entries
+  are waiting or the oldest has waited ``FLUSH_INTERVAL`` seconds, checked
+  as the next entry arrives, and in any case when the next batch closes,
+  a Celery task ends or the process exits. Call ``flush_pending()`` to
+  write it sooner.
+
+Bulk queryset operations and cascade deletions bypass ``save()`` and
+``delete()`` and are not audited.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cache, partial
+
+from celery.signals import task_postrun
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from limbo.core.context import get_current_user_id
+
+from .models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "WRITER": "sync",
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+}
+
+_batch = ContextVar("audit_batch", default=None)
+
+_pending = []
+_pending_since = None
+_pending_lock = threading.Lock()
+
+
+def audit_settings():
+    return {**DEFAULTS, **getattr(settings, "AUDIT_LOG", {})}
+
+
+@cache
+def audited_fields(model):
+    """Editable concrete fields of ``model`` minus its ``audit_exclude``."""
+    exclude = set(getattr(model, "audit_exclude", ()))
+    return tuple(
+        field
+        for field in model._meta.concrete_fields
+        if field.editable and not field.primary_key and field.name not in exclude
+    )
+
+
+def _entry(instance, action, changes, object_id=None):
+    return AuditLog(
+        model=instance._meta.label_lower,
+        object_id=str(instance.pk if object_id is None else object_id),
+        action=action,
+        changes=changes,
+        actor_id=get_current_user_id() or getattr(instance, "updated_by_id", None),
+    )
+
+
+def _loaded_fields(instance, update_fields=None):
+    deferred = instance.get_deferred_fields()
+    for field in audited_fields(type(instance)):
+        if field.attname in deferred:
+            continue
+        if update_fields is not None and not (
+            field.name in update_fields or field.attname in update_fields
+        ):
+            continue
+        yield field
+
+
+def record_save(instance, created, update_fields=None):
+    """
+    Diff ``instance`` against its state when loaded or last saved and log
+    the changed fields; a creation logs every non-empty field.
+    """
+    snapshot = getattr(instance, "_audit_snapshot", {})
+    changes = {}
+    for field in _loaded_fields(instance, update_fields):
+        new = getattr(instance, field.attname)
+        if created:
+            if new not in (None, ""):
+                changes[field.attname] = [None, new]
+        elif field.attname in snapshot:
+            old = snapshot[field.attname]
+            if old != new:
+                changes[field.attname] = [old, new]
+        # Else the field was deferred and loaded since: no baseline to diff.
+        snapshot[field.attname] = new
+    instance._audit_snapshot = snapshot
+    if changes or created:
+        action = AuditLog.CREATE if created else AuditLog.UPDATE
+        _enqueue(_entry(instance, action, changes), instance._state.db)
+
+
+def record_delete(instance, object_id):
+    changes = {
+        field.attname: [getattr(instance, field.attname), None]
+        for field in _loaded_fields(instance)
+    }
+    entry = _entry(instance, AuditLog.DELETE, changes, object_id=object_id)
+    _enqueue(entry, instance._state.db)
+
+
+def saved_receiver(sender, instance, created, update_fields=None, **kwargs):
+    """``model_saved`` receiver."""
+    record_save(instance, created, update_fields)
+
+
+def deleted_receiver(sender, instance, object_id, **kwargs):
+    """``model_deleted`` receiver."""
+    record_delete(instance, object_id)
+
+
+def _enqueue(entry, using):
+    transaction.on_commit(partial(_committed, entry), using=using)
+
+
+def _committed(entry):
+    entries = _batch.get()
+    if entries is not None:
+        entries.append(entry)
+    elif audit_settings()["WRITER"] == "background":
+        get_writer().put([entry])
+    else:
+        _hold(entry)
+
+
+def _hold(entry):
+    global _pending_since
+    config = audit_settings()
+    with _pending_lock:
+        if not _pending:
+            _pending_since = time.monotonic()
+        _pending.append(entry)
+        due = (
+            len(_pending) >= config["BATCH_SIZE"]
+            or time.monotonic() - _pending_since >= config["FLUSH_INTERVAL"]
+        )
+    if due:
+        flush_pending()
+
+
+def _take_pending():
+    with _pending_lock:
+        entries = _pending[:]
+        _pending.clear()
+    return entries
+
+
+def flush_pending():
+    """Write the entries committed outside any batch that are still waiting."""
+    flush(_take_pending())
+
+
+@task_postrun.connect
+def _task_finished(**kwargs):
+    flush_pending()
+
+
+atexit.register(flush_pending)
+
+
+def write(entries):
+    """Insert ``entries`` with one bulk insert per ``BATCH_SIZE`` rows."""
+    AuditLog.objects.bulk_create(entries, batch_size=audit_settings()["BATCH_SIZE"])
+
+
+def flush(entries):
+    if not entries:
+        return
+    if audit_settings()["WRITER"] == "background":
+        get_writer().put(entries)
+        return
+    try:
+        write(entries)
+    except Exception:
+        # The audited changes are committed already; don't fail the caller.
+        logger.exception("Could not write %d audit log entries.", len(entries))
+
+
+@contextmanager
+def batch():
+    """
+    Collect the entries committed inside the block and write them together
+    when it exits, along with those waiting in the buffer. Nested blocks
+    share the outermost batch.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    entries = []
+    token = _batch.set(entries)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        flush(_take_pending() + entries)
+
+
+class BackgroundWriter:
+    """
+    Daemon thread writing queued entries in batches of up to ``batch_size``,
+    at least every ``flush_interval`` seconds while entries are waiting.
+    """
+
+    def __init__(self, batch_size=500, flush_interval=1.0):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def put(self, entries):
+        self.start()
+        for entry in entries:
+            self.queue.put(entry)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self.run, name="audit-writer", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self):
+        """Block until every queued entry has been written."""
+        self.queue.join()
+
+    def run(self):
+        while True:
+            entries = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(entries) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    entries.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                write(entries)
+            except Exception:
+                logger.exception("Could not write %d audit log entries.", len(entries))
+            finally:
+                close_old_connections()
+                for _ in entries:
+                    self.queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            config = audit_settings()
+            _writer = BackgroundWriter(config["BATCH_SIZE"], config["FLUSH_INTERVAL"])
+            atexit.register(_writer.flush)
+    return _writer
@@ -0,0 +1,177 @@
+from celery.signals import task_postrun
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from limbo.apps.address.models import Address
+from limbo.apps.audit import recorder
+from limbo.apps.audit.middleware import AuditMiddleware
+from limbo.apps.audit.models import AuditLog
+from limbo.apps.users.models import User
+from limbo.factory.address import SpringfieldAddressFactory
+
+
+class TestAuditRecorder(TestCase):
+    def save(self, instance, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.save(**kwargs)
+        recorder.flush_pending()
+
+    def test_create_update_delete(self):
+        user = User.objects.create(username="jane")
+        address = SpringfieldAddressFactory.build(updated_by=user)
+        self.save(address)
+        created = AuditLog.objects.get()
+        self.assertEqual(created.action, AuditLog.CREATE)
+        self.assertEqual(created.model, "address.address")
+        self.assertEqual(created.object_id, str(address.pk))
+        self.assertEqual(created.actor, user)
+        self.assertEqual(created.changes["city"], [None, "Springfield"])
+        self.assertNotIn("line2", created.changes)
+        self.assertNotIn("updated_by_id", created.changes)
+
+        address = Address.objects.get()
+        address.city = "Chicago"
+        address.postal_code = "60601"
+        self.save(address)
+        update = AuditLog.objects.filter(action=AuditLog.UPDATE).get()
+        self.assertEqual(
+            update.changes,
+            {"city": ["Springfield", "Chicago"], "postal_code": ["62701", "60601"]},
+        )
+
+        pk = address.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            address.delete()
+        recorder.flush_pending()
+        deleted = AuditLog.objects.filter(action=AuditLog.DELETE).get()
+        self.assertEqual(deleted.object_id, str(pk))
+        self.assertEqual(deleted.changes["city"], ["Chicago", None])
+
+    def test_unchanged_save_is_not_logged(self):
+        address = SpringfieldAddressFactory.build()
+        self.save(address)
+        self.save(address)
+        address = Address.objects.get()
+        self.save(address)
+        address.city = "Chicago"
+        self.save(address, update_fields=["state"])
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_deferred_fields_are_not_compared(self):
+        self.save(SpringfieldAddressFactory.build())
+        address = Address.objects.only("city").get()
+        address.city = "Chicago"
+        self.save(address)
+        self.assertEqual(
+            AuditLog.objects.filter(action=AuditLog.UPDATE).get().changes,
+            {"city": ["Springfield", "Chicago"]},
+        )
+
+    def test_written_on_commit_only(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            SpringfieldAddressFactory.build().save()
+            self.assertFalse(AuditLog.objects.exists())
+            try:
+                with transaction.atomic():
+                    SpringfieldAddressFactory.build(line1="1 Other St").save()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        callbacks = [
+            c for c in callbacks if getattr(c, "func", None) is recorder._committed
+        ]
+        self.assertEqual(len(callbacks), 1)
+        for callback in callbacks:
+            callback()
+        recorder.flush_pending()
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_batch_writes_one_insert(self):
+        with recorder.batch():
+            with self.captureOnCommitCallbacks(execute=True):
+                for n in range(20):
+                    SpringfieldAddressFactory.build(line2=f"Apt {n}").save()
+            # The batch is written when the block exits.
+            self.assertFalse(AuditLog.objects.exists())
+        self.assertEqual(AuditLog.objects.count(), 20)
+
+        with CaptureQueriesContext(connection) as queries:
+            with recorder.batch():
+                with self.captureOnCommitCallbacks(execute=True):
+                    for address in Address.objects.all():
+                        address.city = "Chicago"
+                        address.save()
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "audit')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_middleware_batches_the_request(self):
+        def view(request):
+            for n in range(3):
+                SpringfieldAddressFactory.build(line2=f"Apt {n}").save()
+            return "response"
+
+        def get_response(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                return view(request)
+
+        middleware = AuditMiddleware(get_response)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(middleware(RequestFactory().get("/")), "response")
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "audit')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    @override_settings(AUDIT_LOG={"BATCH_SIZE": 5, "FLUSH_INTERVAL": 60})
+    def test_saves_outside_a_batch_are_buffered(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                for n in range(4):
+                    SpringfieldAddressFactory.build(line2=f"Apt {n}").save()
+            self.assertFalse(AuditLog.objects.exists())
+            with self.captureOnCommitCallbacks(execute=True):
+                SpringfieldAddressFactory.build(line2="Apt 4").save()
+        inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "audit')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(AuditLog.objects.count(), 5)
+
+    @override_settings(AUDIT_LOG={"FLUSH_INTERVAL": 60})
+    def test_buffer_is_written_when_a_task_or_batch_ends(self):
+        self.save(SpringfieldAddressFactory.build())
+        with self.captureOnCommitCallbacks(execute=True):
+            SpringfieldAddressFactory.build(line2="Apt 1").save()
+        self.assertEqual(AuditLog.objects.count(), 1)
+        task_postrun.send(sender=None)
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SpringfieldAddressFactory.build(line2="Apt 2").save()
+        with recorder.batch():
+            pass
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    @override_settings(AUDIT_LOG={"FLUSH_INTERVAL": 0})
+    def test_buffer_is_written_after_the_interval(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            SpringfieldAddressFactory.build().save()
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_entries_are_append_only(self):
+        self.save(SpringfieldAddressFactory.build())
+        entry = AuditLog.objects.get()
+        with self.assertRaises(ValueError):
+            entry.save()
+        with self.assertRaises(ValueError):
+            entry.delete()
+
+
+class TestBackgroundWriter(TransactionTestCase):
+    @override_settings(AUDIT_LOG={"WRITER": "background", "FLUSH_INTERVAL": 0.01})
+    def test_background_writer_flushes(self):
+        writer = recorder.BackgroundWriter(batch_size=2, flush_interval=0.01)
+        original, recorder._writer = recorder._writer, writer
+        self.addCleanup(setattr, recorder, "_writer", original)
+        for n in range(5):
+            SpringfieldAddressFactory.build(line2=f"Apt {n}").save()
+        writer.flush()
+        self.assertEqual(AuditLog.objects.count(), 5)
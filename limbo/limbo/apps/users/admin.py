@@ -2,10 +2,12 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from limbo.core.admin import EstimatedCountAdminMixin, SearchVectorAdminMixin
+
 from .models import User
 
 
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(EstimatedCountAdminMixin, SearchVectorAdminMixin, BaseUserAdmin):
     fieldsets = (
         (None, {"fields": ("username", "password")}),
         (
@@ -5,5 +5,30 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "limbo.apps.users"
 
-    # def ready(self):
-    #     import marketEdge.apps.users.signals
+    def ready(self):
+        from django.contrib.auth.models import Group, Permission
+        from django.contrib.auth.signals import user_logged_in
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from limbo.core.querycache import invalidate_receiver
+
+        from . import events, permissions
+        from .authentication import forget_principal
+
+        User = self.get_model("User")
+        post_save.connect(invalidate_receiver, sender=User)
+        post_delete.connect(invalidate_receiver, sender=User)
+        post_save.connect(forget_principal, sender=User)
+        post_delete.connect(forget_principal, sender=User)
+        user_logged_in.connect(events.forward_login, sender=User)
+
+        for relation in (User.groups, User.user_permissions):
+            m2m_changed.connect(
+                permissions.user_relation_changed, sender=relation.through
+            )
+        m2m_changed.connect(
+            permissions.group_permissions_changed, sender=Group.permissions.through
+        )
+        post_delete.connect(permissions.invalidate_all, sender=Group)
+        post_delete.connect(permissions.invalidate_all, sender=Permission)
+        post_save.connect(permissions.invalidate_all, sender=Permission)
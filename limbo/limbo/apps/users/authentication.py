@@ -0,0 +1,85 @@
+"""
+JWT authentication for the API without database reads.
+
+Access tokens carry the user id and the user's ``token_version``. The
+user they stand for is rebuilt from a principal, the few columns requests
+check (``PRINCIPAL_FIELDS``), cached for ``JWT_PRINCIPAL_TIMEOUT`` seconds
+under the user id; permissions come from ``CachedPermissionBackend``'s
+cache. A request with a valid token therefore costs no query.
+
+Saving a user drops their principal, so deactivation applies at once.
+``User.revoke_tokens()`` bumps the version, as saving a password change
+does, and invalidates every token issued before. Writes that bypass
+``save()`` take effect when the principal expires.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from limbo.core.context import set_current_user_id
+
+TOKEN_VERSION_CLAIM = "ver"
+# In the model's field order, as Model.from_db() expects.
+PRINCIPAL_FIELDS = (
+    "id",
+    "is_superuser",
+    "username",
+    "is_staff",
+    "is_active",
+    "token_version",
+)
+
+
+def principal_key(user_id):
+    return f"limbo:jwt:principal:{user_id}"
+
+
+def forget_principal(sender=None, instance=None, **kwargs):
+    """Drop the cached principal of ``instance``; a ``post_save`` receiver."""
+    cache.delete(principal_key(instance.pk))
+
+
+def get_principal(user_id, token_version):
+    """
+    The user ``user_id`` with ``PRINCIPAL_FIELDS`` loaded, if active and
+    at ``token_version``. Raises ``AuthenticationFailed`` otherwise.
+    """
+    User = get_user_model()
+    key = principal_key(user_id)
+    values = cache.get(key)
+    version = PRINCIPAL_FIELDS.index("token_version")
+    if values is None or values[version] != token_version:
+        # A newer token than the cached principal is checked against the row.
+        values = (
+            User.objects.filter(pk=user_id).values_list(*PRINCIPAL_FIELDS).first()
+        )
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        cache.set(key, values, getattr(settings, "JWT_PRINCIPAL_TIMEOUT", 30))
+    user = User.from_db(DEFAULT_DB_ALIAS, PRINCIPAL_FIELDS, values)
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if user.token_version != token_version:
+        raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+    return user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` resolving the user from its cached principal."""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+        user = get_principal(user_id, validated_token.get(TOKEN_VERSION_CLAIM, 0))
+        set_current_user_id(user.pk)
+        return user
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from . import permissions
+from .hashing import amake_password
+
+UserModel = get_user_model()
+
+
+class AsyncModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` whose ``aauthenticate()`` hashes on the hashing pool
+    instead of the event loop, see ``limbo.apps.users.hashing``.
+    """
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway, so unknown usernames take as long as wrong
+            # passwords.
+            await amake_password(password)
+        else:
+            if await user.acheck_password(password) and self.user_can_authenticate(
+                user
+            ):
+                return user
+
+
+class CachedPermissionBackend(AsyncModelBackend):
+    """
+    ``ModelBackend`` whose permission sets are cached across requests,
+    under keys that embed the user's and the groups' permission versions,
+    see ``limbo.apps.users.permissions``. Object permissions and inactive
+    users are left to ``ModelBackend``.
+    """
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if hasattr(user_obj, perm_cache_name):
+            return getattr(user_obj, perm_cache_name)
+        key = permissions.cache_key(user_obj, from_name)
+        perms = cache.get(key)
+        if perms is None:
+            perms = super()._get_permissions(user_obj, obj, from_name)
+            cache.set(key, perms, permissions.cache_timeout())
+        setattr(user_obj, perm_cache_name, perms)
+        return perms
@@ -0,0 +1,115 @@
+"""
+Memory-mapped Bloom filter of breached passwords.
+
+The filter is a file: a fixed header followed by the bit array. Lookups
+read a handful of bits straight from the mapping, so opening it costs
+nothing and the pages touched live in the OS page cache, shared by every
+worker, instead of in each process's heap. Tens of millions of passwords
+fit in tens of megabytes: about 1.8 bytes per entry at a 0.1% false
+positive rate.
+
+Passwords are stored lowercased and stripped, as Django's
+``CommonPasswordValidator`` compares them. Build a filter with the
+``build_password_filter`` command.
+"""
+import gzip
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import password_validation
+
+MAGIC = b"LBLOOM1\0"
+# Magic, bit count, hash count, entry count.
+HEADER = struct.Struct("<8sQIQ")
+
+# The list CommonPasswordValidator reads.
+DEFAULT_PASSWORD_LIST = (
+    Path(password_validation.__file__).resolve().parent / "common-passwords.txt.gz"
+)
+
+
+def normalize(password):
+    return password.lower().strip()
+
+
+def _hashes(password):
+    digest = hashlib.blake2b(normalize(password).encode(), digest_size=16).digest()
+    return struct.unpack("<QQ", digest)
+
+
+def optimal_size(capacity, error_rate):
+    """Bit and hash counts for ``capacity`` entries at ``error_rate``."""
+    capacity = max(capacity, 1)
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """A read-only filter file; ``password in bloom_filter``."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bits, self.hashes, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a password filter.")
+        if len(self._map) < HEADER.size + (self.bits + 7) // 8:
+            self._map.close()
+            raise ValueError(f"{path} is truncated.")
+        self.path = path
+
+    def __contains__(self, password):
+        h1, h2 = _hashes(password)
+        data, bits, offset = self._map, self.bits, HEADER.size
+        for i in range(self.hashes):
+            index = (h1 + i * h2) % bits
+            if not data[offset + (index >> 3)] & (1 << (index & 7)):
+                return False
+        return True
+
+    def close(self):
+        self._map.close()
+
+    @classmethod
+    def build(cls, path, passwords, capacity, error_rate=0.001):
+        """
+        Write a filter of ``passwords``, sized for ``capacity`` entries, to
+        ``path``, atomically. Returns the number of entries added.
+        """
+        bits, hashes = optimal_size(capacity, error_rate)
+        array = bytearray((bits + 7) // 8)
+        count = 0
+        for password in passwords:
+            h1, h2 = _hashes(password)
+            for i in range(hashes):
+                index = (h1 + i * h2) % bits
+                array[index >> 3] |= 1 << (index & 7)
+            count += 1
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(HEADER.pack(MAGIC, bits, hashes, count))
+                f.write(array)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return count
+
+
+def read_password_list(path):
+    """The non-empty lines of ``path``, a plain or gzipped text file."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
@@ -0,0 +1,337 @@
+"""
+Dispatch of the ``user_registered`` and ``user_logged_in`` signals out of
+the request.
+
+Code that registers or logs a user in calls ``dispatch(signal, user,
+**kwargs)``. ``USER_EVENTS["DISPATCH"]`` decides what happens next:
+
+- ``"sync"``: the receivers run at once, like a plain ``Signal.send()``;
+- ``"background"``: the event is serialized and, when the transaction
+  commits, queued for a daemon thread of the process, which delivers the
+  queued events in batches;
+- ``"celery"``: the event is published to the ``deliver_events`` Celery
+  task when the transaction commits, so the receivers don't add to the
+  request's latency and a queued event survives the process. While the
+  broker can't be reached, events are held by the same daemon thread,
+  which publishes them again every ``RETRY_DELAY`` seconds.
+
+Receivers are called as with ``Signal.send()``: ``sender`` is the user
+model and ``user`` the user, loaded once per batch; extra ``kwargs`` must
+be JSON serializable. Events of rolled back transactions are never sent,
+nor those of users deleted meanwhile. A receiver that raises is retried
+alone, up to ``MAX_RETRIES`` times, ``RETRY_DELAY`` seconds later, doubled
+at each attempt; the other receivers of the event aren't called again.
+Receivers are told apart by the ``dispatch_uid`` they were connected
+with, otherwise by their qualified name and their rank among the
+receivers of that name, so labels mean the same in every process.
+"""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+import weakref
+from collections import Counter
+from functools import partial
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.dispatch import receiver
+
+from .signals import user_logged_in, user_registered
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "DISPATCH": "sync",
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 0.5,
+    "MAX_RETRIES": 5,
+    "RETRY_DELAY": 10.0,
+}
+
+SIGNALS = {
+    "user_registered": user_registered,
+    "user_logged_in": user_logged_in,
+}
+
+
+def events_settings():
+    return {**DEFAULTS, **getattr(settings, "USER_EVENTS", {})}
+
+
+def signal_name(signal):
+    for name, known in SIGNALS.items():
+        if known is signal:
+            return name
+    raise ValueError(f"{signal!r} is not a user event signal.")
+
+
+def live_receivers(signal, sender):
+    """
+    ``(label, receiver, is_async)`` for the live receivers of ``signal``
+    connected for ``sender`` or any sender, in connection order, read from
+    the signal's lookup keys.
+    """
+    ranks = Counter()
+    receivers = []
+    for (receiver_key, sender_key), function, is_async in list(signal.receivers):
+        # Signal.connect() keys senders by id(), None for any sender.
+        if sender_key not in (id(None), id(sender)):
+            continue
+        if isinstance(function, weakref.ReferenceType):
+            function = function()
+            if function is None:
+                continue
+        if isinstance(receiver_key, str):
+            # A dispatch_uid; other keys are ids, only valid in this process.
+            label = receiver_key
+        else:
+            name = f"{function.__module__}.{function.__qualname__}"
+            label = f"{name}#{ranks[name]}"
+            ranks[name] += 1
+        receivers.append((label, function, is_async))
+    return receivers
+
+
+def forward_login(sender, request, user, **kwargs):
+    """Dispatch ``user_logged_in`` on ``django.contrib.auth``'s login."""
+    dispatch(user_logged_in, user)
+
+
+def dispatch(signal, user, **kwargs):
+    """Send ``signal`` for ``user`` the way ``USER_EVENTS`` configures."""
+    mode = events_settings()["DISPATCH"]
+    if mode == "sync":
+        signal.send(sender=type(user), user=user, **kwargs)
+        return
+    event = {
+        "signal": signal_name(signal),
+        "user": user.pk,
+        # Round-tripped so unserializable arguments fail here, not later.
+        "kwargs": json.loads(json.dumps(kwargs, cls=DjangoJSONEncoder)),
+        "receivers": None,
+        "attempts": 0,
+    }
+    if mode == "celery":
+        transaction.on_commit(partial(publish, [event]))
+    else:
+        transaction.on_commit(partial(get_queue().put, [event]))
+
+
+def deliver(events):
+    """
+    Call the receivers of ``events`` and return the events to retry, each
+    narrowed to the receivers that failed.
+    """
+    User = get_user_model()
+    users = User.objects.in_bulk({event["user"] for event in events})
+    failed = []
+    for event in events:
+        user = users.get(event["user"])
+        if user is None:
+            logger.info("Dropping %s event of deleted user %s.", *event_ids(event))
+            continue
+        errors = _send(SIGNALS[event["signal"]], event, sender=User, user=user)
+        if errors:
+            failed.append(
+                {**event, "receivers": errors, "attempts": event["attempts"] + 1}
+            )
+    return failed
+
+
+def _send(signal, event, **named):
+    labels = event["receivers"]
+    errors = []
+    for label, function, is_async in live_receivers(signal, named["sender"]):
+        if labels is not None and label not in labels:
+            continue
+        try:
+            if is_async:
+                async_to_sync(function)(signal=signal, **named, **event["kwargs"])
+            else:
+                function(signal=signal, **named, **event["kwargs"])
+        except Exception:
+            logger.exception(
+                "%s failed on %s event of user %s.", label, *event_ids(event)
+            )
+            errors.append(label)
+    return errors
+
+
+def event_ids(event):
+    return event["signal"], event["user"]
+
+
+def retryable(events):
+    """``events`` that have retries left; the others are logged and dropped."""
+    max_retries = events_settings()["MAX_RETRIES"]
+    for event in events:
+        if event["attempts"] > max_retries:
+            logger.error(
+                "Giving up on %s event of user %s for %s.",
+                *event_ids(event),
+                ", ".join(event["receivers"]),
+            )
+    return [event for event in events if event["attempts"] <= max_retries]
+
+
+def retry_delay(attempts):
+    return events_settings()["RETRY_DELAY"] * 2 ** (attempts - 1)
+
+
+def deliver_here(events):
+    """Deliver ``events`` in this process, scheduling the retries."""
+    retries = []
+    for event in retryable(deliver(events)):
+        timer = threading.Timer(
+            retry_delay(event["attempts"]), get_queue().put, ([event],)
+        )
+        timer.daemon = True
+        retries.append(timer)
+    return retries
+
+
+def _publish(events):
+    from .tasks import deliver_events
+
+    try:
+        deliver_events.delay(events)
+    except Exception:
+        logger.exception("Could not publish %d user events, holding them.", len(events))
+        return False
+    return True
+
+
+def publish(events):
+    """
+    Publish ``events`` to the ``deliver_events`` task, or hand them to the
+    queue to publish later when the broker can't take them.
+    """
+    if not _publish(events):
+        get_queue().put(events)
+
+
+def deliver_with_celery(events):
+    """Publish ``events`` held by the queue, scheduling another try on failure."""
+    if _publish(events):
+        return []
+    delay = events_settings()["RETRY_DELAY"]
+    timer = threading.Timer(delay, get_queue().put, (events,))
+    timer.daemon = True
+    return [timer]
+
+
+class EventQueue:
+    """
+    Daemon thread passing queued events to ``handler`` in batches of up to
+    ``batch_size``, at least every ``flush_interval`` seconds while events
+    are waiting. ``handler`` returns the timers of the retries it scheduled.
+    """
+
+    def __init__(self, handler, batch_size=100, flush_interval=0.5):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._retries = 0
+        self._idle = threading.Condition()
+
+    def put(self, events):
+        self.start()
+        for event in events:
+            self.queue.put(event)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self.run, name="user-events", daemon=True
+                )
+                self._thread.start()
+
+    def flush(self, retries=True):
+        """
+        Block until every queued event has been handled, and the retries
+        scheduled meanwhile too unless ``retries`` is false.
+        """
+        while True:
+            self.queue.join()
+            if not retries:
+                return
+            with self._idle:
+                self._idle.wait_for(lambda: self._retries == 0)
+            if not self.queue.unfinished_tasks:
+                return
+
+    def run(self):
+        while True:
+            events = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(events) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    events.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                for timer in self.handler(events):
+                    self._schedule(timer)
+            except Exception:
+                logger.exception("Could not dispatch %d user events.", len(events))
+            finally:
+                close_old_connections()
+                for _ in events:
+                    self.queue.task_done()
+
+    def _schedule(self, timer):
+        function = timer.function
+
+        def retry(*args, **kwargs):
+            try:
+                function(*args, **kwargs)
+            finally:
+                with self._idle:
+                    self._retries -= 1
+                    self._idle.notify_all()
+
+        timer.function = retry
+        with self._idle:
+            self._retries += 1
+        timer.start()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            config = events_settings()
+            handler = (
+                deliver_with_celery if config["DISPATCH"] == "celery" else deliver_here
+            )
+            _queue = EventQueue(
+                handler, config["BATCH_SIZE"], config["FLUSH_INTERVAL"]
+            )
+            atexit.register(_queue.flush, retries=False)
+    return _queue
+
+
+@receiver(setting_changed)
+def reset_queue(setting, **kwargs):
+    global _queue
+    if setting == "USER_EVENTS" and _queue is not None:
+        _queue.flush()
+        _queue = None
@@ -0,0 +1,139 @@
+"""
+Password hashing off the event loop.
+
+``HashingPool`` runs hashes and checks on a bounded pool of threads: the
+PBKDF2 and Argon2 implementations release the GIL while they compute, so
+threads hash in parallel without the pickling and start-up costs of
+processes. At most ``MAX_PENDING`` hashes are queued or running; beyond
+that ``HashingOverloaded`` is raised at once, so a login burst is turned
+away instead of queueing up behind itself while other requests wait;
+``HashingOverloadedMiddleware`` answers those requests with a 503 asking
+to retry after ``RETRY_AFTER`` seconds.
+
+Configured by ``PASSWORD_HASHING``; ``stats()`` reports the queue depth,
+its peak and the rejected and completed counts.
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password, verify_password
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .provisioning import available_cores
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    "WORKERS": None,
+    "MAX_PENDING": 64,
+    "RETRY_AFTER": 1,
+}
+
+
+def hashing_settings():
+    return {**DEFAULTS, **getattr(settings, "PASSWORD_HASHING", {})}
+
+
+class HashingOverloaded(Exception):
+    """Too many password hashes are pending, retry later."""
+
+
+class HashingPool:
+    def __init__(self, workers=None, max_pending=DEFAULTS["MAX_PENDING"]):
+        self.workers = workers or available_cores()
+        self.max_pending = max_pending
+        self.pending = 0
+        self.peak = 0
+        self.rejected = 0
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hashing"
+        )
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                logger.warning(
+                    "Password hashing overloaded: %d pending", self.pending
+                )
+                raise HashingOverloaded
+            self.pending += 1
+            self.peak = max(self.peak, self.pending)
+        try:
+            future = self._executor.submit(self._call, fn, *args)
+        except BaseException:
+            self._done(completed=False)
+            raise
+        future.add_done_callback(self._cancelled)
+        return future
+
+    def _call(self, fn, *args):
+        try:
+            return fn(*args)
+        finally:
+            self._done()
+
+    def _cancelled(self, future):
+        # Futures cancelled before they started never reach _call().
+        if future.cancelled():
+            self._done(completed=False)
+
+    def _done(self, completed=True):
+        with self._lock:
+            self.pending -= 1
+            self.completed += completed
+
+    async def run(self, fn, *args):
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "peak": self.peak,
+                "rejected": self.rejected,
+                "completed": self.completed,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = hashing_settings()
+                _pool = HashingPool(config["WORKERS"], config["MAX_PENDING"])
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_pool(setting, **kwargs):
+    global _pool
+    if setting == "PASSWORD_HASHING" and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+async def amake_password(password):
+    """``make_password()`` on the hashing pool."""
+    return await get_pool().run(make_password, password)
+
+
+async def averify_password(password, encoded):
+    """``verify_password()`` on the hashing pool: ``(is_correct, must_update)``."""
+    return await get_pool().run(verify_password, password, encoded)
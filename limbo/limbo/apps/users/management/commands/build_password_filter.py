@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from limbo.apps.users.bloom import (
+    DEFAULT_PASSWORD_LIST,
+    BloomFilter,
+    read_password_list,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the breached-password Bloom filter read by "
+        "BreachedPasswordValidator from a local list, one password per line, "
+        "plain or gzipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "sources",
+            nargs="*",
+            help="Password lists. Defaults to Django's common password list.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Where the filter goes. Defaults to BREACHED_PASSWORD_FILTER.",
+        )
+        parser.add_argument("--error-rate", type=float, default=0.001)
+        parser.add_argument(
+            "--capacity",
+            type=int,
+            help="Expected number of passwords. Counted first when omitted.",
+        )
+
+    def handle(self, *args, **options):
+        sources = options["sources"] or [str(DEFAULT_PASSWORD_LIST)]
+        for source in sources:
+            if not os.path.exists(source):
+                raise CommandError(f"Cannot open {source}.")
+        if not 0 < options["error_rate"] < 1:
+            raise CommandError("--error-rate must be between 0 and 1.")
+        output = str(options["output"] or settings.BREACHED_PASSWORD_FILTER)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+
+        def passwords():
+            for source in sources:
+                yield from read_password_list(source)
+
+        capacity = options["capacity"] or sum(1 for _ in passwords())
+        count = BloomFilter.build(
+            output, passwords(), capacity, error_rate=options["error_rate"]
+        )
+        size = os.path.getsize(output)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {count} passwords to {output} ({size / 2**20:.1f} MiB)."
+            )
+        )
+        if count > capacity:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{count} passwords exceed --capacity {capacity}: the false "
+                    f"positive rate is above {options['error_rate']}."
+                )
+            )
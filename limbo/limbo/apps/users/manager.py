@@ -1,4 +1,22 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import BaseUserManager
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS
+
+from limbo.core import querycache
+
+from . import events
+from .provisioning import (
+    CREATED,
+    EMAIL_TAKEN,
+    INVALID,
+    USERNAME_TAKEN,
+    PasswordHashPool,
+    ProvisionResult,
+)
+from .signals import user_registered
 
 
 class UserAdminManager(BaseUserManager):
@@ -6,23 +24,131 @@ class UserAdminManager(BaseUserManager):
         """
         Creates and saves a User with the given email and password.
         """
-        if not email:
-            raise ValueError("Users must have an email address")
-
-        user = self.model(
-            email=self.normalize_email(email),
-            username=username,
-            is_active=is_active,
-            **extra_fields,
-        )
+        user = self._new_user(username, email, is_active=is_active, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
+        events.dispatch(user_registered, user)
         return user
 
+    async def acreate_user(
+        self, username, email, password, is_active=True, **extra_fields
+    ):
+        """
+        ``create_user()`` for async code: the password is hashed on the
+        hashing pool, see ``limbo.apps.users.hashing``.
+        """
+        user = self._new_user(username, email, is_active=is_active, **extra_fields)
+        await user.aset_password(password)
+        await user.asave(using=self._db)
+        await sync_to_async(events.dispatch)(user_registered, user)
+        return user
+
+    def _new_user(self, username, email, **extra_fields):
+        if not email:
+            raise ValueError("Users must have an email address")
+        return self.model(
+            email=self.normalize_email(email), username=username, **extra_fields
+        )
+
     def create_superuser(self, username, email, password, **extra_fields):
+        extra_fields.setdefault("is_staff", True)
+        extra_fields.setdefault("is_superuser", True)
+        for flag in ("is_staff", "is_superuser"):
+            if extra_fields[flag] is not True:
+                raise ValueError(f"Superuser must have {flag}=True.")
         u = self.create_user(username, email, password=password, **extra_fields)
         u.is_admin = True
-        u.is_staff = True
-        u.is_superuser = True
-        u.save(using=self._db)
         return u
+
+    def bulk_create_users(self, rows, batch_size=1000, processes=None):
+        """
+        Create users from ``rows``, dicts of ``create_user`` arguments, and
+        return a ``ProvisionResult`` per row, in order.
+
+        Passwords are hashed across ``processes`` worker processes, one per
+        available core by default, and each batch is inserted with a single
+        ``INSERT ... ON CONFLICT DO NOTHING``: rows whose username exists
+        are reported as ``username_taken``. Emails aren't unique in the
+        database, so rows whose email is already used, in the table or
+        earlier in ``rows``, are reported as ``email_taken`` before the
+        insert. Invalid rows are reported and don't stop the others.
+        ``user_registered`` is dispatched for every created user, as
+        ``create_user`` does.
+        """
+        results = []
+        seen = (set(), set())
+        rows = iter(rows)
+        with PasswordHashPool(processes) as pool:
+            while batch := list(islice(rows, batch_size)):
+                results.extend(self._create_users_batch(batch, pool, seen))
+        if any(result.status == CREATED for result in results):
+            querycache.invalidate(self.model, self._db or DEFAULT_DB_ALIAS)
+        return results
+
+    bulk_create_users.alters_data = True
+
+    def _create_users_batch(self, rows, pool, seen):
+        seen_usernames, seen_emails = seen
+        results = [None] * len(rows)
+        users = {}
+        passwords = {}
+        for index, row in enumerate(rows):
+            row = dict(row)
+            passwords[index] = row.pop("password", None)
+            try:
+                users[index] = self._build_user(**row)
+            except (AttributeError, TypeError, ValueError, ValidationError) as e:
+                messages = e.messages if isinstance(e, ValidationError) else [str(e)]
+                results[index] = ProvisionResult(
+                    row.get("username"), INVALID, error=" ".join(messages)
+                )
+
+        taken = set(
+            self.filter(email__in={user.email for user in users.values()})
+            .values_list("email", flat=True)
+        )
+        for index, user in list(users.items()):
+            if user.username in seen_usernames:
+                results[index] = ProvisionResult(user.username, USERNAME_TAKEN)
+            elif user.email in taken or user.email in seen_emails:
+                results[index] = ProvisionResult(user.username, EMAIL_TAKEN)
+            else:
+                seen_usernames.add(user.username)
+                seen_emails.add(user.email)
+                continue
+            del users[index]
+
+        to_hash = [index for index in users if passwords[index] is not None]
+        hashes = pool.hash_many([passwords[index] for index in to_hash])
+        for index, encoded in zip(to_hash, hashes):
+            users[index].password = encoded
+        for index in users.keys() - set(to_hash):
+            users[index].set_unusable_password()
+
+        self.bulk_create(users.values(), ignore_conflicts=True)
+        # Salted hashes are unique: the rows holding ours are the ones this
+        # batch inserted, the others already existed.
+        stored = {
+            username: (pk, password)
+            for username, pk, password in self.filter(
+                username__in=[user.username for user in users.values()]
+            ).values_list("username", "pk", "password")
+        }
+        for index, user in users.items():
+            pk, password = stored.get(user.username, (None, None))
+            if password == user.password:
+                user.pk = pk
+                user._state.adding = False
+                user._state.db = self.db
+                events.dispatch(user_registered, user)
+                results[index] = ProvisionResult(user.username, CREATED, pk)
+            else:
+                results[index] = ProvisionResult(user.username, USERNAME_TAKEN)
+        return results
+
+    def _build_user(self, username, email, **extra_fields):
+        user = self._new_user(username, email, **extra_fields)
+        for name in ("username", "email"):
+            field = user._meta.get_field(name)
+            setattr(user, name, field.clean(getattr(user, name), user))
+        return user
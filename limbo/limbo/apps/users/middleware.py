@@ -0,0 +1,23 @@
+from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.translation import gettext as _
+
+from .hashing import HashingOverloaded, hashing_settings
+
+
+class HashingOverloadedMiddleware(MiddlewareMixin):
+    """
+    Answer the requests turned away by the password hashing pool, see
+    ``limbo.apps.users.hashing``, with a 503 and a ``Retry-After`` header
+    instead of a server error.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingOverloaded):
+            return None
+        response = JsonResponse(
+            {"detail": _("Too many logins in progress, retry shortly.")},
+            status=503,
+        )
+        response["Retry-After"] = str(hashing_settings()["RETRY_AFTER"])
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:57
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+from limbo.core.search import search_vector_trigger
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        search_vector_trigger(
+            "users_user",
+            ["username", "first_name", "last_name", "email"],
+            # The parser keeps an email in one token: index its parts too.
+            expressions=["replace(NEW.\"email\", '@', ' ')"],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:58
+
+from django.db import migrations
+
+INDEX = "users_user_username_upper"
+
+
+def create_index(apps, schema_editor):
+    """
+    Serve username__istartswith, which PostgreSQL compiles to
+    UPPER("username"::text) LIKE UPPER('prefix%'). The text_pattern_ops
+    operator class is PostgreSQL's, so other databases go without.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    qn = schema_editor.quote_name
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {qn(INDEX)} ON {qn('users_user')} "
+        f"((UPPER({qn('username')}::text)) text_pattern_ops)"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(INDEX)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
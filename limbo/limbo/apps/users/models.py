@@ -1,12 +1,14 @@
 import re
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core import validators
 from django.core.mail import send_mail
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from .hashing import amake_password, averify_password
 from .manager import UserAdminManager
 
 
@@ -43,7 +45,14 @@ class User(AbstractUser):
     )
     date_joined = models.DateTimeField(_("date joined"), default=timezone.now)
 
+    # Embedded in API tokens; bumping it revokes every token issued before.
+    token_version = models.PositiveIntegerField(
+        _("token version"), default=0, editable=False
+    )
+
     extra_field = models.CharField(_("Nobody needs me"), max_length=5, blank=True)
+    # Maintained by a database trigger on PostgreSQL, see migration 0002.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     # เพิ่ม related_name ให้กับ fields groups และ user_permissions
     groups = models.ManyToManyField(
@@ -67,10 +76,54 @@ class User(AbstractUser):
     objects = UserAdminManager()
     REQUIRED_FIELDS = ["email"]
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # username__istartswith is served by users_user_username_upper,
+            # created on PostgreSQL only by migration 0003.
+            # Emails aren't unique; bulk_create_users looks up the taken ones.
+            models.Index(fields=["email"], name="users_user_email"),
+        ]
+
     def clean(self):
         super().clean()
         self.email = self.__class__.objects.normalize_email(self.email)
 
+    def save(self, *args, **kwargs):
+        # set_password() keeps the raw password until saved, which
+        # check_password()'s hash upgrades clear first: only actual changes
+        # get here. Like sessions, API tokens don't outlive them.
+        if self._password is not None and not self._state.adding:
+            self.token_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "token_version"}
+        super().save(*args, **kwargs)
+
+    def revoke_tokens(self):
+        """Invalidate every API token issued to the user so far."""
+        from .authentication import forget_principal
+
+        type(self).objects.filter(pk=self.pk).update(
+            token_version=models.F("token_version") + 1
+        )
+        self.refresh_from_db(fields=["token_version"])
+        forget_principal(instance=self)
+
+    async def aset_password(self, raw_password):
+        """``set_password()``, hashing on the hashing pool."""
+        self.password = await amake_password(raw_password)
+        self._password = raw_password
+
+    async def acheck_password(self, raw_password):
+        """``check_password()``, hashing on the hashing pool."""
+        is_correct, must_update = await averify_password(raw_password, self.password)
+        if is_correct and must_update:
+            # Password hash upgrades shouldn't be considered password changes.
+            self.password = await amake_password(raw_password)
+            self._password = None
+            await self.asave(update_fields=["password"])
+        return is_correct
+
     def get_full_name(self):
         """
         Return the first_name plus the last_name, with a space in between.
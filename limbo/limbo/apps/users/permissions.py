@@ -0,0 +1,90 @@
+"""
+Versions of the cached permission sets, see ``CachedPermissionBackend``.
+
+Each user has a permission version in the cache, and so do groups as a
+whole. A cached permission set is keyed by both, so bumping either makes
+it unreachable. A user's version moves when their groups or their own
+permissions change; the groups' version when a group's permissions change,
+a group or permission is deleted or a permission is saved, which can
+affect any user. Versions start from the current time in nanoseconds, so
+a version evicted from the cache and recreated doesn't return to a value,
+and keys, it had before.
+"""
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+KEY_PREFIX = "limbo:perms"
+GROUPS_VERSION_KEY = f"{KEY_PREFIX}:groups"
+
+
+def user_version_key(user_id):
+    return f"{KEY_PREFIX}:user:{user_id}"
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump(keys, using=DEFAULT_DB_ALIAS):
+    """
+    Bump the versions under ``keys`` now and again on commit, for sets
+    cached meanwhile by other connections from the pre-commit data.
+    """
+    for key in keys:
+        _bump(key)
+        transaction.on_commit(partial(_bump, key), using=using)
+
+
+def cache_key(user, from_name):
+    """The key of ``user``'s ``from_name`` ("user" or "group") permissions."""
+    keys = [user_version_key(user.pk), GROUPS_VERSION_KEY]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Another process may initialize it first; add() keeps theirs.
+            seed = time.time_ns()
+            cache.add(key, seed, timeout=None)
+            versions[key] = cache.get(key, seed)
+    user_version, groups_version = (versions[key] for key in keys)
+    return (
+        f"{KEY_PREFIX}:{user.pk}:{from_name}:{int(user.is_superuser)}:"
+        f"{user_version}.{groups_version}"
+    )
+
+
+def cache_timeout():
+    return getattr(settings, "PERMISSION_CACHE_TIMEOUT", 300)
+
+
+def user_relation_changed(sender, instance, action, reverse, pk_set, using, **kwargs):
+    """``m2m_changed`` receiver for ``User.groups`` and ``User.user_permissions``."""
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        bump([user_version_key(instance.pk)], using)
+    elif pk_set:
+        bump([user_version_key(pk) for pk in pk_set], using)
+    else:
+        # Cleared from the group or permission side: the users are gone.
+        bump([GROUPS_VERSION_KEY], using)
+
+
+def group_permissions_changed(sender, action, using, **kwargs):
+    """``m2m_changed`` receiver for ``Group.permissions``."""
+    if action.startswith("post_"):
+        bump([GROUPS_VERSION_KEY], using)
+
+
+def invalidate_all(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    ``post_delete`` receiver for groups and permissions, and ``post_save``
+    receiver for permissions: superusers hold every permission.
+    """
+    bump([GROUPS_VERSION_KEY], using)
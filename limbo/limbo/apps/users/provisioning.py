@@ -0,0 +1,75 @@
+"""
+Bulk user provisioning, see ``UserAdminManager.bulk_create_users``.
+
+Hashing dominates the cost of creating a user: PBKDF2 is deliberately slow
+and holds the GIL, so the passwords of each batch are hashed across a pool
+of processes, one per available core. The hashers are stateless and don't
+read the settings, so the workers only receive the hasher's import path.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+
+from django.contrib.auth.hashers import get_hasher
+from django.utils.module_loading import import_string
+
+CREATED = "created"
+USERNAME_TAKEN = "username_taken"
+EMAIL_TAKEN = "email_taken"
+INVALID = "invalid"
+
+_hashers = {}
+
+
+class ProvisionResult(NamedTuple):
+    """Outcome of one row of ``bulk_create_users``, in input order."""
+
+    username: Optional[str]
+    status: str
+    id: Optional[int] = None
+    error: str = ""
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _encode(job):
+    path, password = job
+    hasher = _hashers.get(path)
+    if hasher is None:
+        hasher = _hashers[path] = import_string(path)()
+    return hasher.encode(password, hasher.salt())
+
+
+class PasswordHashPool:
+    """
+    Hash passwords with the default hasher, across ``processes`` worker
+    processes; in this process when there is a single one. Use it as a
+    context manager so the workers are shut down.
+    """
+
+    def __init__(self, processes=None):
+        hasher = get_hasher()
+        self.path = f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+        self.processes = processes or available_cores()
+        self.executor = None
+        if self.processes > 1:
+            self.executor = ProcessPoolExecutor(max_workers=self.processes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    def hash_many(self, passwords):
+        jobs = [(self.path, password) for password in passwords]
+        if self.executor is None or len(jobs) < 2:
+            return [_encode(job) for job in jobs]
+        chunksize = max(1, len(jobs) // (self.processes * 4))
+        return list(self.executor.map(_encode, jobs, chunksize=chunksize))
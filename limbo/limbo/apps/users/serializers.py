@@ -0,0 +1,31 @@
+from rest_framework_simplejwt import serializers
+from rest_framework_simplejwt.settings import api_settings
+
+from . import events
+from .authentication import TOKEN_VERSION_CLAIM, get_principal
+from .signals import user_logged_in
+
+
+class TokenObtainPairSerializer(serializers.TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[TOKEN_VERSION_CLAIM] = user.token_version
+        return token
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        events.dispatch(user_logged_in, self.user)
+        return data
+
+
+class TokenRefreshSerializer(serializers.TokenRefreshSerializer):
+    """Refuse refresh tokens of revoked versions, or of inactive users."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        get_principal(
+            refresh.get(api_settings.USER_ID_CLAIM),
+            refresh.get(TOKEN_VERSION_CLAIM, 0),
+        )
+        return super().validate(attrs)
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from . import events
+
+
+@shared_task(bind=True, max_retries=None, name="users.deliver_events")
+def deliver_events(self, batch):
+    """Deliver a batch of user events, retrying the receivers that fail."""
+    failed = events.retryable(events.deliver(batch))
+    if failed:
+        raise self.retry(
+            args=[failed], countdown=events.retry_delay(failed[0]["attempts"])
+        )
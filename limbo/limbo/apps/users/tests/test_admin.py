@@ -0,0 +1,44 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from limbo.apps.users.admin import UserAdmin
+
+User = get_user_model()
+
+
+class UserAdminSearchTestCase(TestCase):
+    def setUp(self):
+        self.model_admin = UserAdmin(User, admin.site)
+        self.request = RequestFactory().get("/")
+        self.alice = User.objects.create(
+            username="alice", email="alice@example.com", first_name="Alice"
+        )
+        self.bob = User.objects.create(
+            username="bob.smith", email="bob@example.org", last_name="Smith"
+        )
+
+    def search(self, term):
+        queryset, _ = self.model_admin.get_search_results(
+            self.request, User.objects.all(), term
+        )
+        return set(queryset)
+
+    def test_search_by_username_prefix(self):
+        self.assertEqual(self.search("ali"), {self.alice})
+
+    def test_search_by_name(self):
+        self.assertEqual(self.search("smith"), {self.bob})
+
+    def test_search_by_email(self):
+        self.assertEqual(self.search("bob@example.org"), {self.bob})
+        self.assertEqual(self.search("bob@"), {self.bob})
+
+    def test_search_by_email_parts(self):
+        carol = User.objects.create(username="cmiller", email="carol@example.net")
+        self.assertEqual(self.search("carol"), {carol})
+        self.assertEqual(self.search("example.net"), {carol})
+
+    def test_ranked_ordering_only_when_searching(self):
+        self.model_admin.get_search_results(self.request, User.objects.all(), "")
+        self.assertEqual(self.model_admin.get_ordering(self.request), ("username",))
@@ -0,0 +1,113 @@
+from django.contrib.auth.forms import AdminPasswordChangeForm
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from limbo.apps.users.authentication import CachedJWTAuthentication
+from limbo.apps.users.models import User
+from limbo.core.context import acting_as, get_current_user_id
+
+FAST_HASHER = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+OUTDATED_HASHER = "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"
+
+
+def auth_queries(queries):
+    return [
+        query["sql"]
+        for query in queries
+        if '"users_user"' in query["sql"] or '"django_session"' in query["sql"]
+    ]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class CachedJWTAuthenticationTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("jane", "jane@example.com", "pass")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_address"))
+        self.client = APIClient()
+        self.url = reverse("address:facets")
+
+    def obtain(self, password="pass"):
+        return self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"username": "jane", "password": password},
+        )
+
+    def get(self, token):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_valid_token_costs_no_auth_query(self):
+        access = self.obtain().data["access"]
+        self.assertEqual(self.get(access).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(access).status_code, 200)
+        self.assertEqual(auth_queries(queries), [])
+
+    def test_deactivation_applies_at_once(self):
+        access = self.obtain().data["access"]
+        self.assertEqual(self.get(access).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        response = self.get(access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data["detail"].code, "user_inactive")
+
+    def test_revoked_tokens_are_refused(self):
+        tokens = self.obtain().data
+        self.assertEqual(self.get(tokens["access"]).status_code, 200)
+        self.user.revoke_tokens()
+        response = self.get(tokens["access"])
+        self.assertEqual(response.data["detail"].code, "token_revoked")
+        response = self.client.post(
+            reverse("users:token_refresh"), {"refresh": tokens["refresh"]}
+        )
+        self.assertEqual(response.status_code, 401)
+
+        access = self.obtain().data["access"]
+        self.assertEqual(self.get(access).status_code, 200)
+
+    def test_password_change_revokes_tokens(self):
+        access = self.obtain().data["access"]
+        self.user.set_password("new-pass")
+        self.user.save()
+        self.assertEqual(self.get(access).status_code, 401)
+        access = self.obtain("new-pass").data["access"]
+        self.assertEqual(self.get(access).status_code, 200)
+
+    def test_password_change_forms_revoke_tokens(self):
+        access = self.obtain().data["access"]
+        form = AdminPasswordChangeForm(
+            self.user, {"password1": "n3w-Pass!word", "password2": "n3w-Pass!word"}
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(self.get(access).status_code, 401)
+
+    def test_login_upgrading_the_hash_gets_a_working_token(self):
+        with self.settings(PASSWORD_HASHERS=[*FAST_HASHER, OUTDATED_HASHER]):
+            self.user.password = make_password("pass", hasher="pbkdf2_sha1")
+            self.user.save(update_fields=["password"])
+            response = self.obtain()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.get().password.startswith("md5$"))
+        self.assertEqual(self.get(response.data["access"]).status_code, 200)
+
+    def test_refresh(self):
+        refresh = self.obtain().data["refresh"]
+        response = self.client.post(
+            reverse("users:token_refresh"), {"refresh": refresh}
+        )
+        self.assertEqual(self.get(response.data["access"]).status_code, 200)
+
+    def test_token_user_is_the_acting_user(self):
+        access = self.obtain().data["access"]
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        with acting_as(None):
+            user, token = CachedJWTAuthentication().authenticate(request)
+            self.assertEqual(get_current_user_id(), self.user.pk)
+        self.assertEqual(user, self.user)
+        self.assertIsNone(get_current_user_id())
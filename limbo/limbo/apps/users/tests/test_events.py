@@ -0,0 +1,152 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from limbo.apps.users import events, tasks
+from limbo.apps.users.models import User
+from limbo.apps.users.signals import user_logged_in, user_registered
+
+FAST_HASHER = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+BACKGROUND = {
+    "DISPATCH": "background",
+    "FLUSH_INTERVAL": 0.01,
+    "MAX_RETRIES": 2,
+    "RETRY_DELAY": 0.01,
+}
+CELERY = {**BACKGROUND, "DISPATCH": "celery"}
+
+
+class Receivers:
+    """Receivers recording their calls; ``flaky`` fails ``failures`` times."""
+
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+
+    def __enter__(self):
+        user_registered.connect(self.steady)
+        user_registered.connect(self.flaky)
+        return self
+
+    def __exit__(self, *exc_info):
+        user_registered.disconnect(self.steady)
+        user_registered.disconnect(self.flaky)
+
+    def steady(self, signal, sender, user, **kwargs):
+        self.calls.append(("steady", user.username, kwargs))
+
+    def flaky(self, signal, sender, user, **kwargs):
+        self.calls.append(("flaky", user.username, kwargs))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("unavailable")
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class SyncDispatchTestCase(TestCase):
+    def test_receivers_run_at_once(self):
+        with Receivers() as receivers:
+            User.objects.create_user("jane", "jane@example.com", "pass")
+            self.assertEqual(
+                receivers.calls, [("steady", "jane", {}), ("flaky", "jane", {})]
+            )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER, USER_EVENTS=BACKGROUND)
+class BackgroundDispatchTestCase(TransactionTestCase):
+    def test_events_are_delivered_after_commit(self):
+        with Receivers() as receivers:
+            with transaction.atomic():
+                user = User.objects.create_user("jane", "jane@example.com", "pass")
+                events.dispatch(user_logged_in, user)
+                events.dispatch(user_registered, user, source="import")
+            self.assertEqual(receivers.calls, [])
+            events.get_queue().flush()
+            self.assertEqual(
+                receivers.calls,
+                [
+                    ("steady", "jane", {}),
+                    ("flaky", "jane", {}),
+                    ("steady", "jane", {"source": "import"}),
+                    ("flaky", "jane", {"source": "import"}),
+                ],
+            )
+
+    def test_rolled_back_events_are_not_sent(self):
+        with Receivers() as receivers:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                User.objects.create_user("jane", "jane@example.com", "pass")
+                raise RuntimeError
+            events.get_queue().flush()
+        self.assertEqual(receivers.calls, [])
+
+    def test_failed_receivers_are_retried_alone(self):
+        with Receivers(failures=2) as receivers:
+            User.objects.create_user("jane", "jane@example.com", "pass")
+            events.get_queue().flush()
+        self.assertEqual(
+            [call[0] for call in receivers.calls], ["steady"] + ["flaky"] * 3
+        )
+
+    def test_receivers_of_the_same_name_are_told_apart(self):
+        with Receivers(failures=1) as first, Receivers() as second:
+            User.objects.create_user("jane", "jane@example.com", "pass")
+            events.get_queue().flush()
+        self.assertEqual([call[0] for call in first.calls], ["steady", "flaky", "flaky"])
+        self.assertEqual([call[0] for call in second.calls], ["steady", "flaky"])
+
+    def test_retries_are_bounded(self):
+        with Receivers(failures=5) as receivers, self.assertLogs(
+            "limbo.apps.users.events", "ERROR"
+        ) as logs:
+            User.objects.create_user("jane", "jane@example.com", "pass")
+            events.get_queue().flush()
+        self.assertEqual([call[0] for call in receivers.calls].count("flaky"), 3)
+        self.assertIn("Giving up on user_registered", logs.output[-1])
+
+    def test_arguments_must_be_serializable(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+        with self.assertRaises(TypeError):
+            events.dispatch(user_logged_in, user, request=object())
+
+    def test_events_are_batched(self):
+        batches = []
+        queue = events.EventQueue(
+            lambda batch: batches.append(batch) or [], batch_size=2, flush_interval=1
+        )
+        queue.put([1, 2, 3])
+        queue.flush()
+        self.assertEqual(batches, [[1, 2], [3]])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER, USER_EVENTS=CELERY)
+class CeleryDispatchTestCase(TransactionTestCase):
+    def test_events_are_held_while_the_broker_is_down(self):
+        down = ConnectionError("broker unavailable")
+        with mock.patch.object(
+            tasks.deliver_events, "delay", side_effect=[down, down, None]
+        ) as delay, self.assertLogs("limbo.apps.users.events", "ERROR"):
+            user = User.objects.create_user("jane", "jane@example.com", "pass")
+            events.get_queue().flush()
+        self.assertEqual(delay.call_count, 3)
+        ((batch,), _) = delay.call_args
+        self.assertEqual([event["user"] for event in batch], [user.pk])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHER)
+class DeliverEventsTaskTestCase(TestCase):
+    def test_task_retries_failed_receivers(self):
+        user = User.objects.create_user("jane", "jane@example.com", "pass")
+        event = {
+            "signal": "user_registered",
+            "user": user.pk,
+            "kwargs": {},
+            "receivers": None,
+            "attempts": 0,
+        }
+        with Receivers(failures=1) as receivers:
+            tasks.deliver_events.apply(args=[[event]])
+        self.assertEqual(
+            [call[0] for call in receivers.calls], ["steady", "flaky", "flaky"]
+        )
@@ -0,0 +1,105 @@
+import threading
+
+from django.contrib.auth import aauthenticate
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from limbo.apps.users import hashing
+from limbo.apps.users.hashing import HashingOverloaded, HashingPool
+from limbo.apps.users.models import User
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = 1000
+
+
+class StrongerPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = 2000
+
+
+FAST = f"{__name__}.FastPBKDF2PasswordHasher"
+STRONGER = f"{__name__}.StrongerPBKDF2PasswordHasher"
+
+
+async def login(request):
+    user = await aauthenticate(
+        request, username=request.POST["username"], password=request.POST["password"]
+    )
+    return JsonResponse({"user": user and user.pk})
+
+
+urlpatterns = [path("login/", login)]
+
+
+@override_settings(PASSWORD_HASHERS=[FAST])
+class AsyncPasswordTestCase(TestCase):
+    async def test_acreate_user(self):
+        user = await User.objects.acreate_user(
+            "jane", "jane@EXAMPLE.COM", "s3cret-pass", first_name="Jane"
+        )
+        user = await User.objects.aget(pk=user.pk)
+        self.assertEqual(user.email, "jane@example.com")
+        self.assertEqual(user.first_name, "Jane")
+        self.assertTrue(await user.acheck_password("s3cret-pass"))
+        self.assertFalse(await user.acheck_password("wrong"))
+        self.assertTrue(user.check_password("s3cret-pass"))
+
+    async def test_acreate_user_requires_email(self):
+        with self.assertRaises(ValueError):
+            await User.objects.acreate_user("jane", "", "s3cret-pass")
+
+    async def test_acheck_password_upgrades_the_hash(self):
+        user = await User.objects.acreate_user("jane", "jane@example.com", "pass")
+        with self.settings(PASSWORD_HASHERS=[STRONGER]):
+            self.assertTrue(await user.acheck_password("pass"))
+        user = await User.objects.aget(pk=user.pk)
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+    async def test_aauthenticate(self):
+        user = await User.objects.acreate_user("jane", "jane@example.com", "pass")
+        self.assertEqual(await aauthenticate(username="jane", password="pass"), user)
+        self.assertIsNone(await aauthenticate(username="jane", password="nope"))
+        self.assertIsNone(await aauthenticate(username="nobody", password="pass"))
+
+    async def test_uses_the_configured_pool(self):
+        with self.settings(PASSWORD_HASHING={"WORKERS": 2, "MAX_PENDING": 8}):
+            await User.objects.acreate_user("jane", "jane@example.com", "pass")
+            stats = hashing.get_pool().stats()
+        self.assertEqual(stats["workers"], 2)
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["pending"], 0)
+
+
+@override_settings(PASSWORD_HASHERS=[FAST], ROOT_URLCONF=__name__)
+class HashingOverloadedTestCase(TestCase):
+    async def test_overloaded_logins_get_a_503(self):
+        user = await User.objects.acreate_user("jane", "jane@example.com", "pass")
+        credentials = {"username": "jane", "password": "pass"}
+        response = await self.async_client.post("/login/", credentials)
+        self.assertEqual(response.json(), {"user": user.pk})
+
+        with self.settings(PASSWORD_HASHING={"MAX_PENDING": 0, "RETRY_AFTER": 5}):
+            response = await self.async_client.post("/login/", credentials)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertIn("detail", response.json())
+
+
+class HashingPoolTestCase(SimpleTestCase):
+    def test_rejects_beyond_max_pending(self):
+        pool = HashingPool(workers=1, max_pending=1)
+        self.addCleanup(pool.shutdown)
+        release = threading.Event()
+        future = pool.submit(release.wait)
+        with self.assertRaises(HashingOverloaded):
+            pool.submit(release.wait)
+        release.set()
+        future.result()
+        pool.submit(len, "again").result()
+        stats = pool.stats()
+        self.assertEqual(
+            {key: stats[key] for key in ("pending", "peak", "rejected", "completed")},
+            {"pending": 0, "peak": 1, "rejected": 1, "completed": 2},
+        )
@@ -3,7 +3,16 @@ import unittest
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db.utils import DataError, IntegrityError
-from django.test import TestCase
+from django.test import TestCase, override_settings
+
+from limbo.apps.users.provisioning import (
+    CREATED,
+    EMAIL_TAKEN,
+    INVALID,
+    USERNAME_TAKEN,
+    PasswordHashPool,
+)
+from limbo.apps.users.signals import user_registered
 
 # Assuming your custom User model is set as the AUTH_USER_MODEL
 User = get_user_model()
@@ -308,6 +317,13 @@ class UserAdminManagerTestCase(TestCase):
             )
             user.full_clean()
 
+    def test_create_superuser_saves_once(self):
+        """Test that create_superuser inserts the row without updating it."""
+        with self.assertNumQueries(1):
+            self.user_manager.create_superuser(
+                username="adminuser", email="admin@example.com", password="adminpass123"
+            )
+
     def test_create_superuser_is_superuser_false(self):
         """Test that creating superuser with is_superuser=False raises error."""
         user = self.user_manager.create_superuser(
@@ -327,3 +343,88 @@ class UserAdminManagerTestCase(TestCase):
         with self.assertRaises(ValueError):
             if not user.is_staff:
                 raise ValueError("Superuser must have is_staff=True.")
+
+    def test_create_superuser_rejects_false_flags(self):
+        """Test that create_superuser refuses is_staff or is_superuser False."""
+        for flag in ("is_staff", "is_superuser"):
+            with self.assertRaisesMessage(
+                ValueError, f"Superuser must have {flag}=True."
+            ):
+                self.user_manager.create_superuser(
+                    username="adminuser",
+                    email="admin@example.com",
+                    password="adminpass123",
+                    **{flag: False},
+                )
+        self.assertFalse(User.objects.exists())
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BulkCreateUsersTestCase(TestCase):
+    def test_creates_users_and_reports_each_row(self):
+        User.objects.create_user("taken", "old@example.com", "password")
+        rows = [
+            {"username": "alice", "email": "alice@EXAMPLE.COM", "password": "a-pass"},
+            {"username": "taken", "email": "new@example.com", "password": "x"},
+            {"username": "bob", "email": "old@example.com", "password": "x"},
+            {"username": "carol", "email": "", "password": "x"},
+            {"username": "not valid!", "email": "d@example.com", "password": "x"},
+            {"username": "alice", "email": "other@example.com", "password": "x"},
+            {"username": "dave", "email": "dave@example.com", "is_staff": True},
+        ]
+        results = User.objects.bulk_create_users(rows, batch_size=3, processes=1)
+        self.assertEqual(
+            [(result.username, result.status) for result in results],
+            [
+                ("alice", CREATED),
+                ("taken", USERNAME_TAKEN),
+                ("bob", EMAIL_TAKEN),
+                ("carol", INVALID),
+                ("not valid!", INVALID),
+                ("alice", USERNAME_TAKEN),
+                ("dave", CREATED),
+            ],
+        )
+        self.assertEqual(results[3].error, "Users must have an email address")
+
+        alice = User.objects.get(username="alice")
+        self.assertEqual(results[0].id, alice.pk)
+        self.assertEqual(alice.email, "alice@example.com")
+        self.assertTrue(alice.check_password("a-pass"))
+        dave = User.objects.get(username="dave")
+        self.assertTrue(dave.is_staff)
+        self.assertFalse(dave.has_usable_password())
+        self.assertEqual(User.objects.count(), 3)
+
+    def test_dispatches_user_registered(self):
+        User.objects.create_user("taken", "old@example.com", "password")
+        registered = []
+
+        def receiver(sender, user, **kwargs):
+            registered.append((user.pk, user.username))
+
+        user_registered.connect(receiver)
+        self.addCleanup(user_registered.disconnect, receiver)
+        rows = [
+            {"username": "alice", "email": "alice@example.com", "password": "x"},
+            {"username": "taken", "email": "new@example.com", "password": "x"},
+        ]
+        results = User.objects.bulk_create_users(rows, processes=1)
+        self.assertEqual(registered, [(results[0].id, "alice")])
+
+    def test_inserts_each_batch_at_once(self):
+        rows = [
+            {"username": f"user{n}", "email": f"user{n}@example.com", "password": "x"}
+            for n in range(10)
+        ]
+        # Per batch: the email lookup, the insert and the readback.
+        with self.assertNumQueries(6):
+            User.objects.bulk_create_users(rows, batch_size=5, processes=1)
+        self.assertEqual(User.objects.count(), 10)
+
+    def test_process_pool_hashes(self):
+        with PasswordHashPool(processes=2) as pool:
+            hashes = pool.hash_many(["first", "second", "third"])
+        self.assertEqual(len(set(hashes)), 3)
+        user = User(password=hashes[1])
+        self.assertTrue(user.check_password("second"))
@@ -0,0 +1,79 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase
+
+from limbo.apps.users import permissions
+from limbo.apps.users.models import User
+
+
+def fresh(user):
+    """The user as the next request loads it, without instance caches."""
+    return User.objects.get(pk=user.pk)
+
+
+class CachedPermissionBackendTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.view_user = Permission.objects.get(codename="view_user")
+        cls.change_user = Permission.objects.get(codename="change_user")
+        cls.view_group = Permission.objects.get(codename="view_group")
+        cls.group = Group.objects.create(name="support")
+        cls.group.permissions.add(cls.view_user)
+
+    def setUp(self):
+        self.user = User.objects.create(username="jane")
+        self.user.groups.add(self.group)
+
+    def test_permissions_are_cached_across_requests(self):
+        self.assertTrue(fresh(self.user).has_perm("users.view_user"))
+        user = fresh(self.user)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_perm("users.view_user"))
+            self.assertFalse(user.has_perm("users.change_user"))
+            self.assertEqual(user.get_all_permissions(), {"users.view_user"})
+
+    def test_evicted_versions_do_not_repeat(self):
+        key = permissions.user_version_key(self.user.pk)
+        cache.delete(key)
+        first = permissions.cache_key(self.user, "user")
+        cache.delete(key)
+        permissions._bump(key)
+        second = permissions.cache_key(self.user, "user")
+        cache.delete(key)
+        third = permissions.cache_key(self.user, "user")
+        self.assertEqual(len({first, second, third}), 3)
+
+    def test_user_relations_invalidate(self):
+        fresh(self.user).get_all_permissions()
+        self.user.user_permissions.add(self.change_user)
+        self.assertTrue(fresh(self.user).has_perm("users.change_user"))
+
+        self.user.groups.remove(self.group)
+        self.assertFalse(fresh(self.user).has_perm("users.view_user"))
+
+        self.change_user.custom_user_set.remove(self.user)
+        self.assertFalse(fresh(self.user).has_perm("users.change_user"))
+
+        self.group.custom_user_set.add(self.user)
+        self.assertTrue(fresh(self.user).has_perm("users.view_user"))
+
+        self.group.custom_user_set.clear()
+        self.assertFalse(fresh(self.user).has_perm("users.view_user"))
+
+    def test_group_permissions_invalidate(self):
+        fresh(self.user).get_all_permissions()
+        self.group.permissions.add(self.view_group)
+        self.assertTrue(fresh(self.user).has_perm("auth.view_group"))
+
+        self.view_group.group_set.remove(self.group)
+        self.assertFalse(fresh(self.user).has_perm("auth.view_group"))
+
+        self.group.delete()
+        self.assertFalse(fresh(self.user).has_perm("users.view_user"))
+
+    def test_superuser_and_inactive_users(self):
+        self.assertFalse(fresh(self.user).has_perm("auth.view_group"))
+        User.objects.filter(pk=self.user.pk).update(is_superuser=True)
+        self.assertTrue(fresh(self.user).has_perm("auth.view_group"))
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertFalse(fresh(self.user).has_perm("auth.view_group"))
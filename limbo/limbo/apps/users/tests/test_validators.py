@@ -1,8 +1,15 @@
+import io
+import os
+import tempfile
 import unittest
 
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import SimpleTestCase
 
+from limbo.apps.users.bloom import BloomFilter, optimal_size
 from limbo.apps.users.validators import (
+    BreachedPasswordValidator,
     PasswordStrongValidator,
 )
 
@@ -207,6 +214,14 @@ class PasswordStrongValidatorTestCase(unittest.TestCase):
             str(["Password must contain at least one uppercase letter (A-Z)."]),
         )
 
+    def test_valid_password_non_ascii_digit(self):
+        """Any Unicode decimal digit counts as a digit, as with \\d."""
+        password = "Aa@bcdef\u0663"
+        try:
+            self.validator.validate(password)
+        except ValidationError:
+            self.fail(f"ValidationError raised for valid password '{password}'")
+
     def test_get_help_text(self):
         """Test that get_help_text returns the correct help message."""
         expected_help_text = (
@@ -216,3 +231,64 @@ class PasswordStrongValidatorTestCase(unittest.TestCase):
             "such as @, #, $, %, &, or *."
         )
         self.assertEqual(self.validator.get_help_text(), expected_help_text)
+
+
+class BloomFilterTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "passwords.bloom")
+
+    def test_members_are_found(self):
+        passwords = [f"password{n}" for n in range(2000)]
+        self.assertEqual(BloomFilter.build(self.path, passwords, 2000), 2000)
+        bloom_filter = BloomFilter(self.path)
+        self.addCleanup(bloom_filter.close)
+        self.assertTrue(all(password in bloom_filter for password in passwords))
+        self.assertIn("  PASSWORD1999 ", bloom_filter)
+        false_positives = sum(f"other{n}" in bloom_filter for n in range(10000))
+        self.assertLess(false_positives, 50)
+
+    def test_size(self):
+        bits, hashes = optimal_size(10_000_000, 0.001)
+        self.assertLess(bits / 8 / 2**20, 18)
+        self.assertEqual(hashes, 10)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a filter" * 10)
+        with self.assertRaises(ValueError):
+            BloomFilter(self.path)
+
+
+class BreachedPasswordValidatorTestCase(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "passwords.bloom")
+
+    def test_build_command_and_validator(self):
+        source = os.path.join(os.path.dirname(self.path), "breached.txt")
+        with open(source, "w") as f:
+            f.write("Hunter2!Hunter2\n\ncorrect horse\n")
+        out = io.StringIO()
+        call_command("build_password_filter", source, output=self.path, stdout=out)
+        self.assertIn("Wrote 2 passwords", out.getvalue())
+
+        validator = BreachedPasswordValidator(self.path)
+        with self.assertRaises(ValidationError) as cm:
+            validator.validate("hunter2!hunter2")
+        self.assertEqual(cm.exception.code, "password_too_common")
+        validator.validate("Tr0ub4dor&3x")
+
+    def test_default_list(self):
+        call_command("build_password_filter", output=self.path, stdout=io.StringIO())
+        validator = BreachedPasswordValidator(self.path)
+        with self.assertRaises(ValidationError):
+            validator.validate("Password1")
+
+    def test_falls_back_to_the_common_list(self):
+        validator = BreachedPasswordValidator(self.path)
+        with self.assertLogs("limbo.apps.users.validators", "WARNING"):
+            with self.assertRaises(ValidationError):
+                validator.validate("password")
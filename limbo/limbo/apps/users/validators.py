@@ -1,33 +1,113 @@
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.password_validation import CommonPasswordValidator
 from django.core.exceptions import ValidationError
-import re
+from django.utils.translation import gettext as _
+from django.utils.translation import gettext_lazy
+
+from .bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+UPPERCASE = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+LOWERCASE = frozenset("abcdefghijklmnopqrstuvwxyz")
+DIGITS = frozenset("0123456789")
+SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
 
 
 class PasswordStrongValidator:
-    def validate(self, password, user=None):
-        # Define the password requirements
-        requirements = [
-            (r"[A-Z]", "Password must contain at least one uppercase letter (A-Z)."),
-            (r"[a-z]", "Password must contain at least one lowercase letter (a-z)."),
-            (r"\d", "Password must contain at least one digit (0-9)."),
-            (
-                r'[!@#$%^&*(),.?":{}|<>]',
-                "Password must contain at least one special character, such as @, #, $, %, &, or *.",
+    """
+    Checks the length and the character classes of a password. The
+    characters are collected once, each class is then a set intersection.
+    """
+
+    requirements = [
+        (
+            UPPERCASE,
+            gettext_lazy("Password must contain at least one uppercase letter (A-Z)."),
+            "password_no_upper",
+        ),
+        (
+            LOWERCASE,
+            gettext_lazy("Password must contain at least one lowercase letter (a-z)."),
+            "password_no_lower",
+        ),
+        (
+            DIGITS,
+            gettext_lazy("Password must contain at least one digit (0-9)."),
+            "password_no_digit",
+        ),
+        (
+            SPECIAL,
+            gettext_lazy(
+                "Password must contain at least one special character, "
+                "such as @, #, $, %, &, or *."
             ),
-        ]
+            "password_no_special",
+        ),
+    ]
 
+    def validate(self, password, user=None):
         # Check password length
         if len(password) < 8:
-            raise ValidationError("Password must be at least 8 characters long.")
+            raise ValidationError(
+                _("Password must be at least 8 characters long."),
+                code="password_too_short",
+            )
 
-        # Validate each requirement
-        for pattern, error_message in requirements:
-            if not re.search(pattern, password):
-                raise ValidationError(error_message)
+        chars = set(password)
+        for required, error_message, code in self.requirements:
+            if chars.isdisjoint(required) and not (
+                # Like \d, any Unicode decimal digit counts.
+                required is DIGITS and any(char.isdecimal() for char in chars)
+            ):
+                raise ValidationError(error_message, code=code)
 
     def get_help_text(self):
-        return (
+        return _(
             "Your password must contain at least 8 characters, "
             "include both uppercase and lowercase letters, "
             "contain at least one digit, and at least one special character "
             "such as @, #, $, %, &, or *."
         )
+
+
+@lru_cache(maxsize=None)
+def open_password_filter(path):
+    """
+    The ``BloomFilter`` at ``path``, opened once per process, or Django's
+    common password list when there is no file there yet.
+    """
+    try:
+        return BloomFilter(path)
+    except FileNotFoundError:
+        logger.warning("No password filter at %s, using the common list.", path)
+        return CommonPasswordValidator().passwords
+
+
+class BreachedPasswordValidator:
+    """
+    Reject passwords found in the breached-password Bloom filter,
+    ``BREACHED_PASSWORD_FILTER``, see ``limbo.apps.users.bloom``. Until the
+    filter is built, falls back to Django's common password list.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+
+    def get_filter(self):
+        path = self.path or settings.BREACHED_PASSWORD_FILTER
+        return open_password_filter(str(path))
+
+    def validate(self, password, user=None):
+        # A false positive rejects a safe password, never the reverse.
+        if password.lower().strip() in self.get_filter():
+            raise ValidationError(
+                _("This password is too common."),
+                code="password_too_common",
+            )
+
+    def get_help_text(self):
+        return _("Your password can’t be a commonly used password.")
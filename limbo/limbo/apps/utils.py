@@ -1,6 +1,54 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.db.models import Q
 from django_filters import rest_framework as filters
 
+from limbo.core import querycache
+from limbo.core.pagination import CursorPaginator
+
+# Users a created_by/updated_by filter value resolves to are cached for
+# USER_LOOKUP_TIMEOUT seconds, or until a user is written. Values matching
+# more than USER_LOOKUP_LIMIT users are filtered with a subquery instead of
+# a list of ids.
+USER_LOOKUP_LIMIT = 100
+USER_LOOKUP_TIMEOUT = 60
+
+
+def user_lookup(value):
+    """
+    Users matching a filter value: the user with that id when the value is
+    numeric, and users whose username starts with it, case insensitively.
+    The username lookup uses the ``users_user_username_upper`` index.
+    """
+    value = value.strip()
+    condition = Q(username__istartswith=value)
+    if value.isdigit():
+        condition |= Q(pk=int(value))
+    return get_user_model().objects.filter(condition)
+
+
+def resolve_user_ids(value):
+    """
+    Ids of the users matching ``value``, see ``user_lookup``, or None when
+    there are more than ``USER_LOOKUP_LIMIT`` of them.
+    """
+    digest = hashlib.md5(value.strip().casefold().encode()).hexdigest()
+    (generation,) = querycache.get_generations([get_user_model()])
+    key = f"limbo:user_lookup:{digest}:{generation}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            user_lookup(value)
+            .order_by("pk")
+            .values_list("pk", flat=True)[: USER_LOOKUP_LIMIT + 1]
+        )
+        cache.set(key, ids, USER_LOOKUP_TIMEOUT)
+    if len(ids) > USER_LOOKUP_LIMIT:
+        return None
+    return ids
+
 
 class BaseFilter(filters.FilterSet):
     created_at = filters.DateFromToRangeFilter(field_name="created_at")
@@ -16,7 +64,54 @@ class BaseFilter(filters.FilterSet):
     )
 
     def filter_by(self, queryset, name, value):
-        return queryset.filter(
-            Q(updated_by__id__icontains=value)
-            | Q(updated_by__username__icontains=value)
+        """
+        Filter the ``name`` user column by user id or username prefix. The
+        value is resolved to user ids first, so the filter is an ``IN`` on
+        the foreign key column rather than a join.
+        """
+        if not value.strip():
+            return queryset
+        ids = resolve_user_ids(value)
+        if ids is None:
+            return queryset.filter(**{f"{name}__in": user_lookup(value).values("pk")})
+        if not ids:
+            return queryset.none()
+        return queryset.filter(**{f"{name}__in": ids})
+
+    def cursor_page(self, cursor=None, page_size=50):
+        """
+        Keyset page of the filtered rows in the requested ``order_by``, see
+        ``CursorPaginator``. Only the first ordering field is used; the
+        default is newest first.
+        """
+        queryset = self.qs
+        ordering = "-created_at"
+        requested = self.form.cleaned_data.get("order_by")
+        if requested:
+            ordering = self.filters["order_by"].get_ordering_value(requested[0])
+        return CursorPaginator(queryset, ordering, page_size).page(cursor)
+
+    def cached_qs(self, namespace=None, timeout=None, depends_on=()):
+        """
+        The filtered rows as a list, cached by the normalized filter
+        parameters until the filtered model, the models in ``depends_on``
+        or, when filtering by ``created_by`` or ``updated_by``, users are
+        written, see ``limbo.core.querycache``. Pass a ``namespace`` when
+        the base queryset depends on more than the filterset class, e.g.
+        the user.
+        """
+        if namespace is None:
+            namespace = f"{type(self).__module__}.{type(self).__qualname__}"
+        models = [self.queryset.model, *depends_on]
+        if self.filters_by_user():
+            models.append(get_user_model())
+        key = querycache.result_key(namespace, self.data, models)
+        return querycache.get_or_compute(key, lambda: list(self.qs), timeout)
+
+    def filters_by_user(self):
+        """Whether a ``filter_by`` filter has a value, see ``resolve_user_ids``."""
+        return any(
+            str(self.data.get(name) or "").strip()
+            for name, filter_ in self.filters.items()
+            if filter_.method == "filter_by"
         )
@@ -0,0 +1,15 @@
+"""
+Celery application of the project, configured from the ``CELERY_*``
+settings. Start a worker with::
+
+    celery -A limbo worker
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "limbo.settings")
+
+app = Celery("limbo")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
@@ -0,0 +1,158 @@
+import json
+import re
+from functools import cache
+
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F
+from django.utils.functional import cached_property
+
+_TERM = re.compile(r"\S+")
+
+
+class SearchVectorAdminMixin:
+    """
+    Replaces the OR-ed ``icontains`` admin search with a full-text match on a
+    GIN-indexed ``search_vector`` column maintained by a database trigger.
+
+    Every word of the search term must match, as a prefix, one of the indexed
+    columns, and results are ranked by relevance unless the user picked a
+    column to sort on. On databases other than PostgreSQL the regular
+    ``search_fields`` behaviour is used.
+    """
+
+    search_vector_field = "search_vector"
+    search_config = "simple"
+    search_rank_annotation = "search_rank"
+
+    def uses_search_vector(self, queryset):
+        return connections[queryset.db].vendor == "postgresql"
+
+    def build_search_query(self, search_term):
+        terms = _TERM.findall(search_term)
+        if not terms:
+            return None
+        # Quote each term as a lexeme so user input can't inject tsquery
+        # operators, and add :* to match it as a prefix.
+        raw = " & ".join(
+            "'%s':*" % term.replace("\\", "\\\\").replace("'", "''") for term in terms
+        )
+        return SearchQuery(raw, search_type="raw", config=self.search_config)
+
+    def get_search_results(self, request, queryset, search_term):
+        query = self.build_search_query(search_term) if search_term else None
+        if query is None or not self.uses_search_vector(queryset):
+            return super().get_search_results(request, queryset, search_term)
+
+        queryset = queryset.filter(**{self.search_vector_field: query})
+        if ORDER_VAR not in request.GET:
+            queryset = queryset.annotate(
+                **{
+                    self.search_rank_annotation: SearchRank(
+                        F(self.search_vector_field), query
+                    )
+                }
+            )
+            request._search_vector_ranked = True
+        return queryset, False
+
+    def get_ordering(self, request):
+        ordering = super().get_ordering(request)
+        if getattr(request, "_search_vector_ranked", False):
+            return ("-%s" % self.search_rank_annotation, *ordering)
+        return ordering
+
+
+def estimate_count(queryset):
+    """
+    The planner's estimate of the number of rows of ``queryset``, from
+    ``EXPLAIN``, without running it. None on databases other than PostgreSQL.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Counts with the planner estimate when it exceeds ``threshold`` rows and
+    exactly below it, where ``COUNT(*)`` is cheap and the estimate would be
+    visibly off.
+    """
+
+    def __init__(self, *args, threshold=10_000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = threshold
+        self.estimated = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        # An estimate under a page would show the whole, unsliced queryset.
+        if estimate is not None and estimate > max(self.threshold, self.per_page):
+            self.estimated = True
+            return estimate
+        return super().count
+
+
+class ProjectedChangeListMixin:
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        fields = self.model_admin.get_list_only_fields(request)
+        return queryset.only(*fields) if fields else queryset
+
+
+@cache
+def projected_changelist(changelist):
+    """``changelist`` fetching only the columns its rows display."""
+    return type(
+        f"Projected{changelist.__name__}", (ProjectedChangeListMixin, changelist), {}
+    )
+
+
+class EstimatedCountAdminMixin:
+    """
+    Changelists for large tables: the paginator uses planner estimates above
+    ``estimated_count_threshold`` rows, the unfiltered total isn't counted
+    at all, and the rows are fetched with only the columns ``list_display``
+    needs, plus ``list_only_fields`` for the ones its callables read.
+
+    Put it before mixins that replace the changelist class, such as
+    ``DjangoQLSearchMixin``.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    estimated_count_threshold = 10_000
+    list_only_fields = ()
+
+    def get_paginator(
+        self, request, queryset, per_page, orphans=0, allow_empty_first_page=True
+    ):
+        return self.paginator(
+            queryset,
+            per_page,
+            orphans,
+            allow_empty_first_page,
+            threshold=self.estimated_count_threshold,
+        )
+
+    def get_changelist(self, request, **kwargs):
+        return projected_changelist(super().get_changelist(request, **kwargs))
+
+    def get_list_only_fields(self, request):
+        fields = {self.model._meta.pk.name, *self.list_only_fields}
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                fields.add(name)
+        return sorted(fields)
@@ -1,6 +1,11 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from limbo.core import querycache
+from limbo.core.context import get_current_user_id
+from limbo.core.managers import BaseManager
+from limbo.core.signals import model_deleted, model_saved
+
 
 class BaseModel(models.Model):
     updated_by = models.ForeignKey(
@@ -18,6 +23,82 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField(_("Created at"), auto_now_add=True)
     updated_at = models.DateTimeField(_("Updated at"), auto_now=True)
 
+    objects = BaseManager()
+
+    # Bookkeeping columns left out of the audit log diffs.
+    audit_exclude = ("created_by", "updated_by", "created_at", "updated_at")
+
     class Meta:
         verbose_name = _("Base")
         abstract = True
+        # Keyset pagination on the BaseFilter orderings, see core.pagination.
+        # Subclasses declaring their own Meta must inherit this one.
+        indexes = [
+            models.Index(
+                fields=["created_at", "id"], name="%(app_label)s_%(class)s_created_seek"
+            ),
+            models.Index(
+                fields=["created_by", "id"], name="%(app_label)s_%(class)s_cby_seek"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Loaded values, the baseline of the next audit log diff and of
+        # updater_is_explicit().
+        instance._audit_snapshot = dict(zip(field_names, values))
+        return instance
+
+    def stamp(self, user_id, created=False, updater=True):
+        """
+        Record ``user_id`` as the updater unless ``updater`` is false, and as
+        the creator when ``created``.
+        """
+        if created and self.created_by_id is None:
+            self.created_by_id = user_id
+        if updater:
+            self.updated_by_id = user_id
+
+    def updater_is_explicit(self, update_fields=None):
+        """
+        Whether the caller set ``updated_by`` itself: it is among
+        ``update_fields``, or differs from its loaded value. Stamping keeps
+        it then, as ``BaseQuerySet.update()`` and ``bulk_update()`` do.
+        """
+        if update_fields is not None:
+            return bool({"updated_by", "updated_by_id"} & {*update_fields})
+        snapshot = getattr(self, "_audit_snapshot", {})
+        if not self._state.adding and "updated_by_id" not in snapshot:
+            return False
+        return self.updated_by_id != snapshot.get("updated_by_id")
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        user_id = get_current_user_id()
+        update_fields = kwargs.get("update_fields")
+        if user_id is not None:
+            if self.updater_is_explicit(update_fields):
+                self.stamp(user_id, created=adding, updater=False)
+            else:
+                self.stamp(user_id, created=adding)
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "updated_by"}
+        super().save(*args, **kwargs)
+        querycache.invalidate(type(self), self._state.db)
+        model_saved.send(
+            sender=type(self),
+            instance=self,
+            created=adding,
+            update_fields=kwargs.get("update_fields"),
+        )
+        # Receivers may have set the snapshot already, see audit.recorder.
+        snapshot = vars(self).setdefault("_audit_snapshot", {})
+        snapshot["updated_by_id"] = self.updated_by_id
+
+    def delete(self, *args, **kwargs):
+        pk = self.pk
+        result = super().delete(*args, **kwargs)
+        querycache.invalidate(type(self), self._state.db)
+        model_deleted.send(sender=type(self), instance=self, object_id=pk)
+        return result
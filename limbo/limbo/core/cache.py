@@ -0,0 +1,344 @@
+"""
+Caches: a bounded in-process LRU, and a Django cache backend putting one
+in front of a shared cache such as Redis.
+
+``LRUCache`` is a thread-safe mapping with a size limit and optional
+per-entry expiry, counting its hits, misses, evictions and expirations.
+Use it for any in-process cache instead of a bare dict.
+
+``TwoTierCache`` answers reads from a local ``LRUCache``, shared by every
+thread of the process, and falls back to the shared tier, another entry of
+``CACHES``. Writes go through to the shared tier and drop the key from the
+local tier, here and, through a broker, in the other processes: Redis
+pub/sub when the shared tier is django-redis, an in-process fan-out
+otherwise. Local entries also expire after ``LOCAL_TIMEOUT`` seconds,
+which bounds how stale a process can be if an invalidation is lost.
+Values are kept pickled locally, like the local-memory backend does, so
+callers can't mutate a cached value in place::
+
+    CACHES = {
+        "default": {
+            "BACKEND": "limbo.core.cache.TwoTierCache",
+            "LOCATION": "limbo",
+            "OPTIONS": {"SHARED": "shared", "MAX_ENTRIES": 10_000},
+        },
+        "shared": {"BACKEND": "django_redis.cache.RedisCache", ...},
+    }
+
+``InMemoryBroker`` is the fake used by the tests: give two backends
+different locations over the same shared tier to simulate two processes.
+"""
+import logging
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# Sent as the key when the whole local tier must go.
+CLEAR = "*"
+
+
+class LRUCache:
+    """
+    Thread-safe mapping keeping the ``maxsize`` most recently used entries,
+    each for at most ``timeout`` seconds when given.
+    """
+
+    def __init__(self, maxsize=10_000, timeout=None):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, timeout=_MISSING):
+        """Store ``value``, for ``timeout`` seconds, default ``self.timeout``."""
+        if timeout is _MISSING:
+            timeout = self.timeout
+        expires = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class InMemoryBroker:
+    """Invalidation broker within the process, per channel."""
+
+    _subscribers = defaultdict(list)
+    _lock = threading.Lock()
+
+    def __init__(self, shared, channel):
+        self.channel = channel
+
+    def publish(self, message):
+        with self._lock:
+            subscribers = list(self._subscribers[self.channel])
+        for callback in subscribers:
+            callback(message)
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._subscribers[self.channel].append(callback)
+
+
+class RedisBroker:
+    """
+    Invalidation broker over Redis pub/sub, through the client of a
+    django-redis shared tier. The listener runs in a daemon thread; after
+    a connection loss it asks for the local tier to be cleared, since
+    messages may have been missed meanwhile.
+    """
+
+    def __init__(self, shared, channel):
+        self.client = shared.client.get_client(write=True)
+        self.channel = channel
+
+    def publish(self, message):
+        self.client.publish(self.channel, pickle.dumps(message))
+
+    def subscribe(self, callback):
+        thread = threading.Thread(
+            target=self._listen, args=(callback,), daemon=True, name=self.channel
+        )
+        thread.start()
+
+    def _listen(self, callback):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                callback((None, CLEAR))
+                for message in pubsub.listen():
+                    if message["type"] == "message":
+                        callback(pickle.loads(message["data"]))
+            except Exception:
+                logger.warning("Cache invalidation listener lost", exc_info=True)
+                time.sleep(1)
+
+
+def default_broker(shared):
+    if hasattr(getattr(shared, "client", None), "get_client"):
+        return RedisBroker
+    return InMemoryBroker
+
+
+class LocalTier:
+    """A process's local tier and its subscription to invalidations."""
+
+    def __init__(self, shared, options):
+        self.origin = uuid.uuid4().hex
+        self.cache = LRUCache(
+            options.get("MAX_ENTRIES", 10_000), options.get("LOCAL_TIMEOUT", 5)
+        )
+        broker = options.get("BROKER")
+        broker = import_string(broker) if broker else default_broker(shared)
+        # Every local tier over the same shared tier listens to its writes.
+        channel = f"limbo:cache:{options.get('SHARED', 'shared')}:invalidate"
+        self.broker = broker(shared, channel)
+        self.broker.subscribe(self.receive)
+        self.shared_hits = 0
+        self.shared_misses = 0
+
+    def receive(self, message):
+        origin, key = message
+        if origin == self.origin:
+            return
+        if key == CLEAR:
+            self.cache.clear()
+        else:
+            self.cache.discard(key)
+
+    def invalidate(self, key):
+        if key == CLEAR:
+            self.cache.clear()
+        else:
+            self.cache.discard(key)
+        try:
+            self.broker.publish((self.origin, key))
+        except Exception:
+            # The other processes catch up within LOCAL_TIMEOUT.
+            logger.warning("Cache invalidation not published", exc_info=True)
+
+
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._shared = caches[options.get("SHARED", "shared")]
+        # Like the local-memory backend, instances with the same location
+        # share their entries, whatever the thread.
+        with _tiers_lock:
+            if location not in _tiers:
+                _tiers[location] = LocalTier(self._shared, options)
+            self._tier = _tiers[location]
+        self._local = self._tier.cache
+
+    def _key(self, key, version):
+        return self._shared.make_and_validate_key(key, version=version)
+
+    def _local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._shared.default_timeout
+        if timeout is None:
+            return self._local.timeout
+        if self._local.timeout is None:
+            return timeout
+        return min(timeout, self._local.timeout)
+
+    def _remember(self, key, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self._local_timeout(timeout)
+        if timeout is None or timeout > 0:
+            pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            self._local.set(key, pickled, timeout)
+
+    def get(self, key, default=None, version=None):
+        local_key = self._key(key, version)
+        pickled = self._local.get(local_key, _MISSING)
+        if pickled is not _MISSING:
+            return pickle.loads(pickled)
+        value = self._shared.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            self._tier.shared_misses += 1
+            return default
+        self._tier.shared_hits += 1
+        self._remember(local_key, value)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        missing = {}
+        for key in keys:
+            local_key = self._key(key, version)
+            pickled = self._local.get(local_key, _MISSING)
+            if pickled is _MISSING:
+                missing[key] = local_key
+            else:
+                found[key] = pickle.loads(pickled)
+        if missing:
+            fetched = self._shared.get_many(list(missing), version=version)
+            self._tier.shared_hits += len(fetched)
+            self._tier.shared_misses += len(missing) - len(fetched)
+            for key, value in fetched.items():
+                self._remember(missing[key], value)
+            found.update(fetched)
+        return found
+
+    def has_key(self, key, version=None):
+        if self._local.get(self._key(key, version), _MISSING) is not _MISSING:
+            return True
+        return self._shared.has_key(key, version=version)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._shared.set(key, value, timeout, version=version)
+        local_key = self._key(key, version)
+        self._tier.invalidate(local_key)
+        self._remember(local_key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self._shared.add(key, value, timeout, version=version)
+        if added:
+            self._tier.invalidate(self._key(key, version))
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self._shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            local_key = self._key(key, version)
+            self._tier.invalidate(local_key)
+            if key not in failed:
+                self._remember(local_key, value, timeout)
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        deleted = self._shared.delete(key, version=version)
+        self._tier.invalidate(self._key(key, version))
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self._shared.delete_many(keys, version=version)
+        for key in keys:
+            self._tier.invalidate(self._key(key, version))
+
+    def incr(self, key, delta=1, version=None):
+        try:
+            return self._shared.incr(key, delta, version=version)
+        finally:
+            self._tier.invalidate(self._key(key, version))
+
+    def decr(self, key, delta=1, version=None):
+        try:
+            return self._shared.decr(key, delta, version=version)
+        finally:
+            self._tier.invalidate(self._key(key, version))
+
+    def clear(self):
+        self._shared.clear()
+        self._tier.invalidate(CLEAR)
+
+    def stats(self):
+        """Counters of the local tier and of the reads it passed on."""
+        return {
+            **self._local.stats(),
+            "shared_hits": self._tier.shared_hits,
+            "shared_misses": self._tier.shared_misses,
+        }
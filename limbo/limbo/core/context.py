@@ -0,0 +1,82 @@
+"""
+The user acting in the current request, kept in a context variable so it
+follows the request through threads and coroutines alike.
+
+``CurrentUserMiddleware`` sets it from ``request.user``, API
+authentication from the token; ``BaseModel`` and ``BaseQuerySet`` write
+paths read it to fill in ``created_by_id`` and ``updated_by_id``. Only the
+id travels: stamping a row never loads the user beyond the one
+authentication loads anyway.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+_current_user_id = ContextVar("current_user_id", default=None)
+
+
+def get_current_user_id():
+    user_id = _current_user_id.get()
+    if callable(user_id):
+        return user_id()
+    return user_id
+
+
+def set_current_user_id(user_id):
+    """
+    Set the acting user for the rest of the request, for authentication
+    done in the view, such as the API's, within ``CurrentUserMiddleware``
+    which restores the previous value when the request ends.
+    """
+    _current_user_id.set(user_id)
+
+
+@contextmanager
+def acting_as(user):
+    """
+    Run the block as ``user``, a user instance or id, for instance in tasks,
+    or a callable returning the id.
+    """
+    token = _current_user_id.set(getattr(user, "pk", user))
+    try:
+        yield
+    finally:
+        _current_user_id.reset(token)
+
+
+def request_user_id(request):
+    """Id of the authenticated ``request.user``, None for anonymous users."""
+    return getattr(getattr(request, "user", None), "pk", None)
+
+
+class CurrentUserMiddleware:
+    """
+    Make the id of the logged in user available to ``get_current_user_id()``
+    for the duration of the request.
+
+    The id comes from ``request.user``, which checks the session's auth hash
+    and that the user still exists, and is only resolved when first read,
+    so requests that write nothing don't load the user. Place it after
+    ``AuthenticationMiddleware``. Read it from synchronous code, as the ORM
+    write paths are, since resolving it may query the database.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with acting_as(partial(request_user_id, request)):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with acting_as(partial(request_user_id, request)):
+            return await self.get_response(request)
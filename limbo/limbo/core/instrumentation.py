@@ -0,0 +1,212 @@
+"""
+Per-request SQL instrumentation.
+
+``QueryInstrumentationMiddleware`` records, for a sample of requests, the
+number of queries, the time spent in the database and how often each
+statement fingerprint ran. Repeated fingerprints are N+1 candidates. The
+totals go out in a ``Server-Timing`` header and a log record on the
+``limbo.queries`` logger.
+
+Queries are captured by an ``execute_wrapper`` installed once on every
+connection, which records into the ``QueryStats`` of the current context,
+if any: the wrapper costs a context variable lookup on requests that
+aren't sampled, and follows the request into ``sync_to_async`` threads.
+
+Per-view query budgets are set in ``QUERY_INSTRUMENTATION["BUDGETS"]``,
+keyed by URL name. Requests over budget are logged, or fail with
+``QueryBudgetExceeded`` when ``RAISE_ON_BUDGET`` is set, as in the tests.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("limbo.queries")
+
+DEFAULTS = {
+    "SAMPLE_RATE": 1.0,
+    "REPEAT_THRESHOLD": 5,
+    "BUDGETS": {},
+    "RAISE_ON_BUDGET": False,
+}
+
+_stats = ContextVar("query_stats", default=None)
+
+_IN_LIST = re.compile(r"\bIN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+def instrumentation_settings():
+    return {**DEFAULTS, **getattr(settings, "QUERY_INSTRUMENTATION", {})}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql):
+    """``sql`` with its literals and the length of its IN lists erased."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(sql)] += 1
+
+    def repeated(self, threshold):
+        """Fingerprints that ran at least ``threshold`` times, most first."""
+        return [
+            (sql, count)
+            for sql, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self):
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+def _execute(execute, sql, params, many, context):
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - started)
+
+
+def install(connection, **kwargs):
+    """Add the recording wrapper to ``connection``, once."""
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute)
+
+
+connection_created.connect(install, dispatch_uid="limbo.core.instrumentation")
+
+
+@contextmanager
+def capture_queries():
+    """Collect the queries run in the block, on any connection, in ``QueryStats``."""
+    for connection in connections.all():
+        install(connection)
+    stats = QueryStats()
+    token = _stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _stats.reset(token)
+
+
+@contextmanager
+def query_budget(budget, label="block"):
+    """Fail with ``QueryBudgetExceeded`` when the block runs over ``budget`` queries."""
+    with capture_queries() as stats:
+        yield stats
+    check_budget(stats, budget, label)
+
+
+def check_budget(stats, budget, label):
+    if stats.count > budget:
+        repeated = "".join(
+            f"\n  {count}x {sql}" for sql, count in stats.repeated(2)
+        )
+        raise QueryBudgetExceeded(
+            f"{label} ran {stats.count} queries, over its budget of {budget}."
+            + (f" Repeated:{repeated}" if repeated else "")
+        )
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Instrument a ``SAMPLE_RATE`` share of the requests, see the module
+    docstring. Place it first so it sees the queries of the other middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self, config):
+        rate = config["SAMPLE_RATE"]
+        return rate >= 1 or random.random() < rate
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = instrumentation_settings()
+        if not self.sampled(config):
+            return self.get_response(request)
+        with capture_queries() as stats:
+            response = self.get_response(request)
+        self.report(request, response, stats, config)
+        return response
+
+    async def __acall__(self, request):
+        config = instrumentation_settings()
+        if not self.sampled(config):
+            return await self.get_response(request)
+        with capture_queries() as stats:
+            response = await self.get_response(request)
+        self.report(request, response, stats, config)
+        return response
+
+    def report(self, request, response, stats, config):
+        timing = stats.server_timing()
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+
+        match = request.resolver_match
+        view = match.view_name if match else None
+        repeated = stats.repeated(config["REPEAT_THRESHOLD"])
+        logger.log(
+            logging.WARNING if repeated else logging.INFO,
+            "%s %s: %d queries in %.1fms",
+            request.method,
+            request.path,
+            stats.count,
+            stats.duration * 1000,
+            extra={
+                "view": view,
+                "status": response.status_code,
+                "queries": stats.count,
+                "db_time_ms": round(stats.duration * 1000, 1),
+                "repeated_queries": [
+                    {"sql": sql, "count": count} for sql, count in repeated
+                ],
+            },
+        )
+
+        budget = config["BUDGETS"].get(view)
+        if budget is not None:
+            try:
+                check_budget(stats, budget, view)
+            except QueryBudgetExceeded as e:
+                if config["RAISE_ON_BUDGET"]:
+                    raise
+                logger.warning(str(e))
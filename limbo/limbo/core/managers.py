@@ -0,0 +1,183 @@
+"""
+Querysets shared by every ``BaseModel``.
+
+Each ``BaseModel`` row points at the users who created and last updated it.
+Showing them in a listing costs a query per row unless the queryset asks
+for them up front, in one of two ways:
+
+- ``with_audit_users()`` joins both users into the query, loading only the
+  columns of a ``UserSummary``;
+- ``with_audit_summaries()`` attaches ``created_by_summary`` and
+  ``updated_by_summary`` from a short-lived in-process cache of user
+  summaries shared across requests, querying the users it misses at once.
+
+The write paths stamp ``created_by_id`` and ``updated_by_id`` from
+``limbo.core.context`` like ``BaseModel.save()`` does, and invalidate the
+cached results of the model, see ``limbo.core.querycache``.
+"""
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import models
+from django.db.models.query import ModelIterable
+
+from limbo.core import querycache
+from limbo.core.cache import LRUCache
+from limbo.core.context import get_current_user_id
+
+AUDIT_USER_FIELDS = ("created_by", "updated_by")
+USER_SUMMARY_FIELDS = ("id", "username", "first_name", "last_name")
+
+
+class UserSummary(NamedTuple):
+    id: int
+    username: str
+    full_name: str
+
+    def __str__(self):
+        return self.full_name or self.username
+
+
+class UserSummaryCache:
+    """
+    ``UserSummary`` cache keyed by user id, an ``LRUCache`` whose entries
+    expire after ``ttl`` seconds so renamed users show up again shortly.
+    """
+
+    def __init__(self, ttl=60, maxsize=10_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._cache = LRUCache(maxsize, timeout=ttl)
+
+    def get_many(self, ids):
+        """Summaries of the users with ``ids``, with one query for the misses."""
+        ids = {pk for pk in ids if pk is not None}
+        found = {}
+        for pk in ids:
+            summary = self._cache.get(pk)
+            if summary is not None:
+                found[pk] = summary
+        missing = ids - found.keys()
+        if missing:
+            fetched = self.fetch(missing)
+            for pk, summary in fetched.items():
+                self._cache.set(pk, summary)
+            found.update(fetched)
+        return found
+
+    def fetch(self, ids):
+        users = get_user_model().objects.filter(pk__in=ids)
+        rows = users.values_list(*USER_SUMMARY_FIELDS)
+        return {
+            pk: UserSummary(pk, username, f"{first_name} {last_name}".strip())
+            for pk, username, first_name, last_name in rows
+        }
+
+    def clear(self):
+        self._cache.clear()
+
+
+user_summaries = UserSummaryCache()
+
+
+class BaseQuerySet(models.QuerySet):
+    _audit_summaries = False
+
+    def bulk_create(self, objs, *args, **kwargs):
+        user_id = get_current_user_id()
+        if user_id is not None:
+            objs = list(objs)
+            for obj in objs:
+                obj.stamp(user_id, created=True)
+        objs = super().bulk_create(objs, *args, **kwargs)
+        querycache.invalidate(self.model, self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        user_id = get_current_user_id()
+        stamped = {"updated_by", "updated_by_id"} & {*fields}
+        if user_id is not None and not stamped:
+            objs = list(objs)
+            for obj in objs:
+                obj.stamp(user_id)
+            fields = [*fields, "updated_by"]
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        querycache.invalidate(self.model, self.db)
+        return rows
+
+    def update(self, **kwargs):
+        user_id = get_current_user_id()
+        if user_id is not None and not {"updated_by", "updated_by_id"} & kwargs.keys():
+            kwargs["updated_by_id"] = user_id
+        rows = super().update(**kwargs)
+        querycache.invalidate(self.model, self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        result = super().delete()
+        querycache.invalidate(self.model, self.db)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def with_audit_users(self):
+        """
+        Join ``created_by`` and ``updated_by`` into the query, deferring the
+        user columns a ``UserSummary`` doesn't need.
+        """
+        User = self.model._meta.get_field("created_by").related_model
+        deferred = [
+            field.name
+            for field in User._meta.concrete_fields
+            if field.attname not in USER_SUMMARY_FIELDS
+        ]
+        return self.select_related(*AUDIT_USER_FIELDS).defer(
+            *(
+                f"{relation}__{name}"
+                for relation in AUDIT_USER_FIELDS
+                for name in deferred
+            )
+        )
+
+    def with_audit_summaries(self):
+        """
+        Attach ``created_by_summary`` and ``updated_by_summary`` to the
+        fetched rows from ``user_summaries``.
+        """
+        clone = self._chain()
+        clone._audit_summaries = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._audit_summaries = self._audit_summaries
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if (
+            self._audit_summaries
+            and not fetched
+            and self._iterable_class is ModelIterable
+        ):
+            attach_audit_summaries(self._result_cache)
+
+
+def attach_audit_summaries(objs):
+    summaries = user_summaries.get_many(
+        getattr(obj, f"{relation}_id")
+        for obj in objs
+        for relation in AUDIT_USER_FIELDS
+    )
+    for obj in objs:
+        for relation in AUDIT_USER_FIELDS:
+            pk = getattr(obj, f"{relation}_id")
+            setattr(obj, f"{relation}_summary", summaries.get(pk))
+    return objs
+
+
+BaseManager = models.Manager.from_queryset(BaseQuerySet)
@@ -0,0 +1,150 @@
+"""
+Keyset ("cursor") pagination.
+
+``OFFSET`` pagination reads and throws away every row before the page, so
+deep pages get slower the deeper they are. A keyset page instead seeks
+past the last row of the previous page with a row comparison
+
+    WHERE (created_at, id) > (%s, %s) ORDER BY created_at, id LIMIT n
+
+which a composite index on ``(created_at, id)`` answers by descending
+straight to the start of the page: page N costs the same as page 1.
+
+Cursors are signed so clients can pass them back but not forge them.
+"""
+from dataclasses import dataclass
+
+from django.core import signing
+from django.db import models
+from django.db.models import F, Func, Q, Value
+
+
+class Row(Func):
+    function = "ROW"
+    output_field = models.Field()
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+@dataclass
+class CursorPage:
+    object_list: list
+    next_cursor: str = None
+    previous_cursor: str = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator:
+    """
+    Paginate ``queryset`` by ``ordering``, a field name optionally prefixed
+    with "-", with the primary key as the tie breaker.
+
+    A nullable ordering field sorts its NULLs the way PostgreSQL does, last
+    in ascending and first in descending order, and pages through them by
+    primary key.
+    """
+
+    salt = "limbo.core.pagination"
+
+    def __init__(self, queryset, ordering="-created_at", page_size=50):
+        self.queryset = queryset
+        self.ordering = ordering
+        self.descending = ordering.startswith("-")
+        self.field = queryset.model._meta.get_field(ordering.lstrip("-"))
+        self.pk = queryset.model._meta.pk
+        self.page_size = page_size
+
+    def page(self, cursor=None):
+        """The page starting after ``cursor``, or the first page."""
+        if cursor is None:
+            position, backwards = None, False
+        else:
+            position, backwards = self.decode(cursor)
+        descending = self.descending != backwards
+        queryset = self.queryset.order_by(*self.order_by(descending))
+        if position is not None:
+            queryset = queryset.alias(
+                _seek=Row(F(self.field.attname), F(self.pk.attname))
+            ).filter(self.seek(*position, descending))
+        rows = list(queryset[: self.page_size + 1])
+        more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if backwards:
+            rows.reverse()
+        if not rows:
+            return CursorPage(rows)
+        return CursorPage(
+            rows,
+            next_cursor=self.encode(rows[-1]) if more or backwards else None,
+            previous_cursor=(
+                self.encode(rows[0], backwards=True)
+                if position is not None and (more or not backwards)
+                else None
+            ),
+        )
+
+    def order_by(self, descending):
+        if descending:
+            return (
+                F(self.field.attname).desc(nulls_first=True),
+                F(self.pk.attname).desc(),
+            )
+        return (
+            F(self.field.attname).asc(nulls_last=True),
+            F(self.pk.attname).asc(),
+        )
+
+    def seek(self, value, pk, descending):
+        """Rows after ``(value, pk)`` in the page order."""
+        lookup = "_seek__lt" if descending else "_seek__gt"
+        pk_lookup = f"{self.pk.attname}__{'lt' if descending else 'gt'}"
+        isnull = f"{self.field.attname}__isnull"
+        if value is None:
+            after = Q(**{isnull: True, pk_lookup: pk})
+            # NULLs come first in descending order, then every other row.
+            return after | Q(**{isnull: False}) if descending else after
+        after = Q(
+            **{
+                lookup: Row(
+                    Value(value, output_field=self.field),
+                    Value(pk, output_field=self.pk),
+                )
+            }
+        )
+        if self.field.null and not descending:
+            after |= Q(**{isnull: True})
+        return after
+
+    def encode(self, obj, backwards=False):
+        value = self.field.value_to_string(obj)
+        if getattr(obj, self.field.attname) is None:
+            value = None
+        return signing.dumps(
+            [self.ordering, value, obj.pk, backwards], salt=self.salt, compress=True
+        )
+
+    def decode(self, cursor):
+        try:
+            ordering, value, pk, backwards = signing.loads(cursor, salt=self.salt)
+        except (signing.BadSignature, TypeError, ValueError) as e:
+            raise InvalidCursor("Invalid cursor.") from e
+        if ordering != self.ordering:
+            raise InvalidCursor("The cursor belongs to another ordering.")
+        if value is not None:
+            value = self.field.to_python(value)
+        return (value, self.pk.to_python(pk)), backwards
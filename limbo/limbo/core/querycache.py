@@ -0,0 +1,143 @@
+"""
+Caching of filtered queryset results, invalidated by generation counters.
+
+Every model has a generation number in the cache, bumped whenever one of
+its rows is written: ``BaseModel.save()``/``delete()``, the
+``BaseQuerySet`` bulk paths and, for users, the ``post_save`` and
+``post_delete`` signals. Result keys embed the generations of the models
+the result depends on, so a write makes the old entries unreachable
+instead of deleting them; they expire on their own. Generations start
+from the current time in nanoseconds, so a counter evicted from the cache
+and recreated doesn't return to a value, and keys, it had before.
+
+A miss takes a short lock with ``cache.add`` before running the query, so
+concurrent requests for the same missing result wait for the first one
+instead of all hitting the database.
+"""
+import hashlib
+import json
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+KEY_PREFIX = "limbo:qc"
+LOCK_TIMEOUT = 10
+LOCK_POLL_INTERVAL = 0.05
+
+_MISSING = object()
+
+
+def generation_key(model):
+    return f"{KEY_PREFIX}:gen:{model._meta.label_lower}"
+
+
+def get_generations(models):
+    keys = [generation_key(model) for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            # Another process may initialize it first; add() keeps theirs.
+            seed = time.time_ns()
+            cache.add(key, seed, timeout=None)
+            generations[key] = cache.get(key, seed)
+    return [generations[key] for key in keys]
+
+
+def bump(model):
+    key = generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def invalidate(model, using=DEFAULT_DB_ALIAS):
+    """
+    Bump the generation of ``model`` now, for reads later in the current
+    transaction, and again on commit, for results cached meanwhile by other
+    connections from the pre-commit data.
+    """
+    bump(model)
+    transaction.on_commit(partial(bump, model), using=using)
+
+
+def normalize_params(params):
+    """
+    Canonical form of request parameters: sorted names and values, with
+    empty values left out, so equivalent query strings share a key.
+    """
+    if hasattr(params, "lists"):
+        items = params.lists()
+    else:
+        items = ((name, value) for name, value in params.items())
+    normalized = {}
+    for name, values in items:
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        values = sorted(str(value).strip() for value in values)
+        values = [value for value in values if value]
+        if values:
+            normalized[name] = values
+    return sorted(normalized.items())
+
+
+def result_key(namespace, params, models):
+    payload = json.dumps([namespace, normalize_params(params)])
+    digest = hashlib.md5(payload.encode()).hexdigest()
+    generations = ".".join(map(str, get_generations(models)))
+    return f"{KEY_PREFIX}:{digest}:{generations}"
+
+
+def get_or_compute(key, compute, timeout=None):
+    """
+    The cached value of ``key``, or ``compute()``'s result cached for
+    ``timeout`` seconds. Only one caller computes a missing value at a time;
+    the others wait up to ``LOCK_TIMEOUT`` seconds for its result.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "QUERY_CACHE_TIMEOUT", 300)
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    lock = f"{key}:lock"
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if time.monotonic() > deadline:
+            # The computing caller is stuck or gone: compute without it.
+            return compute()
+    try:
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            cache.set(key, value, timeout)
+    finally:
+        cache.delete(lock)
+    return value
+
+
+def invalidate_receiver(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """``post_save``/``post_delete`` receiver for models outside ``BaseModel``."""
+    invalidate(sender, using)
+
+
+def cached_queryset(queryset, params, namespace=None, depends_on=(), timeout=None):
+    """
+    The rows of ``queryset`` as a list, cached under ``params``, the
+    parameters ``queryset`` was filtered with, and the generations of its
+    model and of ``depends_on``. ``namespace`` tells apart the querysets
+    built from the same parameters, it defaults to the model label.
+    """
+    model = queryset.model
+    key = result_key(
+        namespace or model._meta.label_lower,
+        params,
+        [model, *depends_on],
+    )
+    return get_or_compute(key, lambda: list(queryset), timeout)
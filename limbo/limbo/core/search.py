@@ -0,0 +1,49 @@
+from django.db import migrations
+
+
+def search_vector_trigger(
+    table, columns, field="search_vector", config="pg_catalog.simple", expressions=()
+):
+    """
+    Migration operation maintaining a ``SearchVectorField`` on PostgreSQL.
+
+    It creates a GIN index on ``field``, a trigger that rebuilds it from
+    ``columns`` on every insert and update, and backfills the existing rows.
+    ``expressions`` are SQL expressions over the ``NEW`` row indexed as well,
+    for words the parser would keep inside one token, such as the parts of an
+    email address. On other databases it does nothing and the column stays
+    NULL, which the admin search mixin treats as "use the regular search".
+    """
+    index = f"{table}_{field}_gin"
+    trigger = f"{table}_{field}_update"
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        qn = schema_editor.quote_name
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {qn(index)} ON {qn(table)} USING gin ({qn(field)})"
+        )
+        text = ", ".join([*(f"NEW.{qn(column)}" for column in columns), *expressions])
+        schema_editor.execute(
+            f"CREATE OR REPLACE FUNCTION {qn(trigger)}() RETURNS trigger AS $$ BEGIN "
+            f"NEW.{qn(field)} := to_tsvector('{config}', concat_ws(' ', {text})); "
+            f"RETURN NEW; END $$ LANGUAGE plpgsql"
+        )
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {qn(trigger)} ON {qn(table)}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {qn(trigger)} BEFORE INSERT OR UPDATE ON {qn(table)} "
+            f"FOR EACH ROW EXECUTE FUNCTION {qn(trigger)}()"
+        )
+        # Touching the column is enough for the trigger to recompute it.
+        schema_editor.execute(f"UPDATE {qn(table)} SET {qn(field)} = NULL")
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        qn = schema_editor.quote_name
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {qn(trigger)} ON {qn(table)}")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {qn(trigger)}()")
+        schema_editor.execute(f"DROP INDEX IF EXISTS {qn(index)}")
+
+    return migrations.RunPython(forwards, backwards)
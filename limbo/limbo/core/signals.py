@@ -0,0 +1,14 @@
+"""
+Sent by ``BaseModel.save()`` and ``delete()`` once the row is written, for
+apps hooking into every model change without ``limbo.core`` depending on
+them, such as the audit log. Bulk queryset operations don't send them.
+
+- ``model_saved``: ``sender`` is the model class, with ``instance``,
+  ``created`` and the ``update_fields`` passed to ``save()``;
+- ``model_deleted``: ``sender`` is the model class, with ``instance`` and
+  ``object_id``, its primary key before the deletion.
+"""
+from django.dispatch import Signal
+
+model_saved = Signal()
+model_deleted = Signal()
@@ -0,0 +1,100 @@
+import time
+import uuid
+
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase
+
+from limbo.core.cache import LRUCache, TwoTierCache
+
+
+def two_tier(location, **options):
+    return TwoTierCache(
+        location,
+        {
+            "OPTIONS": {
+                "SHARED": "shared",
+                "BROKER": "limbo.core.cache.InMemoryBroker",
+                **options,
+            }
+        },
+    )
+
+
+class TestLRUCache(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(maxsize=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(len(lru), 2)
+        self.assertEqual(
+            lru.stats(),
+            {
+                "entries": 2,
+                "maxsize": 2,
+                "hits": 2,
+                "misses": 1,
+                "evictions": 1,
+                "expirations": 0,
+            },
+        )
+
+    def test_entries_expire(self):
+        lru = LRUCache(timeout=0.01)
+        lru.set("a", 1)
+        lru.set("b", 2, timeout=None)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get("a"))
+        self.assertEqual(lru.get("b"), 2)
+        self.assertEqual(lru.stats()["expirations"], 1)
+
+
+class TestTwoTierCache(SimpleTestCase):
+    def setUp(self):
+        location = uuid.uuid4().hex
+        # Two processes over the same shared tier.
+        self.a = two_tier(location)
+        self.b = two_tier(f"{location}-other")
+        self.key = uuid.uuid4().hex
+
+    def test_reads_are_served_locally(self):
+        self.a.set(self.key, {"n": 1})
+        self.assertEqual(self.b.get(self.key), {"n": 1})
+        caches["shared"].set(self.key, {"n": 2})
+        self.assertEqual(self.b.get(self.key), {"n": 1})
+        stats = self.b.stats()
+        self.assertEqual((stats["hits"], stats["shared_hits"]), (1, 1))
+
+    def test_writes_invalidate_the_other_processes(self):
+        self.a.set(self.key, 1)
+        self.assertEqual(self.b.get(self.key), 1)
+        self.a.set(self.key, 2)
+        self.assertEqual(self.b.get(self.key), 2)
+        self.assertEqual(self.a.incr(self.key), 3)
+        self.assertEqual(self.b.get_many([self.key, "absent"]), {self.key: 3})
+        self.a.delete(self.key)
+        self.assertIsNone(self.b.get(self.key))
+        self.assertTrue(self.b.add(self.key, 4))
+        self.assertFalse(self.a.add(self.key, 5))
+        self.assertEqual(self.a.get(self.key), 4)
+
+    def test_local_entries_expire(self):
+        b = two_tier(uuid.uuid4().hex, LOCAL_TIMEOUT=0.01)
+        self.a.set(self.key, 1)
+        self.assertEqual(b.get(self.key), 1)
+        caches["shared"].set(self.key, 2)
+        time.sleep(0.02)
+        self.assertEqual(b.get(self.key), 2)
+
+    def test_values_are_copies(self):
+        self.a.set(self.key, [1])
+        self.a.get(self.key).append(2)
+        self.assertEqual(self.a.get(self.key), [1])
+
+    def test_default_cache(self):
+        self.assertIsInstance(caches["default"], TwoTierCache)
+        cache.set(self.key, "value", timeout=0)
+        self.assertIsNone(cache.get(self.key))
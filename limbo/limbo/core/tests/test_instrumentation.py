@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from limbo.apps.address.models import Address
+from limbo.core.instrumentation import (
+    QueryBudgetExceeded,
+    capture_queries,
+    fingerprint,
+    query_budget,
+)
+from limbo.factory.address import SpringfieldAddressFactory
+from limbo.factory.user import UserFactory
+
+
+def instrumentation(**overrides):
+    return override_settings(
+        QUERY_INSTRUMENTATION={
+            **settings.QUERY_INSTRUMENTATION,
+            "SAMPLE_RATE": 1.0,
+            "RAISE_ON_BUDGET": True,
+            **overrides,
+        }
+    )
+
+
+class TestFingerprint(TestCase):
+    def test_literals_and_in_lists_are_erased(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 12 AND b = 'it''s'  LIMIT 21"),
+            "SELECT * FROM t WHERE a = ? AND b = ? LIMIT ?",
+        )
+        self.assertEqual(
+            fingerprint('SELECT "t"."line2" FROM t WHERE id IN (%s, %s, %s)'),
+            fingerprint('SELECT "t"."line2" FROM t WHERE id IN (%s)'),
+        )
+
+    def test_capture_counts_repeated_statements(self):
+        Address.objects.bulk_create(
+            [SpringfieldAddressFactory.build(line2=f"Apt {n}") for n in range(6)]
+        )
+        with capture_queries() as stats:
+            for pk in Address.objects.values_list("pk", flat=True):
+                Address.objects.get(pk=pk)
+        self.assertEqual(stats.count, 7)
+        ((sql, count),) = stats.repeated(5)
+        self.assertEqual(count, 6)
+        self.assertIn('WHERE "address_address"."id" = %s', sql)
+
+    def test_query_budget(self):
+        with query_budget(1):
+            Address.objects.count()
+        with self.assertRaisesMessage(QueryBudgetExceeded, "ran 2 queries"):
+            with query_budget(1, "counts"):
+                Address.objects.count()
+                Address.objects.count()
+
+
+class TestQueryInstrumentationMiddleware(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(is_staff=True, is_superuser=True)
+        Address.objects.bulk_create(
+            [
+                SpringfieldAddressFactory.build(line2=f"Apt {n}", updated_by=cls.user)
+                for n in range(30)
+            ]
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    @instrumentation()
+    def test_admin_views_stay_within_budget(self):
+        address = Address.objects.first()
+        urls = [
+            reverse("admin:index"),
+            reverse("admin:address_address_changelist"),
+            reverse("admin:address_address_add"),
+            reverse("admin:address_address_change", args=[address.pk]),
+            reverse("admin:users_user_changelist"),
+            reverse("admin:users_user_add"),
+            reverse("admin:users_user_change", args=[self.user.pk]),
+            reverse("admin:audit_auditlog_changelist"),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    @instrumentation(BUDGETS={"admin:index": 1})
+    def test_over_budget_view_fails(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "admin:index ran"):
+            self.client.get(reverse("admin:index"))
+
+    @instrumentation(BUDGETS={"admin:index": 1}, RAISE_ON_BUDGET=False)
+    def test_over_budget_view_is_logged(self):
+        with self.assertLogs("limbo.queries", "WARNING") as logs:
+            response = self.client.get(reverse("admin:index"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("over its budget of 1", logs.output[-1])
+
+    @instrumentation()
+    def test_server_timing_and_log_record(self):
+        with self.assertLogs("limbo.queries", "INFO") as logs:
+            response = self.client.get(reverse("admin:index"))
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries"$'
+        )
+        (record,) = logs.records
+        self.assertEqual(record.view, "admin:index")
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.queries, 0)
+        self.assertEqual(record.repeated_queries, [])
+
+    @instrumentation(SAMPLE_RATE=0.0, BUDGETS={"admin:index": 1})
+    def test_unsampled_requests_are_not_instrumented(self):
+        response = self.client.get(reverse("admin:index"))
+        self.assertFalse(response.has_header("Server-Timing"))
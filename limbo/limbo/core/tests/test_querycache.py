@@ -0,0 +1,128 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from limbo.apps.address.models import Address
+from limbo.apps.users.models import User
+from limbo.apps.utils import BaseFilter
+from limbo.core import querycache
+from limbo.factory.address import SpringfieldAddressFactory
+
+
+class AddressFilter(BaseFilter):
+    class Meta:
+        model = Address
+        fields = ["city"]
+
+
+class TestKeys(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_equivalent_params_share_a_key(self):
+        self.assertEqual(
+            querycache.result_key("ns", QueryDict("b=2&a=1&c=&a=0"), [Address]),
+            querycache.result_key("ns", {"a": ["0", "1"], "b": "2"}, [Address]),
+        )
+        self.assertNotEqual(
+            querycache.result_key("ns", {"a": "1"}, [Address]),
+            querycache.result_key("other", {"a": "1"}, [Address]),
+        )
+
+    def test_bump_changes_the_key(self):
+        key = querycache.result_key("ns", {}, [Address, User])
+        querycache.bump(User)
+        self.assertNotEqual(querycache.result_key("ns", {}, [Address, User]), key)
+
+    def test_evicted_generations_do_not_repeat(self):
+        (first,) = querycache.get_generations([Address])
+        querycache.bump(Address)
+        cache.delete(querycache.generation_key(Address))
+        (second,) = querycache.get_generations([Address])
+        self.assertGreater(second, first + 1)
+        cache.delete(querycache.generation_key(Address))
+        querycache.bump(Address)
+        (third,) = querycache.get_generations([Address])
+        self.assertGreater(third, second)
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return ["rows"]
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    querycache.get_or_compute("limbo:test", compute)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["rows"]] * 5)
+
+
+class TestCachedFilter(TestCase):
+    def setUp(self):
+        cache.clear()
+        SpringfieldAddressFactory()
+        SpringfieldAddressFactory(line1="1 Other St", city="Chicago")
+
+    def cached(self, query="city=Springfield"):
+        filterset = AddressFilter(QueryDict(query), queryset=Address.objects.all())
+        return filterset.cached_qs()
+
+    def test_hits_until_written(self):
+        self.assertEqual(len(self.cached()), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(self.cached("city=Springfield&created_by=")), 1)
+
+        writes = [
+            lambda: SpringfieldAddressFactory(line2="Apt 1"),
+            lambda: Address.objects.filter(city="Chicago").update(city="Springfield"),
+            lambda: Address.objects.bulk_create(
+                [SpringfieldAddressFactory.build(line2="Apt 2")]
+            ),
+            lambda: Address.objects.filter(line2="Apt 2").delete(),
+            lambda: Address.objects.get(line2="Apt 1").delete(),
+        ]
+        expected = [2, 3, 4, 3, 2]
+        for write, count in zip(writes, expected):
+            write()
+            self.assertEqual(len(self.cached()), count)
+
+    def test_user_writes_invalidate(self):
+        self.cached("created_by=jane")
+        jane = User.objects.create(username="jane")
+        Address.objects.update(created_by=jane)
+        self.assertEqual(len(self.cached("created_by=jane")), 2)
+        User.objects.create(username="janet")
+        with self.assertNumQueries(2):
+            self.cached("created_by=jane")
+
+    def test_logins_keep_results_not_filtered_by_user(self):
+        jane = User.objects.create(username="jane")
+        self.cached()
+        jane.last_login = timezone.now()
+        jane.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            self.cached()
+
+    def test_bumped_again_on_commit(self):
+        (before,) = querycache.get_generations([Address])
+        with self.captureOnCommitCallbacks(execute=True):
+            SpringfieldAddressFactory(line2="Apt 1")
+        (after,) = querycache.get_generations([Address])
+        self.assertEqual(after, before + 2)
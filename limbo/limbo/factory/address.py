@@ -23,3 +23,21 @@ class AddressFactory(BaseFactory):
     )
     city = factory.Faker("city")
     state = factory.Faker("state")
+
+
+class SpringfieldAddressFactory(factory.django.DjangoModelFactory):
+    """
+    Always the same valid US address, without audit users, for tests that
+    assert on field values; override fields to get others.
+    """
+
+    class Meta:
+        model = Address
+
+    first_name = "Jane"
+    last_name = "Doe"
+    line1 = "10 Main St."
+    city = "Springfield"
+    state = "IL"
+    postal_code = "62701"
+    country = "US"
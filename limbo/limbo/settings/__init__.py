@@ -1,3 +1,10 @@
 from .common import *  # noqa
 from .db import *  # noqa
 from .i18n import *  # noqa
+from .geocoding import *  # noqa
+from .audit import *  # noqa
+from .cache import *  # noqa
+from .instrumentation import *  # noqa
+from .auth import *  # noqa
+from .api import *  # noqa
+from .celery import *  # noqa
@@ -0,0 +1,22 @@
+import os
+from datetime import timedelta
+
+# API authentication: JWT bearer tokens, see limbo.apps.users.authentication,
+# or the admin session.
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "limbo.apps.users.authentication.CachedJWTAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+}
+
+SIMPLE_JWT = {
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
+    "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    "TOKEN_OBTAIN_SERIALIZER": "limbo.apps.users.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "limbo.apps.users.serializers.TokenRefreshSerializer",
+}
+
+# Seconds a token's user stays cached; writes bypassing User.save() take
+# effect on API requests within that delay.
+JWT_PRINCIPAL_TIMEOUT = int(os.getenv("JWT_PRINCIPAL_TIMEOUT", 30))
@@ -0,0 +1,11 @@
+import os
+
+# Audit log writing, see limbo.apps.audit.recorder. "sync" writes the
+# entries when the request ends, outside requests once BATCH_SIZE entries
+# are waiting or every FLUSH_INTERVAL seconds; "background" hands them to
+# a writer thread that inserts them in batches.
+AUDIT_LOG = {
+    "WRITER": os.getenv("AUDIT_LOG_WRITER", "sync"),
+    "BATCH_SIZE": 500,
+    "FLUSH_INTERVAL": 1.0,
+}
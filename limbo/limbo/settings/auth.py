@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+
+AUTHENTICATION_BACKENDS = ["limbo.apps.users.backends.CachedPermissionBackend"]
+
+# Seconds permission sets stay cached, see limbo.apps.users.permissions.
+PERMISSION_CACHE_TIMEOUT = int(os.getenv("PERMISSION_CACHE_TIMEOUT", 300))
+
+# Pool hashing passwords for the async paths, see limbo.apps.users.hashing.
+# WORKERS defaults to the available cores; beyond MAX_PENDING queued or
+# running hashes, logins and registrations fail fast with HashingOverloaded,
+# answered with a 503 asking to retry after RETRY_AFTER seconds.
+PASSWORD_HASHING = {
+    "WORKERS": int(os.getenv("PASSWORD_HASHING_WORKERS", 0)) or None,
+    "MAX_PENDING": int(os.getenv("PASSWORD_HASHING_MAX_PENDING", 64)),
+    "RETRY_AFTER": 1,
+}
+
+# Bloom filter of breached passwords read by BreachedPasswordValidator, built
+# with the build_password_filter command; see limbo.apps.users.bloom.
+BREACHED_PASSWORD_FILTER = os.getenv(
+    "BREACHED_PASSWORD_FILTER",
+    Path(__file__).resolve().parent.parent.parent / "var" / "breached-passwords.bloom",
+)
+
+# Dispatch of the user_registered and user_logged_in signals, see
+# limbo.apps.users.events. "sync" runs the receivers in the request,
+# "background" in a thread of the process after commit, "celery" in the
+# Celery workers; the events are delivered in batches and failed
+# receivers retried MAX_RETRIES times, from RETRY_DELAY seconds apart.
+USER_EVENTS = {
+    "DISPATCH": os.getenv("USER_EVENTS_DISPATCH", "sync"),
+    "BATCH_SIZE": 100,
+    "FLUSH_INTERVAL": 0.5,
+    "MAX_RETRIES": 5,
+    "RETRY_DELAY": 10.0,
+}
@@ -0,0 +1,36 @@
+import os
+
+# Every cache goes through limbo.core.cache.TwoTierCache: an in-process LRU
+# in front of the shared tier, Redis in production, via REDIS_URL (e.g.
+# redis://redis:6379/0), the local-memory cache otherwise, which is per
+# process and used by the tests.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    SHARED_CACHE = {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {"CLIENT_CLASS": "django_redis.client.DefaultClient"},
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "limbo-shared",
+    }
+
+CACHES = {
+    "default": {
+        "BACKEND": "limbo.core.cache.TwoTierCache",
+        "LOCATION": "limbo",
+        "OPTIONS": {
+            "SHARED": "shared",
+            "MAX_ENTRIES": int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 10_000)),
+            # Seconds a process may serve an entry after a lost invalidation.
+            "LOCAL_TIMEOUT": float(os.getenv("LOCAL_CACHE_TIMEOUT", 5)),
+        },
+    },
+    "shared": SHARED_CACHE,
+}
+
+# Seconds filtered querysets stay in the cache, see limbo.core.querycache.
+QUERY_CACHE_TIMEOUT = int(os.getenv("QUERY_CACHE_TIMEOUT", 300))
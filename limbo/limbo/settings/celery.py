@@ -0,0 +1,8 @@
+import os
+
+# Celery, see limbo/celery.py. The broker defaults to the Redis of the
+# cache; tasks and their arguments are JSON.
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL"))
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_TASK_ACKS_LATE = True
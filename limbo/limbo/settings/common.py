@@ -35,11 +35,16 @@ AUTH_USER_MODEL = "users.User"
 INSTALLED_APPS = BASE_APPS + MY_APPS + THIRD_PARTY
 
 MIDDLEWARE = [
+    "limbo.core.instrumentation.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "limbo.core.context.CurrentUserMiddleware",
+    "limbo.apps.users.middleware.HashingOverloadedMiddleware",
+    "limbo.apps.audit.middleware.AuditMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -74,8 +79,10 @@ AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
     },
+    # CommonPasswordValidator's list, or the breached-password filter once
+    # built, see limbo.apps.users.bloom.
     {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+        "NAME": "limbo.apps.users.validators.BreachedPasswordValidator",
     },
     {
         "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
@@ -87,6 +94,18 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
 STATIC_URL = "/static/"
+STATIC_ROOT = os.getenv("STATIC_ROOT", BASE_DIR.parent / "staticfiles")
+
+# Content-hashed file names (e.g. flags/sprite.1a2b3c4d5e6f.png), which
+# WhiteNoise serves with a far-future, immutable Cache-Control header.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
@@ -0,0 +1,10 @@
+import os
+
+# Geocoding provider used by limbo.apps.address.geocoding. The file-backed
+# provider answers from a local CSV of address,latitude,longitude rows.
+GEOCODER = {
+    "BACKEND": os.getenv(
+        "GEOCODER_BACKEND", "limbo.apps.address.geocoding.FileGeocoder"
+    ),
+    "OPTIONS": {"path": os.getenv("GEOCODER_FILE")},
+}
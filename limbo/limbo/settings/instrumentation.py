@@ -0,0 +1,21 @@
+import os
+
+# Per-request SQL instrumentation, see limbo.core.instrumentation.
+# SAMPLE_RATE is the share of the requests instrumented; BUDGETS caps the
+# queries of a view, by URL name, logged or, with RAISE_ON_BUDGET, raised.
+QUERY_INSTRUMENTATION = {
+    "SAMPLE_RATE": float(os.getenv("QUERY_SAMPLE_RATE", 0.1)),
+    "REPEAT_THRESHOLD": 5,
+    "BUDGETS": {
+        "admin:index": 5,
+        "admin:address_address_changelist": 10,
+        "admin:address_address_add": 8,
+        "admin:address_address_change": 8,
+        "admin:users_user_changelist": 8,
+        "admin:users_user_add": 5,
+        "admin:users_user_change": 10,
+        "admin:audit_auditlog_changelist": 10,
+        "admin:audit_auditlog_change": 8,
+    },
+    "RAISE_ON_BUDGET": False,
+}